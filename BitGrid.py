@@ -0,0 +1,225 @@
+import random
+
+from Grid import Grid
+
+
+class BitGrid(Grid):
+    """
+    Grid of two-state values (0/1) stored with one bit per cell.
+
+    Each line is a Python int whose bit 'j' is the value of column 'j', so a
+    10,000 x 10,000 boolean world takes about 12 MB instead of gigabytes. The public API
+    of Grid is kept (cells are read as 0 or 1), with in addition a fast population count
+    ('get_population_count') and bulk logical operations between grids of the same shape
+    ('logical_and', 'logical_or', 'logical_xor', 'logical_not', also as &, |, ^ and ~).
+
+    Differences with Grid: 'get_grid' and 'get_line' return copies (lists of 0/1), and
+    only 0 and 1 (or booleans) can be stored.
+    """
+
+    def __init__(self, grid_init):
+        """ Classe 'BitGrid' initialisée avec le paramètre 'grid_init' (liste de lignes de 0/1)."""
+        lines_count = len(grid_init)
+        columns_count = len(grid_init[0]) if lines_count else 0
+        self.__set_rows([int(''.join('1' if value else '0' for value in reversed(line)) or '0', 2)
+                         for line in grid_init], lines_count, columns_count)
+
+    @classmethod
+    def from_shape(cls, lines_count, columns_count):
+        """ Crée une grille de 'lines_count' lignes et 'columns_count' colonnes remplie de 0."""
+        grid = cls.__new__(cls)
+        grid.__set_rows([0] * lines_count, lines_count, columns_count)
+        return grid
+
+    @classmethod
+    def from_rows(cls, rows, columns_count):
+        """ Crée une grille à partir d'une liste d'entiers (un par ligne, bit 'j' = colonne 'j')."""
+        grid = cls.__new__(cls)
+        mask = (1 << columns_count) - 1
+        grid.__set_rows([row & mask for row in rows], len(rows), columns_count)
+        return grid
+
+    def __set_rows(self, rows, lines_count, columns_count):
+        self.__rows = rows
+        self.__lines_count = lines_count
+        self.__columns_count = columns_count
+        self.__full_row = (1 << columns_count) - 1
+
+    def get_rows(self):
+        """ Retourne la liste des lignes de la grille sous forme d'entiers (bit 'j' = colonne 'j')."""
+        return self.__rows
+
+    def get_grid(self):
+        """ Retourne une copie de la grille sous forme de liste de listes de 0/1."""
+        return [self.get_line(line_number) for line_number in range(self.__lines_count)]
+
+    def get_lines_count(self):
+        return self.__lines_count
+
+    def get_columns_count(self):
+        return self.__columns_count
+
+    def fill_random(self, values):
+        """ Rempli la grille de valeurs aléatoires de la liste 'values' (0 ou 1)."""
+        ones_count = sum(1 for value in values if value == 1)
+        if ones_count * 2 == len(values):
+            self.__rows = [random.getrandbits(self.__columns_count) if self.__columns_count else 0
+                           for _ in range(self.__lines_count)]
+        else:
+            probability = ones_count / len(values)
+            self.__rows = [sum(1 << column_number for column_number in range(self.__columns_count)
+                               if random.random() < probability)
+                           for _ in range(self.__lines_count)]
+
+    def get_line(self, line_number):
+        """ Extrait (une copie de) la ligne numéro 'line_number' de la grille."""
+        return [int(bit) for bit in self.__row_bits(line_number)]
+
+    def __row_bits(self, line_number):
+        """ Retourne la ligne numéro 'line_number' sous forme de chaîne de '0'/'1', colonne 0 en tête."""
+        if not self.__columns_count:
+            return ''
+        return format(self.__rows[line_number], f'0{self.__columns_count}b')[::-1]
+
+    def get_column(self, column_number):
+        """ Extrait la colonne numéro 'column_number' de la grille."""
+        return [row >> column_number & 1 for row in self.__rows]
+
+    def get_diagonal(self):
+        """ Extrait la diagonale de la grille."""
+        diagonal_size = min(self.__lines_count, self.__columns_count)
+        return [self.__rows[line_number] >> line_number & 1 for line_number in range(diagonal_size)]
+
+    def get_anti_diagonal(self):
+        """ Extrait l'antidiagonale de la grille."""
+        diagonal_size = min(self.__lines_count, self.__columns_count)
+        return [self.__rows[line_number] >> (self.__columns_count - line_number - 1) & 1
+                for line_number in range(diagonal_size)]
+
+    def get_line_str(self, line_number, separator='\t'):
+        """ Retourne la chaine de caractère correspondant à la concaténation des valeurs de la ligne numéro
+        'line_number' de la grille. Les caractères sont séparés par le caractère 'separator'."""
+        return separator.join(self.__row_bits(line_number))
+
+    def get_grid_str(self, separator='\t'):
+        """ Retourne la chaine de caractère représentant la grille.
+                Les caractères de chaque ligne sont séparés par le caractère 'separator'.
+                Les lignes sont séparées par le caractère de retour à la ligne '\n'."""
+        return '\n'.join(self.get_line_str(line_number, separator) for line_number in range(self.__lines_count))
+
+    def has_equal_values(self, value):
+        """ Teste si toutes les valeurs de la grille sont égales à 'value'."""
+        if value == 1:
+            return all(row == self.__full_row for row in self.__rows)
+        if value == 0:
+            return not any(self.__rows)
+        return self.__lines_count == 0 or self.__columns_count == 0
+
+    def is_square(self):
+        """ Teste si la grille a le même nombre de lignes et de colonnes."""
+        return self.__lines_count == self.__columns_count
+
+    def get_population_count(self):
+        """ Compte le nombre de cases à 1 de la grille."""
+        return sum(row.bit_count() for row in self.__rows)
+
+    def get_count(self, value):
+        """ Compte le nombre d'occurrences de 'value' dans la grille."""
+        if value == 1:
+            return self.get_population_count()
+        if value == 0:
+            return self.__lines_count * self.__columns_count - self.get_population_count()
+        return 0
+
+    def get_sum(self):
+        """ Fait la somme de tous les éléments de la grille."""
+        return self.get_population_count()
+
+    def get_coordinates_from_cell_number(self, cell_number):
+        """ Converti un numéro de case 'cell_number' de la grille vers les coordonnées (ligne, colonne)
+        correspondants."""
+        return cell_number // self.__columns_count, cell_number % self.__columns_count
+
+    def get_cell_number_from_coordinates(self, line_number, column_number):
+        """ Converti les coordonnées ('line_number', 'column_number') de la grille vers le numéro de case
+        correspondant."""
+        return line_number * self.__columns_count + column_number
+
+    def get_cell(self, cell_number):
+        """ Extrait la valeur (0 ou 1) de la grille en position 'cell_number'."""
+        line_number, column_number = divmod(cell_number, self.__columns_count)
+        return self.__rows[line_number] >> column_number & 1
+
+    def set_cell(self, cell_number, value):
+        """ Positionne la valeur 'value' (0 ou 1) dans la case 'cell_number' de la grille."""
+        if not (value == 0 or value == 1):
+            raise ValueError(f"BitGrid can only store 0 or 1, not {value!r}")
+        line_number, column_number = divmod(cell_number, self.__columns_count)
+        if value:
+            self.__rows[line_number] |= 1 << column_number
+        else:
+            self.__rows[line_number] &= ~(1 << column_number)
+
+    def get_same_value_cell_numbers(self, value):
+        """ Fourni la liste des numéros des cases à valeur égale à 'value' dans la grille."""
+        if not (value == 0 or value == 1):
+            return []
+        cell_numbers = []
+        for line_number, row in enumerate(self.__rows):
+            if not value:
+                row ^= self.__full_row
+            first_cell_number = line_number * self.__columns_count
+            while row:
+                lowest_bit = row & -row
+                cell_numbers.append(first_cell_number + lowest_bit.bit_length() - 1)
+                row ^= lowest_bit
+        return cell_numbers
+
+    def get_neighbour(self, line_number, column_number, delta, is_tore=True):
+        """ Retourne le voisin de la cellule ('line_number', 'column_number') de la grille (voir Grid).
+                Si 'is_tore' est à 'False' retourne 'None' lorsque le voisin est hors de la grille."""
+        new_line_number, new_column_number = line_number + delta[0], column_number + delta[1]
+        if is_tore or 0 <= new_line_number < self.__lines_count and 0 <= new_column_number < self.__columns_count:
+            return self.__rows[new_line_number % self.__lines_count] >> new_column_number % self.__columns_count & 1
+        return None
+
+    def get_cell_neighbour_number(self, cell_number, delta, is_tore=True):
+        """ Retourne le numéro de cellule voisine de la cellule 'cell_number' de la grille (voir Grid).
+                Si 'is_tore' est à 'False' retourne 'None' lorsque le voisin est hors de la grille."""
+        line_number, column_number = self.get_coordinates_from_cell_number(cell_number)
+        line_number, column_number = line_number + delta[0], column_number + delta[1]
+        if is_tore or 0 <= line_number < self.__lines_count and 0 <= column_number < self.__columns_count:
+            return self.get_cell_number_from_coordinates(line_number % self.__lines_count,
+                                                         column_number % self.__columns_count)
+        return None
+
+    def __check_shape(self, other):
+        if (self.__lines_count, self.__columns_count) != (other.get_lines_count(), other.get_columns_count()):
+            raise ValueError("Logical operations need two BitGrid of the same shape")
+
+    def logical_and(self, other):
+        """ Retourne la grille des 'et' logiques case à case avec la BitGrid 'other'."""
+        self.__check_shape(other)
+        return BitGrid.from_rows([row & other_row for row, other_row in zip(self.__rows, other.get_rows())],
+                                 self.__columns_count)
+
+    def logical_or(self, other):
+        """ Retourne la grille des 'ou' logiques case à case avec la BitGrid 'other'."""
+        self.__check_shape(other)
+        return BitGrid.from_rows([row | other_row for row, other_row in zip(self.__rows, other.get_rows())],
+                                 self.__columns_count)
+
+    def logical_xor(self, other):
+        """ Retourne la grille des 'ou exclusif' logiques case à case avec la BitGrid 'other'."""
+        self.__check_shape(other)
+        return BitGrid.from_rows([row ^ other_row for row, other_row in zip(self.__rows, other.get_rows())],
+                                 self.__columns_count)
+
+    def logical_not(self):
+        """ Retourne la grille des négations logiques de chaque case."""
+        return BitGrid.from_rows([row ^ self.__full_row for row in self.__rows], self.__columns_count)
+
+    __and__ = logical_and
+    __or__ = logical_or
+    __xor__ = logical_xor
+    __invert__ = logical_not
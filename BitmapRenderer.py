@@ -0,0 +1,267 @@
+import tkinter as tk
+
+from CanvasRenderer import CanvasRenderer
+from Viewport import Viewport
+
+
+class BitmapRenderer:
+    """
+    Bitmap drawing of a grid on a tk.Canvas, for boards too large for one item per cell.
+
+    Only the cells of the Viewport are drawn: the frame is a pixel buffer with one RGB
+    pixel per visible cell. It is pushed as a binary PPM into a PhotoImage, and Tk zooms
+    it by the integer zoom of the viewport into the single image item shown on the
+    canvas. 'update' only rewrites the pixels of the changed visible cells, then pushes
+    the frame once, in C. When the viewport moved or zoomed, the window is redrawn: the
+    cost follows the number of visible cells, not the size of the grid.
+
+    The texts of the cells (ages, food) are drawn as canvas items on top of the image,
+    only from a zoom of TEXT_ZOOM, where they are readable. An optional minimap shows the
+    whole grid, subsampled, with the outline of the viewport. The interface is the same
+    as CanvasRenderer, so MyApp can use either one.
+
+    Class Attributes:
+        TEXT_ZOOM (int): Minimal zoom at which the texts of the cells are drawn
+        MINIMAP_PERIOD (int): Number of updates between two refreshes of the minimap
+    """
+    TEXT_ZOOM = 16
+    MINIMAP_PERIOD = 10
+
+    def __init__(self, canvas, grid, zoom, margin_size=0, colors=None, image_class=None, viewport=None,
+                 minimap_size=0):
+        """
+        Args:
+            canvas: tk.Canvas (or any object with the same item methods and 'winfo_rgb')
+            grid: Grid whose cells are drawn
+            zoom (int): Size in pixels of a cell, when no viewport is given
+            margin_size (int, optional): Size of the margin around the grid. Defaults to 0.
+            colors (dict, optional): Colors of the grid (see CanvasRenderer.COLORS).
+            image_class (type, optional): Class of the images. Defaults to tk.PhotoImage.
+            viewport (Viewport, optional): Visible window of the grid. Defaults to None
+                (the whole grid at 'zoom').
+            minimap_size (int, optional): Size in pixels of the largest side of the
+                minimap, 0 for no minimap. Defaults to 0.
+        """
+        self.__canvas = canvas
+        self.__grid = grid
+        self.__margin_size = margin_size
+        self.__colors = colors or CanvasRenderer.COLORS
+        self.__image_class = image_class or tk.PhotoImage
+        lines_count, columns_count = grid.get_lines_count(), grid.get_columns_count()
+        zoom = max(1, int(zoom))
+        self.__viewport = viewport or Viewport(lines_count, columns_count, columns_count * zoom,
+                                               lines_count * zoom, zoom)
+        self.__minimap_size = minimap_size
+        self.__rgb = {}
+        self.__drawn_state = None
+        self.__bounds = None
+        self.__pixels = None
+        self.__header = b''
+        self.__image = None
+        self.__zoomed_image = None
+        self.__texts = {}
+        self.__styles = []
+        self.__minimap_image = None
+        self.__minimap_step = 1
+        self.__minimap_origin = (0, 0)
+        self.__minimap_outline = None
+        self.__updates_count = 0
+
+    def set_grid(self, grid):
+        """Draw another grid of the same size from now on (e.g. a newer GridSnapshot)."""
+        self.__grid = grid
+
+    def get_viewport(self):
+        """Return the Viewport of the renderer."""
+        return self.__viewport
+
+    def get_zoom(self):
+        """Return the size in pixels of a cell."""
+        return self.__viewport.get_zoom()
+
+    def is_text_shown(self):
+        """Test if the texts of the cells (ages, food) are drawn at this zoom."""
+        return self.__viewport.get_zoom() >= self.TEXT_ZOOM
+
+    def get_cell_number_at(self, x, y):
+        """Return the number of the cell at the canvas point (x, y), or None outside of the grid."""
+        if self.get_minimap_cell_at(x, y) is not None:
+            return None
+        coordinates = self.__viewport.get_cell_coordinates_at(x - self.__margin_size, y - self.__margin_size)
+        if coordinates is None:
+            return None
+        return self.__grid.get_cell_number_from_coordinates(*coordinates)
+
+    def get_minimap_cell_at(self, x, y):
+        """Return the number of the cell shown at the canvas point (x, y) of the minimap, or None."""
+        if self.__minimap_image is None:
+            return None
+        lines_count, columns_count = self.__viewport.get_grid_size()
+        line_number = (y - self.__minimap_origin[1]) * self.__minimap_step
+        column_number = (x - self.__minimap_origin[0]) * self.__minimap_step
+        if 0 <= line_number < lines_count and 0 <= column_number < columns_count:
+            return self.__grid.get_cell_number_from_coordinates(line_number, column_number)
+        return None
+
+    def get_items_count(self):
+        """Return the number of canvas items created by the renderer."""
+        return ((self.__image is not None) + len(self.__texts)
+                + 2 * (self.__minimap_image is not None))
+
+    def __get_rgb(self, color):
+        """Return the 3 bytes of a Tk color (name or #rrggbb)."""
+        rgb = self.__rgb.get(color)
+        if rgb is None:
+            rgb = self.__rgb[color] = bytes(channel >> 8 for channel in self.__canvas.winfo_rgb(color))
+        return rgb
+
+    def __get_style(self, line, line_number, column_number, show_text, styles):
+        """
+        Return the style of a cell. 'line' is the raw line of the grid (see 'get_line');
+        'styles' caches the styles by value identity during one drawing, as the values do
+        not change meanwhile.
+        """
+        value = line[column_number]
+        if show_text:
+            return CanvasRenderer.get_cell_style(
+                self.__grid.get_cell(self.__grid.get_cell_number_from_coordinates(line_number, column_number)),
+                True, self.__colors, self.__viewport.get_zoom())
+        style = styles.get(id(value))
+        if style is None:
+            style = styles[id(value)] = CanvasRenderer.get_cell_style(value, False, self.__colors,
+                                                                      self.__viewport.get_zoom())
+        return style
+
+    def __draw_text(self, line_number, column_number, style):
+        """Show the text of a style in a cell, creating its text item if needed."""
+        key = (line_number, column_number)
+        text_item = self.__texts.get(key)
+        if not style[1]:
+            if text_item is not None:
+                self.__canvas.itemconfigure(text_item, text='')
+            return
+        options = {'text': style[1], 'fill': style[2]}
+        if style[3] is not None:
+            options['font'] = style[3]
+        if text_item is None:
+            first_line, first_column = self.__bounds[:2]
+            zoom = self.__viewport.get_zoom()
+            self.__texts[key] = self.__canvas.create_text(
+                self.__margin_size + (column_number - first_column + 0.5) * zoom,
+                self.__margin_size + (line_number - first_line + 0.5) * zoom, **options)
+        else:
+            self.__canvas.itemconfigure(text_item, **options)
+
+    def __push(self):
+        """Load the pixel buffer into the image and zoom it into the displayed image."""
+        self.__image.configure(data=self.__header + bytes(self.__pixels), format='PPM')
+        if self.__zoomed_image is not self.__image:
+            zoom = self.__viewport.get_zoom()
+            self.__zoomed_image.tk.call(self.__zoomed_image, 'copy', self.__image, '-zoom', zoom, zoom)
+
+    def draw_all(self, show_age=False):
+        """Delete everything on the canvas and draw the visible cells (game switch, move of the viewport)."""
+        self.__canvas.delete('all')
+        self.__drawn_state = self.__viewport.get_state()
+        self.__bounds = first_line, first_column, end_line, end_column = self.__viewport.get_bounds()
+        zoom = self.__viewport.get_zoom()
+        show_text = show_age and self.is_text_shown()
+        get_line = self.__grid.get_line
+        styles = {}
+        self.__styles = [self.__get_style(get_line(line_number), line_number, column_number, show_text, styles)
+                         for line_number in range(first_line, end_line)
+                         for column_number in range(first_column, end_column)]
+        visible_lines, visible_columns = end_line - first_line, end_column - first_column
+        self.__header = b'P6 %d %d 255\n' % (visible_columns, visible_lines)
+        self.__pixels = bytearray(b''.join(self.__get_rgb(style[0]) for style in self.__styles))
+        self.__image = self.__image_class(master=self.__canvas, width=visible_columns, height=visible_lines)
+        if zoom == 1:
+            self.__zoomed_image = self.__image
+        else:
+            self.__zoomed_image = self.__image_class(master=self.__canvas, width=visible_columns * zoom,
+                                                     height=visible_lines * zoom)
+        self.__push()
+        self.__canvas.create_image(self.__margin_size, self.__margin_size, image=self.__zoomed_image, anchor='nw')
+        self.__texts = {}
+        if self.is_text_shown():
+            for index, style in enumerate(self.__styles):
+                line_offset, column_offset = divmod(index, visible_columns)
+                self.__draw_text(first_line + line_offset, first_column + column_offset, style)
+        self.__minimap_image = None
+        self.__draw_minimap()
+
+    def __draw_minimap(self):
+        """Draw (or refresh) the subsampled whole grid and the outline of the viewport."""
+        lines_count, columns_count = self.__viewport.get_grid_size()
+        if not self.__minimap_size or not lines_count or not columns_count:
+            return
+        step = self.__minimap_step = max(1, -(-max(lines_count, columns_count) // self.__minimap_size))
+        get_line = self.__grid.get_line
+        styles = {}
+        pixels = b''.join(self.__get_rgb(self.__get_style(get_line(line_number), line_number, column_number,
+                                                          False, styles)[0])
+                          for line_number in range(0, lines_count, step)
+                          for column_number in range(0, columns_count, step))
+        height, width = -(-lines_count // step), -(-columns_count // step)
+        if self.__minimap_image is None:
+            self.__minimap_image = self.__image_class(master=self.__canvas, width=width, height=height)
+            view_width = self.__viewport.get_size()[0]
+            self.__minimap_origin = (self.__margin_size + view_width - width - 4, self.__margin_size + 4)
+            self.__canvas.create_image(*self.__minimap_origin, image=self.__minimap_image, anchor='nw')
+            self.__minimap_outline = self.__canvas.create_rectangle(0, 0, 0, 0, outline='red')
+        self.__minimap_image.configure(data=b'P6 %d %d 255\n' % (width, height) + pixels, format='PPM')
+        first_line, first_column, end_line, end_column = self.__bounds
+        x, y = self.__minimap_origin
+        self.__canvas.coords(self.__minimap_outline, x + first_column // step, y + first_line // step,
+                             x + -(-end_column // step), y + -(-end_line // step))
+
+    def update(self, cell_numbers=None, show_age=False):
+        """
+        Redraw the pixels (and texts) of the visible cells whose style changed, or the
+        whole window if the viewport moved or zoomed.
+
+        Args:
+            cell_numbers (iterable, optional): Cells that may have changed since the last
+                frame. Defaults to None (check every visible cell, e.g. after a reset).
+            show_age (bool, optional): True to show the age of the Humans (at a zoom
+                showing the texts). Defaults to False.
+
+        Returns:
+            int: Number of cells redrawn.
+        """
+        if self.__image is None or self.__drawn_state != self.__viewport.get_state():
+            self.draw_all(show_age)
+            return len(self.__styles)
+        first_line, first_column, end_line, end_column = self.__bounds
+        visible_columns = end_column - first_column
+        columns_count = self.__grid.get_columns_count()
+        if cell_numbers is None:
+            cell_numbers = (line_number * columns_count + column_number
+                            for line_number in range(first_line, end_line)
+                            for column_number in range(first_column, end_column))
+        show_text = show_age and self.is_text_shown()
+        get_line = self.__grid.get_line
+        pixels = self.__pixels
+        styles = {}
+        redrawn_count = 0
+        for cell_number in cell_numbers:
+            line_number, column_number = divmod(cell_number, columns_count)
+            if not (first_line <= line_number < end_line and first_column <= column_number < end_column):
+                continue
+            index = (line_number - first_line) * visible_columns + column_number - first_column
+            style = self.__get_style(get_line(line_number), line_number, column_number, show_text, styles)
+            last_style = self.__styles[index]
+            if style == last_style:
+                continue
+            if style[0] != last_style[0]:
+                pixels[3 * index:3 * index + 3] = self.__get_rgb(style[0])
+            if style[1:] != last_style[1:]:
+                self.__draw_text(line_number, column_number, style)
+            self.__styles[index] = style
+            redrawn_count += 1
+        if redrawn_count:
+            self.__push()
+        self.__updates_count += 1
+        if self.__minimap_image is not None and self.__updates_count % self.MINIMAP_PERIOD == 0:
+            self.__draw_minimap()
+        return redrawn_count
@@ -0,0 +1,173 @@
+from Human import Human
+from Snake import Snake
+from SnakeGame import SnakeGame
+from Turmite import Turmite
+from Turmites import Turmites
+
+
+class CanvasRenderer:
+    """
+    Retained-mode drawing of a grid on a tk.Canvas.
+
+    One rectangle item is created per cell by 'draw_all' (plus a text item for the cells
+    showing a text, created the first time it is needed). Afterwards 'update' only
+    reconfigures the items of the given cells whose style changed since they were last
+    drawn, so a frame costs in proportion to the changes, not to the grid size.
+
+    The style of a cell is a (fill color, text, text color, font) tuple computed by
+    'get_cell_style'.
+    """
+    COLORS = {'cell_background': 'white', 'cell_foreground': 'black', 'grid_lines': 'gray', 'grid_text': 'white'}
+
+    def __init__(self, canvas, grid, cell_size, gutter_size=0, margin_size=0, colors=None):
+        """
+        Args:
+            canvas: tk.Canvas (or any object with the same item methods)
+            grid: Grid whose cells are drawn
+            cell_size (int): Size of each cell
+            gutter_size (int, optional): Size of the gutter between cells. Defaults to 0.
+            margin_size (int, optional): Size of the margin around the grid. Defaults to 0.
+            colors (dict, optional): 'cell_background', 'cell_foreground', 'grid_lines' and
+                'grid_text' colors (see MyApp.COLORS).
+        """
+        self.__canvas = canvas
+        self.__grid = grid
+        self.__cell_size = cell_size
+        self.__gutter_size = gutter_size
+        self.__margin_size = margin_size
+        self.__colors = colors or self.COLORS
+        self.__rectangles = []
+        self.__texts = {}
+        self.__styles = []
+
+    @staticmethod
+    def get_cell_style(cell_content, show_age, colors, cell_size):
+        """
+        Return the (fill color, text, text color, font) style of a cell content.
+
+        Args:
+            cell_content: Value of the cell
+            show_age (bool): True to show the age of the Humans
+            colors (dict): Colors of the grid (see MyApp.COLORS)
+            cell_size (int): Size of a cell, for the font of the food
+        """
+        if isinstance(cell_content, Snake):
+            if cell_content.is_food:
+                return SnakeGame.COLORS['food'], '🍎', 'white', ('Arial', int(cell_size / 2))
+            if cell_content.is_dead:
+                return (SnakeGame.COLORS['dead_head'] if cell_content.is_head else SnakeGame.COLORS['dead_body'],
+                        '', None, None)
+            return SnakeGame.COLORS['head'] if cell_content.is_head else SnakeGame.COLORS['body'], '', None, None
+        if isinstance(cell_content, Turmite):
+            return Turmites.COLORS['ant'], '', None, None
+        if type(cell_content) is int and cell_content:
+            # Trail colour of the Turmites (0 is the ground)
+            trail_colors = Turmites.COLORS['trail']
+            return trail_colors[(cell_content - 1) % len(trail_colors)], '', None, None
+        if isinstance(cell_content, Human):
+            if show_age and cell_content.get_full_name() != 'Food':
+                return colors['cell_foreground'], str(cell_content.get_age()), colors['grid_text'], None
+            return colors['cell_foreground'], '', None, None
+        return colors['cell_background'], '', None, None
+
+    def set_grid(self, grid):
+        """Draw another grid of the same size from now on (e.g. a newer GridSnapshot)."""
+        self.__grid = grid
+
+    def get_viewport(self):
+        """Return None: the whole grid is drawn, without viewport."""
+        return None
+
+    def get_minimap_cell_at(self, x, y):
+        """Return None: there is no minimap."""
+        return None
+
+    def is_text_shown(self):
+        """Test if the texts of the cells (ages, food) are drawn."""
+        return True
+
+    def get_cell_number_at(self, x, y):
+        """Return the number of the cell at the canvas point (x, y), or None outside of the grid."""
+        column_number = (x - self.__margin_size) // (self.__cell_size + self.__gutter_size)
+        line_number = (y - self.__margin_size) // (self.__cell_size + self.__gutter_size)
+        if 0 <= line_number < self.__grid.get_lines_count() and 0 <= column_number < self.__grid.get_columns_count():
+            return self.__grid.get_cell_number_from_coordinates(line_number, column_number)
+        return None
+
+    def get_items_count(self):
+        """Return the number of canvas items created by the renderer."""
+        return len(self.__rectangles) + len(self.__texts)
+
+    def __get_cell_origin(self, cell_number):
+        line_number, column_number = self.__grid.get_coordinates_from_cell_number(cell_number)
+        return (column_number * (self.__cell_size + self.__gutter_size) + self.__margin_size,
+                line_number * (self.__cell_size + self.__gutter_size) + self.__margin_size)
+
+    def __draw_text(self, cell_number, style):
+        """Show the text of a style in a cell, creating its text item if needed."""
+        text_item = self.__texts.get(cell_number)
+        if text_item is None:
+            if not style[1]:
+                return
+            x, y = self.__get_cell_origin(cell_number)
+            options = {'text': style[1], 'fill': style[2]}
+            if style[3] is not None:
+                options['font'] = style[3]
+            self.__texts[cell_number] = self.__canvas.create_text(x + self.__cell_size / 2,
+                                                                  y + self.__cell_size / 2, **options)
+        elif style[1]:
+            options = {'text': style[1], 'fill': style[2]}
+            if style[3] is not None:
+                options['font'] = style[3]
+            self.__canvas.itemconfigure(text_item, **options)
+        else:
+            self.__canvas.itemconfigure(text_item, text='')
+
+    def draw_all(self, show_age=False):
+        """
+        Delete everything on the canvas and create the items of every cell (game switch,
+        resize).
+        """
+        self.__canvas.delete('all')
+        self.__rectangles = []
+        self.__texts = {}
+        self.__styles = []
+        for cell_number in range(self.__grid.get_lines_count() * self.__grid.get_columns_count()):
+            style = self.get_cell_style(self.__grid.get_cell(cell_number), show_age, self.__colors, self.__cell_size)
+            x, y = self.__get_cell_origin(cell_number)
+            self.__rectangles.append(self.__canvas.create_rectangle(x, y, x + self.__cell_size, y + self.__cell_size,
+                                                                    outline=self.__colors['grid_lines'],
+                                                                    fill=style[0]))
+            self.__draw_text(cell_number, style)
+            self.__styles.append(style)
+
+    def update(self, cell_numbers=None, show_age=False):
+        """
+        Reconfigure the items of the cells whose style changed.
+
+        Args:
+            cell_numbers (iterable, optional): Cells that may have changed since the last
+                frame. Defaults to None (check every cell, e.g. after a reset).
+            show_age (bool, optional): True to show the age of the Humans. Defaults to False.
+
+        Returns:
+            int: Number of cells redrawn.
+        """
+        if not self.__rectangles:
+            self.draw_all(show_age)
+            return len(self.__styles)
+        if cell_numbers is None:
+            cell_numbers = range(len(self.__styles))
+        redrawn_count = 0
+        for cell_number in cell_numbers:
+            style = self.get_cell_style(self.__grid.get_cell(cell_number), show_age, self.__colors, self.__cell_size)
+            last_style = self.__styles[cell_number]
+            if style == last_style:
+                continue
+            if style[0] != last_style[0]:
+                self.__canvas.itemconfigure(self.__rectangles[cell_number], fill=style[0])
+            if style[1:] != last_style[1:]:
+                self.__draw_text(cell_number, style)
+            self.__styles[cell_number] = style
+            redrawn_count += 1
+        return redrawn_count
@@ -0,0 +1,25 @@
+class ChangeLog:
+    """
+    Batch of the changes of a PlanetAlpha, for one subscriber (see
+    PlanetAlpha.open_change_log).
+
+    Each change is a (cell_number, old_kind, new_kind) tuple where a kind is the type of
+    the value of the cell, or None for the ground. Changes accumulate until 'collect',
+    typically called once after each step of a game.
+    """
+
+    def __init__(self):
+        self.__changes = []
+
+    def __len__(self):
+        return len(self.__changes)
+
+    def append(self, change):
+        """Record a (cell_number, old_kind, new_kind) change."""
+        self.__changes.append(change)
+
+    def collect(self):
+        """Return the changes recorded since the last collect, in order, and forget them."""
+        changes = self.__changes
+        self.__changes = []
+        return changes
@@ -1,5 +1,10 @@
 from PlanetTk import PlanetTk
+from PlanetAlpha import PlanetAlpha
+from PopulationPlanet import PopulationPlanet
 from Human import Human
+from ConwayArrayEngine import ConwayArrayEngine
+from ConwayIncrementalEngine import ConwayIncrementalEngine
+from CycleDetector import CycleDetector
 import random
 
 class Conway:
@@ -10,52 +15,133 @@ class Conway:
     - Classic Conway rules (birth with 3 neighbors, survival with 2-3)
     - Aging mechanism for Humans
     - Natural death probability based on age
+
+    Humans are stored in a compact Population (see PopulationPlanet): the grid
+    returns Human views built on demand, ages live in arrays.
+
+    Class Attributes:
+        ENGINES (tuple): Names of the available step engines
     """
-    def __init__(self, latitude_cells_count, longitude_cells_count):
+    ENGINES = ('cells', 'array', 'incremental')
+
+    def __init__(self, latitude_cells_count, longitude_cells_count, engine='cells', seed=None, cycle_window=100,
+                 is_tore=False):
+        """
+        Initialize the game grid.
+
+        Args:
+            latitude_cells_count (int): Number of rows
+            longitude_cells_count (int): Number of columns
+            engine (str, optional): Step engine, one of ENGINES. 'cells' visits every cell
+                through the grid, 'array' computes whole generations on arrays (see
+                ConwayArrayEngine), 'incremental' only re-evaluates the cells around the
+                last changes (see ConwayIncrementalEngine) and suits sparse worlds. All
+                engines give the same results. Defaults to 'cells'.
+            seed (optional): Seed of the random generator of the simulation, for
+                reproducible runs. Defaults to None (unpredictable).
+            cycle_window (int, optional): Number of past generations whose alive/dead
+                state is remembered to detect cycles (see 'get_cycle'), 0 to disable the
+                detection. Defaults to 100.
+            is_tore (bool, optional): If True the grid is a torus (opposite edges are
+                neighbours), otherwise cells beyond the edges are dead. Defaults to False.
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {self.ENGINES}")
         self.__planet = PlanetTk(
             root=None,
             latitude_cells_count=latitude_cells_count,
             longitude_cells_count=longitude_cells_count,
             authorized_classes=[Human],
-            cell_size=20
+            cell_size=20,
+            planet_class=PopulationPlanet
         )
         self.__step_count = 0
+        self.__last_changes = []
+        self.__cycle_window = cycle_window
+        self.__cycle_detector = None
+        self.__cycle_version = None
+        self.__random = random.Random(seed)
+        self.__is_tore = is_tore
+        if engine == 'array':
+            self.__engine = ConwayArrayEngine(self.__planet, self.__random, is_tore)
+        elif engine == 'incremental':
+            self.__engine = ConwayIncrementalEngine(self.__planet, self.__random, is_tore)
+        else:
+            self.__engine = None
+
+    @staticmethod
+    def encode_cell(value):
+        """Return the code of a cell value for a Recording: 1 for a Human, 0 otherwise."""
+        return 1 if isinstance(value, Human) else 0
+
+    @staticmethod
+    def decode_cell(code, planet):
+        """Return the value of a cell code of a Recording on a PopulationPlanet."""
+        return planet.get_newborn() if code else planet.get_ground()
 
     def get_grid(self):
         """Return the underlying PlanetAlpha grid object."""
         return self.__planet.get_grid()
 
+    def is_tore(self):
+        """Return True if the grid is a torus."""
+        return self.__is_tore
+
+    def get_random(self):
+        """Return the random generator of the simulation (e.g. to seed the initial cells)."""
+        return self.__random
+
+    def populate(self, density):
+        """
+        Give birth to Humans on a random proportion of the cells, drawn with the random
+        generator of the simulation (reproducible with its seed).
+
+        Args:
+            density (float): Proportion of the cells to populate, between 0 and 1
+        """
+        grid = self.get_grid()
+        cells_count = grid.get_lines_count() * grid.get_columns_count()
+        for cell_number in self.__random.sample(range(cells_count), int(density * cells_count)):
+            grid.born(cell_number, grid.get_newborn())
+
     def step(self):
         """
         Execute one step of Conway's Game of Life.
         
-        For each cell:
-        1. Age existing Humans
-        2. Check for natural death based on age
-        3. Apply Conway's rules:
+        1. Age existing Humans and check for natural death based on age, in one
+           batch with the generator of the simulation
+        2. For each cell, apply Conway's rules:
            - Birth: Dead cell with exactly 3 neighbors becomes alive
            - Survival: Live cell with 2-3 neighbors survives
            - Death: All other live cells die
         """
         self.__step_count += 1
+        is_modified = self.__cycle_version != self.__planet.get_grid().get_version()
+        if self.__engine is not None:
+            self.__last_changes = self.__engine.step()
+        else:
+            self.__last_changes = self.__step_cells()
+        self.__update_cycle(is_modified)
+
+    def __step_cells(self):
+        """Execute one step visiting every cell and return the applied changes."""
         changes = []
         grid = self.__planet.get_grid()
+        population = grid.get_population()
+
+        # Age the humans and check for natural death
+        natural_deaths = set(population.ageing_all(Human.get_death_chances(), self.__random))
+        alive = population.get_alive()
+        neighbour_table = grid.get_neighbour_table(PlanetAlpha.WIND_ROSE, self.__is_tore)
         
         # Check each cell
         for cell in range(self.__planet._PlanetTk__latitude_cells_count * self.__planet._PlanetTk__longitude_cells_count):
-            cell_content = grid.get_cell(cell)
-            if isinstance(cell_content, Human):
-                # Age the human
-                cell_content.ageing()
-                # Check for natural death
-                if cell_content.get_age() > Human.LIFE_EXPECTANCY:
-                    death_chance = (cell_content.get_age() - Human.LIFE_EXPECTANCY) / 100
-                    if random.random() < death_chance:
-                        changes.append((cell, 'die'))
-                        continue
-
-            neighbors = self.__count_live_neighbors(cell)
-            current_state = isinstance(cell_content, Human)
+            if cell in natural_deaths:
+                changes.append((cell, 'die'))
+                continue
+
+            current_state = alive[cell]
+            neighbors = self.__count_live_neighbors(cell, alive, neighbour_table)
 
             # Apply rules
             if current_state:
@@ -66,53 +152,80 @@ class Conway:
                     changes.append((cell, 'born'))
 
         # Apply changes
+        applied_changes = []
         for cell, action in changes:
             if action == 'born':
-                self.__planet.born(cell, Human(['Conway'], 'Being', 'XX', 'Hello'))
-            else:
-                self.__planet.die(cell)
+                if self.__planet.born(cell, grid.get_newborn()):
+                    applied_changes.append((cell, action))
+            elif self.__planet.die(cell):
+                applied_changes.append((cell, action))
+        return applied_changes
 
-    def __count_live_neighbors(self, cell):
+    def __update_cycle(self, is_modified):
+        """
+        Update the hash of the alive/dead state with the last changes.
+
+        Args:
+            is_modified (bool): True if the grid was modified outside of the steps since
+                the last update, so that the history no longer applies
+        """
+        if not self.__cycle_window:
+            return
+        grid = self.__planet.get_grid()
+        if self.__cycle_detector is None:
+            self.__cycle_detector = CycleDetector(grid.get_lines_count() * grid.get_columns_count(),
+                                                  self.__cycle_window)
+        if is_modified:
+            # Start a new history from the state before the step
+            live_cells = set(grid.get_population().get_live_cells())
+            live_cells.symmetric_difference_update(cell for cell, _ in self.__last_changes)
+            self.__cycle_detector.reset(live_cells, self.__step_count - 1)
+        self.__cycle_detector.update([cell for cell, _ in self.__last_changes], self.__step_count)
+        self.__cycle_version = grid.get_version()
+
+    def get_last_changes(self):
+        """Return the (cell_number, 'born' | 'die') changes applied by the last step."""
+        return self.__last_changes
+
+    def get_cycle(self):
+        """
+        Return (period, start_generation) if the alive/dead state (ages excluded) of the
+        last step repeats one of the last 'cycle_window' generations, None otherwise.
+        Batch runs can stop as soon as a cycle is reported.
+        """
+        if self.__cycle_detector is None or self.__cycle_version != self.__planet.get_grid().get_version():
+            return None
+        return self.__cycle_detector.get_cycle()
+
+    def __count_live_neighbors(self, cell, alive, neighbour_table):
         """
         Count the number of living Human neighbors for a given cell.
         
         Args:
             cell (int): Cell number to check neighbors for
+            alive (bytearray): Alive/dead state of the cells (see Population.get_alive)
+            neighbour_table (tuple): (table, width) of the grid (see
+                Grid.get_neighbour_table), or None to compute the neighbors of the cell
             
         Returns:
             int: Number of living Human neighbors (0-8)
         """
-        count = 0
-        row, col = cell // self.__planet._PlanetTk__longitude_cells_count, cell % self.__planet._PlanetTk__longitude_cells_count
-        grid = self.__planet.get_grid()
-        
-        # Check all 8 neighboring cells
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                # Calculate new position without wrapping
-                new_row = row + dx
-                new_col = col + dy
-                
-                # Skip if outside grid boundaries
-                if (new_row < 0 or 
-                    new_row >= self.__planet._PlanetTk__latitude_cells_count or 
-                    new_col < 0 or 
-                    new_col >= self.__planet._PlanetTk__longitude_cells_count):
-                    continue
-                
-                neighbor_cell = new_row * self.__planet._PlanetTk__longitude_cells_count + new_col
-                if isinstance(grid.get_cell(neighbor_cell), Human):
-                    count += 1
-        
-        return count
+        if neighbour_table is None:
+            neighbors = self.__planet.get_grid().get_cell_neighborhood_numbers(cell, PlanetAlpha.WIND_ROSE,
+                                                                                self.__is_tore)
+        else:
+            table, width = neighbour_table
+            neighbors = table[cell * width:(cell + 1) * width]
+        return sum(alive[neighbor] for neighbor in neighbors if neighbor >= 0)
 
     def get_step_count(self):
         """Return the current step count of the simulation."""
         return self.__step_count
 
+    def set_step_count(self, step_count):
+        """Set the step count of the simulation (e.g. of a world loaded from a WorldFile)."""
+        self.__step_count = step_count
+
     def reset(self):
         """Reset the grid to empty state and step count to 0."""
         for cell in range(self.__planet._PlanetTk__latitude_cells_count * self.__planet._PlanetTk__longitude_cells_count):
@@ -0,0 +1,153 @@
+import re
+
+from Human import Human
+
+
+class ConwayArrayEngine:
+    """
+    Array-backed step engine for Conway's Game of Life.
+
+    The alive/dead state is kept in a bytearray with one byte per cell, surrounded by a
+    border of cells so that the edges need no special case: on a bounded grid the border
+    cells are always dead, on a torus they are refreshed with the opposite edges before
+    each generation.
+    Ages are those of the Population of the grid (see PopulationPlanet), aged in one
+    batch by 'Population.ageing_all'.
+
+    A whole generation is computed at once: the state is read as one big integer and the
+    8 neighbour sums are obtained by adding shifted copies of it, each byte holding the
+    count of one cell (at most 8, so there is never a carry between cells).
+    """
+    __CHANGED = re.compile(b'[\x01\x02]')
+
+    # Code of a cell = number of live neighbours + 16 if the cell is alive.
+    # 1 = birth, 2 = death by loneliness or overcrowding, 0 = no change.
+    __RULE = bytes(1 if code == 3 else 2 if code >= 16 and code - 16 not in (2, 3) else 0
+                   for code in range(256))
+
+    def __init__(self, planet, generator, is_tore=False):
+        """
+        Initialize the engine on a PlanetTk.
+
+        Args:
+            planet (PlanetTk): Planet on a PopulationPlanet whose grid is evolved; all
+                changes go through its 'born' and 'die' methods.
+            generator (random.Random): Generator of the natural death draws
+            is_tore (bool, optional): True if the grid is a torus. Defaults to False.
+        """
+        self.__planet = planet
+        self.__random = generator
+        self.__is_tore = is_tore
+        grid = planet.get_grid()
+        self.__lines_count = grid.get_lines_count()
+        self.__columns_count = grid.get_columns_count()
+        self.__stride = self.__columns_count + 2
+        self.__size = self.__stride * (self.__lines_count + 2)
+        self.__alive = bytearray(self.__size)
+        interior = bytearray(self.__size)
+        for line_number in range(self.__lines_count):
+            start = (line_number + 1) * self.__stride + 1
+            interior[start:start + self.__columns_count] = b'\xff' * self.__columns_count
+        self.__interior_mask = int.from_bytes(interior, 'little')
+        self.__version = None
+
+    def __padded_index(self, cell_number):
+        """Convert a cell number to its index in the padded alive/dead state."""
+        line_number, column_number = divmod(cell_number, self.__columns_count)
+        return (line_number + 1) * self.__stride + column_number + 1
+
+    def __cell_number(self, padded_index):
+        """Convert an index in the padded alive/dead state to a cell number."""
+        line_number, column_number = divmod(padded_index, self.__stride)
+        return (line_number - 1) * self.__columns_count + column_number - 1
+
+    def __sync(self):
+        """Reload the arrays from the grid if it was modified outside of the engine."""
+        grid = self.__planet.get_grid()
+        if self.__version == grid.get_version():
+            return
+        alive = grid.get_population().get_alive()
+        for line_number in range(self.__lines_count):
+            start = (line_number + 1) * self.__stride + 1
+            self.__alive[start:start + self.__columns_count] = \
+                alive[line_number * self.__columns_count:(line_number + 1) * self.__columns_count]
+        self.__version = grid.get_version()
+
+    def __wrap_border(self):
+        """Copy the opposite edges of the grid into the border cells, for a torus."""
+        alive, stride, columns_count = self.__alive, self.__stride, self.__columns_count
+        for line_number in range(1, self.__lines_count + 1):
+            start = line_number * stride
+            alive[start] = alive[start + columns_count]
+            alive[start + columns_count + 1] = alive[start + 1]
+        last_line_start = self.__lines_count * stride
+        alive[:stride] = alive[last_line_start:last_line_start + stride]
+        alive[last_line_start + stride:] = alive[stride:2 * stride]
+
+    @staticmethod
+    def get_changes_codes(state, stride, interior_mask):
+        """
+        Apply Conway's rules to a whole padded alive/dead state at once.
+
+        Args:
+            state (bytes): One byte per cell (1 alive, 0 dead), 'stride' bytes per line
+            stride (int): Length of a line of 'state'
+            interior_mask (int): 0xff on the bytes to evaluate, 0 elsewhere (borders)
+
+        Returns:
+            bytes: For each byte of 'state', 1 if the cell is born, 2 if it dies, 0 otherwise.
+        """
+        state = int.from_bytes(state, 'little')
+        line_shift = 8 * stride
+        codes = ((state << 8) + (state >> 8)
+                 + (state << line_shift) + (state >> line_shift)
+                 + (state << line_shift - 8) + (state >> line_shift - 8)
+                 + (state << line_shift + 8) + (state >> line_shift + 8)
+                 + (state << 4)) & interior_mask
+        return codes.to_bytes((interior_mask.bit_length() + 7) // 8, 'little').translate(ConwayArrayEngine.__RULE)
+
+    def step(self):
+        """
+        Execute one step with the same rules and the same random draws as 'Conway.step'
+        (same generator, same state, same results).
+
+        Returns:
+            list: (cell_number, 'born' | 'die') changes applied to the grid, by cell number.
+        """
+        self.__sync()
+        grid = self.__planet.get_grid()
+        newborn = grid.get_newborn()
+
+        # Ageing and natural death of every living Human, in one batch
+        natural_deaths = set(grid.get_population().ageing_all(Human.get_death_chances(), self.__random))
+
+        # Conway's rules on the whole grid at once
+        if self.__is_tore:
+            self.__wrap_border()
+        changes = []
+        changes_codes = self.get_changes_codes(self.__alive, self.__stride, self.__interior_mask)
+        for match in self.__CHANGED.finditer(changes_codes):
+            cell = self.__cell_number(match.start())
+            if match.group() == b'\x01':
+                changes.append((cell, 'born'))
+            else:
+                natural_deaths.discard(cell)
+                changes.append((cell, 'die'))
+        if natural_deaths:
+            changes.extend((cell, 'die') for cell in natural_deaths)
+            changes.sort()
+
+        # Apply changes
+        applied_changes = []
+        for cell, action in changes:
+            padded_index = self.__padded_index(cell)
+            if action == 'born':
+                if not self.__planet.born(cell, newborn):
+                    continue
+                self.__alive[padded_index] = 1
+            else:
+                self.__planet.die(cell)
+                self.__alive[padded_index] = 0
+            applied_changes.append((cell, action))
+        self.__version = grid.get_version()
+        return applied_changes
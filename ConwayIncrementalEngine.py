@@ -0,0 +1,116 @@
+from Human import Human
+from PlanetAlpha import PlanetAlpha
+
+
+class ConwayIncrementalEngine:
+    """
+    Incremental step engine for sparse Conway worlds.
+
+    Only the frontier, made of the cells that changed in the last generation and their
+    neighbours, is re-evaluated: any other cell has the same state and the same
+    neighbourhood as in the previous generation, so it cannot change either. Live
+    neighbour counts are maintained on each change. Ageing and natural death still apply
+    to every living Human, in one batch over the Population of the grid.
+    Step cost therefore scales with activity and population, not with grid area.
+    """
+
+    def __init__(self, planet, generator, is_tore=False):
+        """
+        Initialize the engine on a PlanetTk.
+
+        Args:
+            planet (PlanetTk): Planet on a PopulationPlanet whose grid is evolved; all
+                changes go through its 'born' and 'die' methods.
+            generator (random.Random): Generator of the natural death draws
+            is_tore (bool, optional): True if the grid is a torus. Defaults to False.
+        """
+        self.__planet = planet
+        self.__random = generator
+        self.__is_tore = is_tore
+        grid = planet.get_grid()
+        self.__neighbour_table = grid.get_neighbour_table(PlanetAlpha.WIND_ROSE, is_tore)
+        self.__cells_count = grid.get_lines_count() * grid.get_columns_count()
+        self.__live = set()
+        self.__frontier = set()
+        self.__neighbours_count = bytearray(self.__cells_count)
+        self.__version = None
+
+    def get_live_cells(self):
+        """Return the set of live cell numbers."""
+        self.__sync()
+        return self.__live
+
+    def __neighbours(self, cell_number):
+        """Return the cell numbers of the neighbours of a cell."""
+        if self.__neighbour_table is None:
+            return self.__planet.get_grid().get_cell_neighborhood_numbers(cell_number, PlanetAlpha.WIND_ROSE,
+                                                                           self.__is_tore)
+        table, width = self.__neighbour_table
+        return [neighbour for neighbour in table[cell_number * width:(cell_number + 1) * width] if neighbour >= 0]
+
+    def __sync(self):
+        """Rebuild the live set and the counts if the grid was modified outside of the engine."""
+        grid = self.__planet.get_grid()
+        if self.__version == grid.get_version():
+            return
+        self.__live.clear()
+        self.__frontier.clear()
+        self.__neighbours_count[:] = bytes(self.__cells_count)
+        alive = grid.get_population().get_alive()
+        self.__live.update(cell_number for cell_number in range(self.__cells_count) if alive[cell_number])
+        for cell_number in self.__live:
+            self.__frontier.add(cell_number)
+            for neighbour in self.__neighbours(cell_number):
+                self.__neighbours_count[neighbour] += 1
+                self.__frontier.add(neighbour)
+        self.__version = grid.get_version()
+
+    def step(self):
+        """
+        Execute one step with the same rules and the same random draws as 'Conway.step'
+        (same generator, same state, same results).
+
+        Returns:
+            list: (cell_number, 'born' | 'die') changes applied to the grid, by cell number.
+        """
+        self.__sync()
+        grid = self.__planet.get_grid()
+        newborn = grid.get_newborn()
+        live = self.__live
+        neighbours_count = self.__neighbours_count
+
+        # Ageing and natural death of every living Human, in one batch
+        natural_deaths = set(grid.get_population().ageing_all(Human.get_death_chances(), self.__random))
+
+        # Conway's rules on the frontier only
+        changes = []
+        for cell in self.__frontier:
+            neighbours = neighbours_count[cell]
+            if cell in live:
+                if neighbours < 2 or neighbours > 3 or cell in natural_deaths:
+                    changes.append((cell, 'die'))
+            elif neighbours == 3:
+                changes.append((cell, 'born'))
+        changes.extend((cell, 'die') for cell in natural_deaths.difference(self.__frontier))
+        changes.sort()
+
+        # Apply changes and build the next frontier
+        self.__frontier = set()
+        applied_changes = []
+        for cell, action in changes:
+            self.__frontier.add(cell)
+            if action == 'born':
+                if not self.__planet.born(cell, newborn):
+                    continue
+                live.add(cell)
+                delta = 1
+            else:
+                self.__planet.die(cell)
+                live.discard(cell)
+                delta = -1
+            applied_changes.append((cell, action))
+            for neighbour in self.__neighbours(cell):
+                neighbours_count[neighbour] += delta
+                self.__frontier.add(neighbour)
+        self.__version = grid.get_version()
+        return applied_changes
@@ -0,0 +1,96 @@
+from array import array
+from collections import deque
+import random
+
+
+class CycleDetector:
+    """
+    Detection of periodic alive/dead states (still lifes, oscillators) of a grid.
+
+    The state is summarized by a Zobrist hash: the XOR of a fixed random 64-bit key per
+    live cell. A change of one cell flips its key, so the hash is updated from the list
+    of changed cells of a step without rescanning the grid. The hashes of the last
+    'window' generations are remembered; when the current hash was already seen, the
+    state is periodic. Only alive/dead states are hashed (never ages).
+
+    Class Attributes:
+        KEYS_SEED (int): Seed of the keys, independent of any simulation generator
+    """
+    KEYS_SEED = 0x5EED
+
+    def __init__(self, cells_count, window=100):
+        """
+        Args:
+            cells_count (int): Number of cells of the grid
+            window (int, optional): Number of past generations remembered, hence the
+                longest detectable period. Defaults to 100.
+        """
+        generator = random.Random(self.KEYS_SEED)
+        self.__keys = array('Q', (generator.getrandbits(64) for _ in range(cells_count)))
+        self.__window = window
+        self.__hash = 0
+        self.__seen = {}
+        self.__history = deque()
+        self.__cycle = None
+
+    def get_hash(self):
+        """Return the hash of the current state."""
+        return self.__hash
+
+    def get_cycle(self):
+        """
+        Return (period, start_generation) if the current state repeats a state of the
+        window, None otherwise. 'start_generation' is the first generation of the cycle.
+        """
+        return self.__cycle
+
+    def reset(self, live_cells, generation):
+        """
+        Forget the history and hash a new state.
+
+        Args:
+            live_cells (iterable): Cell numbers of the live cells
+            generation (int): Generation of the state
+        """
+        keys = self.__keys
+        state_hash = 0
+        for cell_number in live_cells:
+            state_hash ^= keys[cell_number]
+        self.__hash = state_hash
+        self.__seen.clear()
+        self.__history.clear()
+        self.__cycle = None
+        self.__record(generation)
+
+    def update(self, changed_cells, generation):
+        """
+        Apply the cells changed by a step (born or dead) and check for a cycle.
+
+        Args:
+            changed_cells (iterable): Cell numbers whose alive/dead state flipped
+            generation (int): Generation reached by the step
+
+        Returns:
+            tuple: (period, start_generation) or None, as 'get_cycle'.
+        """
+        keys = self.__keys
+        state_hash = self.__hash
+        for cell_number in changed_cells:
+            state_hash ^= keys[cell_number]
+        self.__hash = state_hash
+        self.__record(generation)
+        return self.__cycle
+
+    def __record(self, generation):
+        """Remember the current hash and update the cycle."""
+        last_generation = self.__seen.get(self.__hash)
+        if last_generation is None:
+            self.__cycle = None
+        elif self.__cycle is None or self.__cycle[0] != generation - last_generation:
+            self.__cycle = (generation - last_generation, last_generation)
+        self.__seen[self.__hash] = generation
+        self.__history.append((generation, self.__hash))
+        while len(self.__history) > self.__window:
+            old_generation, old_hash = self.__history.popleft()
+            if self.__seen.get(old_hash) == old_generation:
+                del self.__seen[old_hash]
@@ -0,0 +1,179 @@
+import itertools
+import multiprocessing
+import os
+import random
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: no memory cap
+    resource = None
+
+from Conway import Conway
+from Human import Human
+
+
+class Ensemble:
+    """
+    Sweep of independent Conway simulations, run over a pool of processes.
+
+    The runs are every combination of grid sizes, initial densities and values of
+    Human.LIFE_EXPECTANCY, each one repeated on 'repeats' seeds. The seeds are drawn once
+    from the seed of the ensemble and shared by all the combinations (common random
+    numbers: two combinations differ by their parameters, not by their draws). Each run
+    records its population at every generation.
+
+    'run' yields the summary of each run as soon as it finishes, in completion order;
+    the largest grids are submitted first so that no long run is left alone at the end.
+    A worker process may grow by 'memory_budget' bytes above its size at start (cap of
+    the address space, where it can be read: Linux); a run going beyond fails with a
+    MemoryError reported in its summary, the other runs go on. Workers are replaced after
+    'runs_per_worker' runs, giving their memory back to the system.
+    """
+
+    def __init__(self, sizes=(100,), densities=(0.1,), life_expectancies=(Human.LIFE_EXPECTANCY,), repeats=1,
+                 generations=100, seed=0, engine='array', is_tore=False, stop_on_cycle=False, processes=None,
+                 memory_budget=None, runs_per_worker=None):
+        """
+        Args:
+            sizes (iterable, optional): Grid sizes, each a number of lines and columns or a
+                (lines, columns) tuple. Defaults to (100,).
+            densities (iterable, optional): Initial proportions of live cells. Defaults to (0.1,).
+            life_expectancies (iterable, optional): Values of Human.LIFE_EXPECTANCY.
+                Defaults to the current value.
+            repeats (int, optional): Number of seeds per combination. Defaults to 1.
+            generations (int, optional): Number of generations of each run. Defaults to 100.
+            seed (int, optional): Seed drawing the seeds of the runs. Defaults to 0.
+            engine (str, optional): Step engine of the simulations (see Conway.ENGINES).
+                Defaults to 'array'.
+            is_tore (bool, optional): If True the grids are tori. Defaults to False.
+            stop_on_cycle (bool, optional): If True a run stops as soon as its world is
+                periodic. Defaults to False.
+            processes (int, optional): Number of worker processes. Defaults to None (one
+                per CPU).
+            memory_budget (int, optional): Memory a worker may allocate, in bytes.
+                Defaults to None (no limit).
+            runs_per_worker (int, optional): Number of runs after which a worker is
+                replaced. Defaults to None (workers live as long as the pool).
+        """
+        if engine not in Conway.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {Conway.ENGINES}")
+        self.__sizes = [tuple(size) if isinstance(size, (tuple, list)) else (size, size) for size in sizes]
+        self.__densities = list(densities)
+        self.__life_expectancies = list(life_expectancies)
+        self.__repeats = repeats
+        self.__generations = generations
+        self.__seed = seed
+        self.__engine = engine
+        self.__is_tore = is_tore
+        self.__stop_on_cycle = stop_on_cycle
+        self.__processes = processes or os.cpu_count() or 1
+        self.__memory_budget = memory_budget
+        self.__runs_per_worker = runs_per_worker
+
+    def get_parameters(self):
+        """Return the parameters of the sweep, as a JSON serializable dict."""
+        return {'sizes': [list(size) for size in self.__sizes], 'densities': self.__densities,
+                'life_expectancies': self.__life_expectancies, 'repeats': self.__repeats,
+                'generations': self.__generations, 'seed': self.__seed, 'engine': self.__engine,
+                'tore': self.__is_tore, 'stop_on_cycle': self.__stop_on_cycle, 'processes': self.__processes,
+                'memory_budget': self.__memory_budget}
+
+    def get_runs(self):
+        """
+        Return the parameters of every run, numbered in sweep order (size, density,
+        life expectancy, seed).
+
+        Returns:
+            list: One dict per run
+        """
+        generator = random.Random(self.__seed)
+        seeds = [generator.getrandbits(32) for _ in range(self.__repeats)]
+        return [{'run': run_number, 'seed': seed, 'lines': lines_count, 'columns': columns_count,
+                 'density': density, 'life_expectancy': life_expectancy, 'generations': self.__generations,
+                 'engine': self.__engine, 'tore': self.__is_tore, 'stop_on_cycle': self.__stop_on_cycle}
+                for run_number, ((lines_count, columns_count), density, life_expectancy, seed)
+                in enumerate(itertools.product(self.__sizes, self.__densities, self.__life_expectancies, seeds))]
+
+    @staticmethod
+    def limit_memory(memory_budget):
+        """
+        Cap the address space of the current process at its size plus 'memory_budget'
+        bytes (initializer of the workers). Without a budget, or where the size of the
+        process cannot be read, nothing is capped.
+        """
+        if memory_budget is None or resource is None or not os.path.exists('/proc/self/statm'):
+            return
+        with open('/proc/self/statm') as statm:
+            size = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+        soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        limit = size + memory_budget
+        if hard_limit != resource.RLIM_INFINITY:
+            limit = min(limit, hard_limit)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard_limit))
+
+    @staticmethod
+    def run_one(run):
+        """
+        Run one simulation (in a worker).
+
+        Args:
+            run (dict): Parameters of the run (see 'get_runs')
+
+        Returns:
+            dict: Summary of the run: its parameters, the number of generations run,
+                the final, peak and minimal populations, the final mean age, the cycle
+                found (period and start, -1 if none), the elapsed time, the error which
+                stopped it (None if it ended normally) and the 'population' curve, from
+                generation 0.
+        """
+        life_expectancy = Human.LIFE_EXPECTANCY
+        Human.LIFE_EXPECTANCY = run['life_expectancy']
+        start = time.perf_counter()
+        populations = []
+        cycle = None
+        error = None
+        mean_age = 0.0
+        try:
+            conway = Conway(run['lines'], run['columns'], engine=run['engine'], seed=run['seed'],
+                            is_tore=run['tore'])
+            conway.populate(run['density'])
+            population = conway.get_grid().get_population()
+            populations.append(population.get_count())
+            for _ in range(run['generations']):
+                conway.step()
+                populations.append(population.get_count())
+                cycle = conway.get_cycle()
+                if run['stop_on_cycle'] and cycle is not None:
+                    break
+            if population.get_count():
+                mean_age = sum(population.get_ages()) / population.get_count()
+        except Exception as exception:
+            error = f"{type(exception).__name__}: {exception}" if str(exception) else type(exception).__name__
+        finally:
+            Human.LIFE_EXPECTANCY = life_expectancy
+        return {'run': run['run'], 'seed': run['seed'], 'lines': run['lines'], 'columns': run['columns'],
+                'density': run['density'], 'life_expectancy': run['life_expectancy'],
+                'generations': max(0, len(populations) - 1),
+                'final_population': populations[-1] if populations else 0,
+                'peak_population': max(populations, default=0),
+                'min_population': min(populations, default=0),
+                'mean_age': mean_age,
+                'cycle_period': cycle[0] if cycle else -1,
+                'cycle_start': cycle[1] if cycle else -1,
+                'elapsed': time.perf_counter() - start,
+                'error': error,
+                'population': populations}
+
+    def run(self):
+        """
+        Run the sweep over the pool.
+
+        Yields:
+            dict: Summary of each run as soon as it finishes (see 'run_one').
+        """
+        runs = sorted(self.get_runs(), key=lambda run: run['lines'] * run['columns'], reverse=True)
+        with multiprocessing.Pool(self.__processes, initializer=self.limit_memory,
+                                  initargs=(self.__memory_budget,),
+                                  maxtasksperchild=self.__runs_per_worker) as pool:
+            yield from pool.imap_unordered(self.run_one, runs)
@@ -0,0 +1,158 @@
+from array import array
+import json
+import struct
+import sys
+
+
+class EnsembleResults:
+    """
+    Columnar table of the summaries of the runs of an Ensemble, saved in one binary file.
+
+    Each column holds one value per run in a typed array. The population curves, of
+    variable lengths, are stored as one column of all their values plus a column of
+    offsets: the curve of the row 'i' is population[offsets[i]:offsets[i + 1]].
+
+    Layout (little-endian): header (magic, version, number of rows, length of the
+    schema), JSON schema (metadata, then the name, typecode, offset and size of every
+    column; text columns are JSON lists), then the columns, each starting on a multiple
+    of 8 bytes. 'load' reads the file in one call, then builds every array with a single
+    'frombytes'.
+
+    Class Attributes:
+        MAGIC (bytes): First bytes of the files
+        VERSION (int): Version of the format written
+        COLUMNS (tuple): (name, array typecode) of the numeric columns of the summaries
+        TEXT_COLUMNS (tuple): Names of the text columns (None allowed)
+    """
+    MAGIC = b'ENSB'
+    VERSION = 1
+    COLUMNS = (('run', 'q'), ('seed', 'q'), ('lines', 'q'), ('columns', 'q'), ('density', 'd'),
+               ('life_expectancy', 'q'), ('generations', 'q'), ('final_population', 'q'),
+               ('peak_population', 'q'), ('min_population', 'q'), ('mean_age', 'd'), ('cycle_period', 'q'),
+               ('cycle_start', 'q'), ('elapsed', 'd'))
+    TEXT_COLUMNS = ('error',)
+    __HEADER = struct.Struct('<4sHxxQI')
+
+    def __init__(self, metadata=None):
+        """
+        Create an empty table.
+
+        Args:
+            metadata (dict, optional): JSON serializable description of the ensemble
+                (e.g. Ensemble.get_parameters). Defaults to None.
+        """
+        self.__metadata = metadata or {}
+        self.__columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        self.__texts = {name: [] for name in self.TEXT_COLUMNS}
+        self.__population = array('q')
+        self.__offsets = array('q', [0])
+
+    def add(self, summary):
+        """
+        Append the summary of a run (see Ensemble.run_one).
+
+        Args:
+            summary (dict): Values of the columns, and the 'population' curve
+        """
+        for name, column in self.__columns.items():
+            column.append(summary[name])
+        for name, texts in self.__texts.items():
+            texts.append(summary.get(name))
+        self.__population.extend(summary['population'])
+        self.__offsets.append(len(self.__population))
+
+    def get_rows_count(self):
+        """Return the number of runs."""
+        return len(self.__offsets) - 1
+
+    def get_metadata(self):
+        """Return the description of the ensemble."""
+        return self.__metadata
+
+    def get_column(self, name):
+        """Return a column: an array, or a list for the text columns."""
+        if name in self.__texts:
+            return self.__texts[name]
+        return self.__columns[name]
+
+    def get_curve(self, row):
+        """Return the population at every generation of the run of a row."""
+        return self.__population[self.__offsets[row]:self.__offsets[row + 1]]
+
+    def get_row(self, row):
+        """Return the summary of a row, as a dict (curve included)."""
+        summary = {name: column[row] for name, column in self.__columns.items()}
+        summary.update((name, texts[row]) for name, texts in self.__texts.items())
+        summary['population'] = self.get_curve(row).tolist()
+        return summary
+
+    @staticmethod
+    def __align(size):
+        return -(-size // 8) * 8
+
+    def save(self, path):
+        """Write the table to a file."""
+        arrays = dict(self.__columns, population=self.__population, offsets=self.__offsets)
+        texts = {name: json.dumps(values).encode() for name, values in self.__texts.items()}
+        schema = {'metadata': self.__metadata, 'columns': []}
+        offset = 0
+        for name, values in arrays.items():
+            schema['columns'].append({'name': name, 'typecode': values.typecode, 'offset': offset,
+                                      'size': len(values) * values.itemsize})
+            offset += self.__align(len(values) * values.itemsize)
+        for name, data in texts.items():
+            schema['columns'].append({'name': name, 'typecode': 'json', 'offset': offset, 'size': len(data)})
+            offset += self.__align(len(data))
+        schema = json.dumps(schema).encode()
+        with open(path, 'wb') as file:
+            file.write(self.__HEADER.pack(self.MAGIC, self.VERSION, self.get_rows_count(), len(schema)))
+            file.write(schema)
+            file.write(bytes(self.__align(file.tell()) - file.tell()))
+            for data in list(arrays.values()) + list(texts.values()):
+                if isinstance(data, array) and sys.byteorder == 'big':
+                    data = array(data.typecode, data)
+                    data.byteswap()
+                data = data.tobytes() if isinstance(data, array) else data
+                file.write(data)
+                file.write(bytes(self.__align(len(data)) - len(data)))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a table written by 'save', in one read.
+
+        Raises:
+            ValueError: If the file is not an ensemble file of a supported version.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < cls.__HEADER.size:
+            raise ValueError(f"{path} is not an ensemble file")
+        magic, version, rows_count, schema_size = cls.__HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not an ensemble file of version {cls.VERSION}")
+        schema = json.loads(data[cls.__HEADER.size:cls.__HEADER.size + schema_size])
+        data_offset = cls.__align(cls.__HEADER.size + schema_size)
+        view = memoryview(data)
+        results = cls(schema['metadata'])
+        for column in schema['columns']:
+            start = data_offset + column['offset']
+            chunk = view[start:start + column['size']]
+            if column['typecode'] == 'json':
+                values = json.loads(bytes(chunk))
+                if column['name'] in results.__texts:
+                    results.__texts[column['name']] = values
+                continue
+            values = array(column['typecode'])
+            values.frombytes(chunk)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            if column['name'] == 'population':
+                results.__population = values
+            elif column['name'] == 'offsets':
+                results.__offsets = values
+            elif column['name'] in results.__columns:
+                results.__columns[column['name']] = values
+        if results.get_rows_count() != rows_count:
+            raise ValueError(f"{path} is truncated: {results.get_rows_count()} rows instead of {rows_count}")
+        return results
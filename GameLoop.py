@@ -0,0 +1,122 @@
+import time
+
+from RateMeter import RateMeter
+
+
+class GameLoop:
+    """
+    Fixed-timestep loop running a simulation at a target number of steps per second.
+
+    The loop does not own a timer: 'tick' is called by the caller's scheduler (Tk 'after',
+    a queue timeout...) and returns the time until the next step is due. Each tick runs
+    every step due since the previous tick, from the time elapsed on the clock, so the
+    long-run rate does not drift with the time taken by the steps, the drawing or the
+    scheduler. When the loop falls behind, one tick runs several steps before drawing a
+    single frame, up to 'max_steps_per_frame'; the steps still late are dropped (counted
+    by 'get_dropped_steps_count').
+
+    The achieved steps and frames per second, and the time taken by the ticks, show when
+    the loop is CPU-bound.
+    """
+
+    def __init__(self, step, render=None, step_period=0.1, max_steps_per_frame=5, clock=time.monotonic):
+        """
+        Args:
+            step (callable): Run one step of the simulation; a False result stops the loop
+            render (callable, optional): Draw a frame, after the steps of a tick. Defaults
+                to None (no drawing).
+            step_period (float, optional): Target time between two steps, in seconds, 0
+                for as many steps as possible. Defaults to 0.1.
+            max_steps_per_frame (int, optional): Maximal number of steps of one tick.
+                Defaults to 5.
+            clock (callable, optional): Clock in seconds. Defaults to time.monotonic.
+        """
+        self.__step = step
+        self.__render = render
+        self.__step_period = step_period
+        self.__max_steps_per_frame = max(1, max_steps_per_frame)
+        self.__clock = clock
+        self.__is_running = False
+        self.__last_time = clock()
+        self.__lag = 0.0
+        self.__tick_time = 0.0
+        self.__dropped_steps_count = 0
+        self.__steps = RateMeter(clock=clock)
+        self.__frames = RateMeter(clock=clock)
+
+    def start(self):
+        """Start (or restart) the loop; the first step is due immediately."""
+        self.__is_running = True
+        self.__last_time = self.__clock()
+        self.__lag = self.__step_period
+        self.__steps.reset()
+        self.__frames.reset()
+
+    def stop(self):
+        """Stop the loop: the next ticks do nothing."""
+        self.__is_running = False
+
+    def is_running(self):
+        """Test if the loop is running."""
+        return self.__is_running
+
+    def get_step_period(self):
+        """Return the target time between two steps, in seconds."""
+        return self.__step_period
+
+    def set_step_period(self, step_period):
+        """Set the target time between two steps, in seconds (0 for as many steps as possible)."""
+        self.__step_period = step_period
+        self.__lag = min(self.__lag, step_period)
+
+    def get_steps_per_second(self):
+        """Return the achieved number of steps per second."""
+        return self.__steps.get_rate()
+
+    def get_frames_per_second(self):
+        """Return the achieved number of frames per second."""
+        return self.__frames.get_rate()
+
+    def get_tick_time(self):
+        """Return the average time taken by a tick running steps (steps and frame), in seconds."""
+        return self.__tick_time
+
+    def get_dropped_steps_count(self):
+        """Return the number of late steps dropped because of 'max_steps_per_frame'."""
+        return self.__dropped_steps_count
+
+    def tick(self):
+        """
+        Run the steps due, then draw a frame if at least one step ran.
+
+        Returns:
+            float: Time until the next step is due, in seconds, or None if the loop is
+                stopped (no tick should be scheduled).
+        """
+        if not self.__is_running:
+            return None
+        start_time = self.__clock()
+        self.__lag += start_time - self.__last_time
+        self.__last_time = start_time
+        steps_count = 0
+        while self.__lag >= self.__step_period and steps_count < self.__max_steps_per_frame:
+            self.__lag -= self.__step_period
+            steps_count += 1
+            if self.__step() is False:
+                self.__is_running = False
+                break
+        if self.__is_running and self.__lag >= self.__step_period:
+            # Still late after the last step of the frame: drop the backlog
+            if self.__step_period:
+                self.__dropped_steps_count += int(self.__lag / self.__step_period)
+            self.__lag = 0.0
+        if steps_count:
+            self.__steps.add(steps_count)
+            if self.__render is not None:
+                self.__render()
+                self.__frames.add()
+            tick_time = self.__clock() - start_time
+            self.__tick_time = tick_time if not self.__tick_time else 0.9 * self.__tick_time + 0.1 * tick_time
+        if not self.__is_running:
+            return None
+        return max(0.0, self.__step_period - self.__lag)
@@ -1,7 +1,12 @@
+from array import array
 import random
 
 
 class Grid:
+    # Tables de voisinage partagées par toutes les grilles de même forme (voir 'get_neighbour_table')
+    NEIGHBOUR_TABLES_COUNT = 8
+    NEIGHBOUR_TABLE_MAX_SIZE = 1 << 24
+    __neighbour_tables = {}
 
     def __init__(self, grid_init):
         """ Classe 'Grid' avec 3 attributs :
@@ -137,9 +142,81 @@ class Grid:
         dans la grille correspondant aux N 2-uplet (delta_ligne, delta_colonne) fournis par la liste deltas.
                 Si 'is_tore' est à 'True' le voisin existe toujours en considérant la grille comme un tore.
                 Si 'is_tore' est à 'False' un voisin hors de la grille n'est pas considéré."""
-        res = []
-        for delta in deltas:
-            neighbour = self.get_cell_neighbour_number(cell_number, delta, is_tore)
-            if neighbour is not None:
-                res.append(neighbour)
-        return sorted(res)
+        neighbour_table = self.get_neighbour_table(deltas, is_tore)
+        if neighbour_table is None:
+            res = []
+            for delta in deltas:
+                neighbour = self.get_cell_neighbour_number(cell_number, delta, is_tore)
+                if neighbour is not None:
+                    res.append(neighbour)
+            return sorted(res)
+        table, width = neighbour_table
+        return self.__table_neighbours(table, width, cell_number)
+
+    @staticmethod
+    def __table_neighbours(table, width, cell_number):
+        """ Extrait d'une table de voisinage les numéros des voisins de la cellule 'cell_number'."""
+        neighbours = table[cell_number * width:(cell_number + 1) * width].tolist()
+        if neighbours and neighbours[-1] < 0:
+            del neighbours[neighbours.index(-1):]
+        return neighbours
+
+    def get_cells_neighborhood_numbers(self, cell_numbers, deltas, is_tore=True):
+        """ Retourne pour chaque cellule de 'cell_numbers' la liste triée de ses cellules voisines (voir
+        'get_cell_neighborhood_numbers'), la table de voisinage n'étant cherchée qu'une fois."""
+        neighbour_table = self.get_neighbour_table(deltas, is_tore)
+        if neighbour_table is None:
+            return [self.get_cell_neighborhood_numbers(cell_number, deltas, is_tore) for cell_number in cell_numbers]
+        table, width = neighbour_table
+        return [self.__table_neighbours(table, width, cell_number) for cell_number in cell_numbers]
+
+    def get_neighbour_table(self, deltas, is_tore=True):
+        """ Retourne la table de voisinage (table, largeur) de la grille pour les 2-uplet 'deltas'.
+        'table' est un array('l') où les voisins de la cellule 'c' sont, triés, en
+        table[c * largeur:(c + 1) * largeur], complétés par des -1 lorsque 'is_tore' est à 'False'.
+        La table est calculée une seule fois par combinaison (forme, deltas, is_tore) et partagée par
+        toutes les grilles de même forme. Retourne 'None' si la table dépasserait
+        'NEIGHBOUR_TABLE_MAX_SIZE' entrées."""
+        deltas = tuple(tuple(delta) for delta in deltas)
+        key = (self.get_lines_count(), self.get_columns_count(), deltas, bool(is_tore))
+        neighbour_table = Grid.__neighbour_tables.get(key)
+        if neighbour_table is None:
+            if key[0] * key[1] * len(deltas) > self.NEIGHBOUR_TABLE_MAX_SIZE:
+                return None
+            neighbour_table = (self.__build_neighbour_table(*key), len(deltas))
+            Grid.__neighbour_tables[key] = neighbour_table
+            while len(Grid.__neighbour_tables) > self.NEIGHBOUR_TABLES_COUNT:
+                del Grid.__neighbour_tables[next(iter(Grid.__neighbour_tables))]
+        return neighbour_table
+
+    @staticmethod
+    def __build_neighbour_table(lines_count, columns_count, deltas, is_tore):
+        """ Calcule la table de voisinage d'une grille de 'lines_count' lignes et 'columns_count' colonnes."""
+        delta_neighbours = []
+        for delta_line, delta_column in deltas:
+            columns = [column_number + delta_column for column_number in range(columns_count)]
+            if is_tore:
+                columns = [column_number % columns_count for column_number in columns]
+            else:
+                columns = [column_number if 0 <= column_number < columns_count else -1 for column_number in columns]
+            neighbours = []
+            for line_number in range(lines_count):
+                line_number += delta_line
+                if is_tore:
+                    line_number %= lines_count
+                elif not 0 <= line_number < lines_count:
+                    neighbours.extend([-1] * columns_count)
+                    continue
+                first_cell_number = line_number * columns_count
+                neighbours.extend([first_cell_number + column_number if column_number >= 0 else -1
+                                   for column_number in columns])
+            delta_neighbours.append(neighbours)
+        table = array('l')
+        for neighbours in zip(*delta_neighbours):
+            neighbours = sorted(neighbours)
+            if neighbours and neighbours[0] < 0:
+                # Les voisins hors de la grille (-1) sont placés en fin de liste
+                outside_count = neighbours.count(-1)
+                neighbours = neighbours[outside_count:] + neighbours[:outside_count]
+            table.extend(neighbours)
+        return table
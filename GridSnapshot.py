@@ -0,0 +1,107 @@
+import re
+import weakref
+
+
+class GridSnapshot:
+    """
+    Immutable copy of a PopulationPlanet at one generation, drawn while the live planet
+    keeps changing in another thread (see SimulationWorker).
+
+    The population (alive and ages arrays) is copied at C speed; the lines of the grid
+    are only built on demand, for the visible part of the grid. The snapshot offers the
+    read-only part of the Grid API used by the renderers.
+
+    A snapshot may carry the cells changed since an older snapshot, its base (see
+    'set_changes'), which spares 'get_changed_cells' the comparison of the whole grids.
+    """
+    __CHANGED = re.compile(b'[^\x00]')
+
+    def __init__(self, planet, generation=0):
+        """
+        Args:
+            planet (PopulationPlanet): Planet whose Humans are copied
+            generation (int, optional): Number of the generation of the copy. Defaults to 0.
+        """
+        self.__lines_count = planet.get_lines_count()
+        self.__columns_count = planet.get_columns_count()
+        self.__population = planet.get_population().copy()
+        self.__values = (planet.get_ground(), planet.get_newborn())
+        self.__generation = generation
+        self.__lines = {}
+        self.__changes_base = None
+        self.__changed_cells = None
+
+    def get_generation(self):
+        """Return the number of the generation of the snapshot."""
+        return self.__generation
+
+    def get_population(self):
+        """Return the copied Population (not to be modified)."""
+        return self.__population
+
+    def get_lines_count(self):
+        """Return the number of lines of the grid."""
+        return self.__lines_count
+
+    def get_columns_count(self):
+        """Return the number of columns of the grid."""
+        return self.__columns_count
+
+    def get_cell_number_from_coordinates(self, line_number, column_number):
+        """Return the number of the cell at (line_number, column_number)."""
+        return line_number * self.__columns_count + column_number
+
+    def get_coordinates_from_cell_number(self, cell_number):
+        """Return the (line, column) of a cell number."""
+        return divmod(cell_number, self.__columns_count)
+
+    def get_cell(self, cell_number):
+        """Return a Human view of a live cell (ages of the snapshot), or the ground."""
+        human = self.__population.get_human(cell_number)
+        return self.__values[0] if human is None else human
+
+    def get_line(self, line_number):
+        """Return the raw values of a line (ground or the shared newborn Human), built once."""
+        line = self.__lines.get(line_number)
+        if line is None:
+            start = line_number * self.__columns_count
+            alive = self.__population.get_alive()[start:start + self.__columns_count]
+            line = self.__lines[line_number] = list(map(self.__values.__getitem__, alive))
+        return line
+
+    def set_changes(self, base, cell_numbers):
+        """
+        Record the cells changed since an older snapshot, before the snapshot is shared.
+
+        Args:
+            base (GridSnapshot): Older snapshot of the same planet, or None
+            cell_numbers (iterable): Cells changed since 'base', or None if unknown
+        """
+        if base is None or cell_numbers is None:
+            self.__changes_base = self.__changed_cells = None
+        else:
+            self.__changes_base = weakref.ref(base)
+            self.__changed_cells = sorted(cell_numbers)
+
+    def get_changed_cells(self, previous):
+        """
+        Return the cells whose alive state differs from a previous snapshot of the same
+        planet, in increasing order: the recorded changes if 'previous' is their base
+        (they may include cells changed back since), else a comparison of the snapshots.
+
+        Args:
+            previous (GridSnapshot): Older snapshot, or None
+
+        Returns:
+            list: Cell numbers, or None if there is no comparable previous snapshot
+                (every cell may have changed).
+        """
+        if previous is None or previous.get_lines_count() * previous.get_columns_count() != \
+                self.__lines_count * self.__columns_count:
+            return None
+        if self.__changes_base is not None and self.__changes_base() is previous:
+            return list(self.__changed_cells)
+        alive = self.__population.get_alive()
+        difference = (int.from_bytes(alive, 'little')
+                      ^ int.from_bytes(previous.get_population().get_alive(), 'little'))
+        return [match.start() for match in self.__CHANGED.finditer(difference.to_bytes(len(alive), 'little'))]
@@ -0,0 +1,274 @@
+from Human import Human
+
+
+class QuadNode:
+    """
+    Immutable node of a Hashlife quadtree.
+
+    A node of level 'k' is a square of 2^k x 2^k cells split into four nodes of level
+    'k - 1'. Level 0 nodes are single cells. Nodes are canonicalized by 'Hashlife', so two
+    equal squares are always the same object and can be compared by identity.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, population=0):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+
+
+class Hashlife:
+    """
+    Hashlife engine (memoized quadtree) for long-horizon runs of Conway's Game of Life.
+
+    Features:
+    - Canonicalized quadtree nodes: identical squares are stored once
+    - Memoized results: the future of a square is computed once per jump size
+    - Memory cap: when the estimated size of the caches exceeds it, they are evicted
+    - Jumps of 2^j generations at once, 'advance' combines them for any count
+
+    Only the pure B3/S23 rules are supported (no ageing, no natural death). The pattern
+    evolves on an unbounded plane: unlike 'Conway', cells are not stopped by the edges of
+    the planet, and 'export_planet' keeps only the part that lies inside the planet.
+
+    Class Attributes:
+        NODE_BYTES (int): Estimated memory used by one cached node and its result
+    """
+    NODE_BYTES = 400
+
+    def __init__(self, memory_limit=256 * 2 ** 20):
+        """
+        Initialize an empty universe.
+
+        Args:
+            memory_limit (int, optional): Memory cap of the caches in bytes.
+                Defaults to 256 MiB.
+        """
+        self.__max_nodes = max(memory_limit // self.NODE_BYTES, 1024)
+        self.__nodes = {}
+        self.__results = {}
+        self.__empty = []
+        self.__dead = QuadNode(0)
+        self.__alive = QuadNode(0, population=1)
+        self.__evictions_count = 0
+        self.__generation = 0
+        self.__root = self.__get_empty(3)
+        self.__origin = (0, 0)  # (line, column) of the top-left corner of the root
+
+    def get_generation(self):
+        """Return the number of generations computed since the last import."""
+        return self.__generation
+
+    def get_population(self):
+        """Return the number of live cells."""
+        return self.__root.population
+
+    def get_evictions_count(self):
+        """Return how many times the caches were evicted to respect the memory cap."""
+        return self.__evictions_count
+
+    def get_cache_size(self):
+        """Return the number of canonical nodes and memoized results currently cached."""
+        return len(self.__nodes), len(self.__results)
+
+    def __evict(self):
+        """Drop all the caches. Nodes still referenced stay valid, only sharing is lost."""
+        self.__nodes.clear()
+        self.__results.clear()
+        self.__evictions_count += 1
+
+    def __join(self, nw, ne, sw, se):
+        """Return the canonical node made of the four given quadrants."""
+        key = (nw, ne, sw, se)
+        node = self.__nodes.get(key)
+        if node is None:
+            if len(self.__nodes) + len(self.__results) >= self.__max_nodes:
+                self.__evict()
+            node = QuadNode(nw.level + 1, nw, ne, sw, se,
+                            nw.population + ne.population + sw.population + se.population)
+            self.__nodes[key] = node
+        return node
+
+    def __get_empty(self, level):
+        """Return the empty node of the given level."""
+        while len(self.__empty) <= level:
+            if not self.__empty:
+                self.__empty.append(self.__dead)
+            else:
+                child = self.__empty[-1]
+                self.__empty.append(QuadNode(child.level + 1, child, child, child, child))
+        return self.__empty[level]
+
+    def __centre(self, node):
+        """Return the node of the next level with 'node' in its centre and empty borders."""
+        border = self.__get_empty(node.level - 1)
+        return self.__join(self.__join(border, border, border, node.nw),
+                           self.__join(border, border, node.ne, border),
+                           self.__join(border, node.sw, border, border),
+                           self.__join(node.se, border, border, border))
+
+    def __is_padded(self, node):
+        """Test if all live cells of 'node' are in its central square of half width."""
+        return (node.level >= 3
+                and node.nw.population == node.nw.se.se.population
+                and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population
+                and node.se.population == node.se.nw.nw.population)
+
+    def __life_4x4(self, node):
+        """Return the centre 2x2 node of a 4x4 node after one generation."""
+        cells = [[0] * 4 for _ in range(4)]
+        for line_offset, column_offset, quadrant in ((0, 0, node.nw), (0, 2, node.ne),
+                                                     (2, 0, node.sw), (2, 2, node.se)):
+            cells[line_offset][column_offset] = quadrant.nw.population
+            cells[line_offset][column_offset + 1] = quadrant.ne.population
+            cells[line_offset + 1][column_offset] = quadrant.sw.population
+            cells[line_offset + 1][column_offset + 1] = quadrant.se.population
+        next_cells = []
+        for line_number in (1, 2):
+            for column_number in (1, 2):
+                neighbours = sum(cells[line_number + delta_line][column_number + delta_column]
+                                 for delta_line in (-1, 0, 1) for delta_column in (-1, 0, 1)) \
+                    - cells[line_number][column_number]
+                is_alive = neighbours == 3 or neighbours == 2 and cells[line_number][column_number]
+                next_cells.append(self.__alive if is_alive else self.__dead)
+        return self.__join(*next_cells)
+
+    def __successor(self, node, j):
+        """
+        Return the centre of 'node' (a node of level k >= 2, half its width) after
+        2^min(j, k - 2) generations.
+        """
+        if node.population == 0:
+            return node.nw
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self.__results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self.__life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c1 = self.__successor(nw, j)
+            c2 = self.__successor(self.__join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self.__successor(ne, j)
+            c4 = self.__successor(self.__join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self.__successor(self.__join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self.__successor(self.__join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self.__successor(sw, j)
+            c8 = self.__successor(self.__join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self.__successor(se, j)
+            if j < node.level - 2:
+                # The nine sub-squares already advanced 2^j: keep their centres
+                result = self.__join(self.__join(c1.se, c2.sw, c4.ne, c5.nw),
+                                     self.__join(c2.se, c3.sw, c5.ne, c6.nw),
+                                     self.__join(c4.se, c5.sw, c7.ne, c8.nw),
+                                     self.__join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                # Two half jumps: the nine sub-squares advanced 2^(k-3), four more to go
+                result = self.__join(self.__successor(self.__join(c1, c2, c4, c5), j),
+                                     self.__successor(self.__join(c2, c3, c5, c6), j),
+                                     self.__successor(self.__join(c4, c5, c7, c8), j),
+                                     self.__successor(self.__join(c5, c6, c8, c9), j))
+        self.__results[key] = result
+        return result
+
+    def __jump(self, j):
+        """Advance the universe by 2^j generations."""
+        root = self.__root
+        line_origin, column_origin = self.__origin
+        while root.level < j + 3 or not self.__is_padded(root):
+            line_origin -= 2 ** (root.level - 1)
+            column_origin -= 2 ** (root.level - 1)
+            root = self.__centre(root)
+        self.__root = self.__successor(root, j)
+        self.__origin = (line_origin + 2 ** (root.level - 2), column_origin + 2 ** (root.level - 2))
+        self.__generation += 2 ** j
+
+    def advance(self, generations):
+        """
+        Advance the universe by 'generations' generations, as a sequence of power of two
+        jumps (one per bit set in 'generations').
+
+        Args:
+            generations (int): Number of generations to compute
+        """
+        for j in range(generations.bit_length()):
+            if generations >> j & 1:
+                self.__jump(j)
+
+    def __build(self, level, line_number, column_number, live_cells):
+        """Build the node of the given level whose top-left cell is at the given coordinates."""
+        if not live_cells:
+            return self.__get_empty(level)
+        if level == 0:
+            return self.__alive
+        half = 2 ** (level - 1)
+        quadrants = ([], [], [], [])
+        for cell in live_cells:
+            quadrants[(cell[0] >= line_number + half) * 2 + (cell[1] >= column_number + half)].append(cell)
+        return self.__join(self.__build(level - 1, line_number, column_number, quadrants[0]),
+                           self.__build(level - 1, line_number, column_number + half, quadrants[1]),
+                           self.__build(level - 1, line_number + half, column_number, quadrants[2]),
+                           self.__build(level - 1, line_number + half, column_number + half, quadrants[3]))
+
+    def import_planet(self, planet):
+        """
+        Replace the universe with the content of a PlanetAlpha grid: every cell that is
+        not the ground is alive. The generation count is reset to 0.
+
+        Args:
+            planet (PlanetAlpha): Grid to import
+        """
+        ground = planet.get_ground()
+        live_cells = [(line_number, column_number)
+                      for line_number, line in enumerate(planet.get_grid())
+                      for column_number, value in enumerate(line)
+                      if value != ground]
+        level = 3
+        while 2 ** level < max(planet.get_lines_count(), planet.get_columns_count()):
+            level += 1
+        self.__root = self.__build(level, 0, 0, live_cells)
+        self.__origin = (0, 0)
+        self.__generation = 0
+
+    def get_live_cells(self):
+        """Return the list of (line, column) coordinates of the live cells."""
+        live_cells = []
+        stack = [(self.__root, self.__origin[0], self.__origin[1])]
+        while stack:
+            node, line_number, column_number = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                live_cells.append((line_number, column_number))
+                continue
+            half = 2 ** (node.level - 1)
+            stack.append((node.nw, line_number, column_number))
+            stack.append((node.ne, line_number, column_number + half))
+            stack.append((node.sw, line_number + half, column_number))
+            stack.append((node.se, line_number + half, column_number + half))
+        return live_cells
+
+    def export_planet(self, planet):
+        """
+        Write the universe into a PlanetAlpha grid through its 'born' and 'die' methods.
+        Live cells become Humans aged 0, cells outside the planet are ignored.
+
+        Args:
+            planet (PlanetAlpha): Grid to update
+        """
+        lines_count, columns_count = planet.get_lines_count(), planet.get_columns_count()
+        live_cell_numbers = {planet.get_cell_number_from_coordinates(line_number, column_number)
+                             for line_number, column_number in self.get_live_cells()
+                             if 0 <= line_number < lines_count and 0 <= column_number < columns_count}
+        ground = planet.get_ground()
+        for cell_number in range(lines_count * columns_count):
+            is_free = planet.get_cell(cell_number) == ground
+            if cell_number in live_cell_numbers:
+                if is_free:
+                    planet.born(cell_number, Human(['Conway'], 'Being', 'XX', 'Hello'))
+            elif not is_free:
+                planet.die(cell_number)
@@ -15,8 +15,10 @@ class Human(Element):
     Class Attributes:
         LIFE_EXPECTANCY (int): Age at which natural death chance begins
         __count (int): Total number of Human instances created
+        __death_chances (tuple): Life expectancy and death chances table computed for it
     """
     __count = 0
+    __death_chances = (None, None)
     LIFE_EXPECTANCY = 50  # Âge à partir duquel la mortalité augmente
 
     @classmethod
@@ -24,6 +26,21 @@ class Human(Element):
         """Return the total number of Human instances created."""
         return cls.__count
 
+    @classmethod
+    def get_death_chances(cls):
+        """
+        Return the natural death probability per step, indexed by age:
+        0 up to LIFE_EXPECTANCY, then (age - LIFE_EXPECTANCY) / 100 up to certain death.
+        The table is computed once per value of LIFE_EXPECTANCY.
+        """
+        life_expectancy, death_chances = cls.__death_chances
+        if life_expectancy != cls.LIFE_EXPECTANCY:
+            life_expectancy = cls.LIFE_EXPECTANCY
+            death_chances = [0] * (life_expectancy + 1) + \
+                [(age - life_expectancy) / 100 for age in range(life_expectancy + 1, life_expectancy + 101)]
+            Human.__death_chances = (life_expectancy, death_chances)
+        return death_chances
+
     def __init__(self, first_names, last_name, alpha_code2, greetings, majority=18, kinds=['Human'], name='Human', char_repr='H', sound='Hi'):
         """
         Initialize a Human instance.
@@ -88,7 +105,7 @@ class Human(Element):
         """
         Return 'True' if the age of majority is reached. 'False' otherwise.
         """
-        if self.__age >= self.__majority:
+        if self.get_age() >= self.__majority:
             return '(majeur)'
         return '(mineur)'
 
@@ -99,7 +116,7 @@ class Human(Element):
         return ' - '.join([
             f"IdentitÃ© : {self.__full_name}",
             f"NationalitÃ© : {self.__nationality}",
-            f"Age : {self.__age} ans {self.is_adult()}"])
+            f"Age : {self.get_age()} ans {self.is_adult()}"])
 
     def ageing(self, years=1):
         """
@@ -118,14 +135,15 @@ class Human(Element):
         - up to 3 years: greetings with shuffled letters
         - from 3 years: normal greetings
         """
-        if self.__age >= 4:
+        age = self.get_age()
+        if age >= 4:
             return f"Je mâ€™appelle {Human.get_full_name(self)} et jâ€™ai la nationalitÃ© {self.__nationality.lower()}. {self.__greetings} !"
-        if self.__age >= 3:
+        if age >= 3:
             return self.__greetings
-        if self.__age >= 2:
+        if age >= 2:
             babbling = list(self.__greetings)
             random.shuffle(babbling)
             return ''.join(babbling)
-        if self.__age >= 1:
+        if age >= 1:
             return 'Areuh baba gaga'
         return 'Ouin ouin'
@@ -0,0 +1,57 @@
+class IndexedSet:
+    """
+    Set of hashable items that can also be accessed by position.
+
+    Items are kept in a list plus a dict giving the position of each item, so 'add',
+    'discard', membership, 'len' and access by position (hence uniform random choice)
+    are all O(1). Removing an item moves the last item into its place, so the order of
+    the items is arbitrary.
+    """
+
+    def __init__(self, items=()):
+        self.__items = []
+        self.__positions = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, item):
+        return item in self.__positions
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __getitem__(self, position):
+        return self.__items[position]
+
+    def add(self, item):
+        """Add an item, if not already present."""
+        if item not in self.__positions:
+            self.__positions[item] = len(self.__items)
+            self.__items.append(item)
+
+    def discard(self, item):
+        """Remove an item, if present."""
+        position = self.__positions.pop(item, None)
+        if position is None:
+            return
+        last_item = self.__items.pop()
+        if position < len(self.__items):
+            self.__items[position] = last_item
+            self.__positions[last_item] = position
+
+    def choice(self, generator):
+        """
+        Return an item chosen uniformly at random.
+
+        Args:
+            generator (random.Random): Generator of the draw (or the random module)
+
+        Returns:
+            The item, or None if the set is empty.
+        """
+        if not self.__items:
+            return None
+        return self.__items[generator.randrange(len(self.__items))]
@@ -1,11 +1,18 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
+from BitmapRenderer import BitmapRenderer
+from CanvasRenderer import CanvasRenderer
 from Conway import Conway
+from GameLoop import GameLoop
+from GridSnapshot import GridSnapshot
 from Human import Human
-import random
-
+from RateMeter import RateMeter
+from Recording import Recording, RecordingWriter
 from Snake import Snake
+from SimulationWorker import SimulationWorker
 from SnakeGame import SnakeGame
+from Turmites import Turmites
+from Viewport import Viewport
 
 class MyApp(tk.Tk):
     """
@@ -22,6 +29,23 @@ class MyApp(tk.Tk):
               'grid_lines':'gray',
               'grid_text':'white',
               'widget_text': 'orange'}
+    # Above this number of cells the grid is drawn as a bitmap (see BitmapRenderer)
+    BITMAP_CELLS_THRESHOLD = 10000
+    PHOTO_IMAGE_CLASS = tk.PhotoImage
+    # Largest drawing area of a bitmap grid; larger grids are seen through a viewport with a minimap
+    VIEWPORT_WIDTH, VIEWPORT_HEIGHT = 800, 600
+    MINIMAP_SIZE = 150
+    # Proportion of the cells of Conway's Game populated at the start
+    CONWAY_DENSITY = 0.1
+    # Time between two frames of Conway's Game, which runs in a SimulationWorker
+    FRAME_DELAY = 33
+    # Time between two moves of the snake, in seconds
+    SNAKE_STEP_PERIOD = 0.15
+    # Default number of steps of the Turmites drawn per frame
+    TURMITES_STEPS_PER_FRAME = 10
+    # Time between two generations of a replay, in seconds
+    REPLAY_STEP_PERIOD = 0.1
+    RECORDING_FILE_TYPES = [('Recordings', '*.rec'), ('All files', '*')]
 
     def __init__(self, grid, cell_size, gutter_size=0, margin_size=10):
         tk.Tk.__init__(self)
@@ -31,6 +55,13 @@ class MyApp(tk.Tk):
         self.gutter_size = gutter_size
         self.margin_size = margin_size
         self.current_game = None  # Add this line
+        self.conway_worker = None
+        self.conway_snapshot = None
+        self.loop_after_ids = {}
+        self.conway_recording = None
+        self.snake_recorder = None
+        self.replay = None
+        self.turmites_rule = 'langton'
         self.draw_menu()
 
     def draw_menu(self):
@@ -40,6 +71,7 @@ class MyApp(tk.Tk):
         game_menu.add_command(label="Conway", command=self.start_conway)
         game_menu.add_command(label="Turmites", command=self.start_turmites)
         game_menu.add_command(label="Snake", command=self.start_snake)
+        game_menu.add_command(label="Replay", command=self.start_replay)
         game_menu.add_separator()
         game_menu.add_command(label="Quit", command=self.quit)
         menubar.add_cascade(label="Games", menu=game_menu)
@@ -56,11 +88,16 @@ class MyApp(tk.Tk):
         self.b_turmites.pack(pady=5)
         self.b_snake = tk.Button(self.f_hub, text="Start Snake", command=self.start_snake)
         self.b_snake.pack(pady=5)
+        self.b_replay = tk.Button(self.f_hub, text="Replay a Recording", command=self.start_replay)
+        self.b_replay.pack(pady=5)
         self.b_quit = tk.Button(self.f_hub, text="Quit", command=self.quit)
         self.b_quit.pack(pady=5)
 
     def clear_game(self):
         """Clear the current game display"""
+        self.stop_loops()
+        self.stop_conway_worker()
+        self.close_recordings()
         if hasattr(self, 'f_hub'):
             self.f_hub.destroy()
         if hasattr(self, 'f_main'):
@@ -82,18 +119,25 @@ class MyApp(tk.Tk):
         else:
             self.grid = grid
             
-        canvas_size = (len(self.grid.get_grid()[0]) * (self.cell_size + self.gutter_size)) + 2 * self.margin_size
+        width, height = self.get_view_size()
         
         self.c_draw = tk.Canvas(self.f_main,
-                               width=canvas_size,
-                               height=canvas_size,
+                               width=width + 2 * self.margin_size,
+                               height=height + 2 * self.margin_size,
                                bg=self.COLORS['cell_background'])
         self.c_draw.pack()
+        self.renderer = None
         
-        # Only bind click for Conway's Game
-        if isinstance(grid, Conway):
-            self.c_draw.bind('<Button-1>', self.on_canvas_click)
-        
+        # Clicks toggle cells in Conway's Game and move the view from the minimap
+        self.c_draw.bind('<Button-1>', self.on_canvas_click)
+        # Zoom with the mouse wheel, pan by dragging with the middle button or Shift + left button
+        self.c_draw.bind('<MouseWheel>', self.on_canvas_wheel)
+        self.c_draw.bind('<Button-4>', self.on_canvas_wheel)
+        self.c_draw.bind('<Button-5>', self.on_canvas_wheel)
+        for press, motion in (('<ButtonPress-2>', '<B2-Motion>'), ('<Shift-ButtonPress-1>', '<Shift-B1-Motion>')):
+            self.c_draw.bind(press, self.on_pan_start)
+            self.c_draw.bind(motion, self.on_pan_move)
+
         # Replace quit button with back button
         self.b_back = tk.Button(self.f_main,
                                text='Back to Menu',
@@ -101,11 +145,49 @@ class MyApp(tk.Tk):
                                fg=self.COLORS['widget_text'])
         self.b_back.pack(pady=5)
 
+    def is_bitmap_grid(self):
+        """Return True if the grid is large enough to be drawn as a bitmap through a viewport"""
+        return self.grid.get_lines_count() * self.grid.get_columns_count() > self.BITMAP_CELLS_THRESHOLD
+
+    def get_view_size(self):
+        """Return the (width, height) in pixels of the drawing area of the grid, without margins"""
+        pitch = self.cell_size + self.gutter_size
+        width, height = self.grid.get_columns_count() * pitch, self.grid.get_lines_count() * pitch
+        if self.is_bitmap_grid():
+            return min(width, self.VIEWPORT_WIDTH), min(height, self.VIEWPORT_HEIGHT)
+        return width, height
+
+    def on_canvas_wheel(self, event):
+        """Zoom in or out of the grid around the mouse pointer"""
+        viewport = self.renderer.get_viewport() if getattr(self, 'renderer', None) is not None else None
+        if viewport is None:
+            return
+        factor = 2 if getattr(event, 'delta', 0) > 0 or getattr(event, 'num', None) == 4 else 0.5
+        if viewport.zoom_at(event.x - self.margin_size, event.y - self.margin_size, factor):
+            self.update_grid([])
+
+    def on_pan_start(self, event):
+        """Remember the start point of a drag of the view"""
+        self.pan_origin = (event.x, event.y)
+
+    def on_pan_move(self, event):
+        """Move the view with the mouse during a drag"""
+        viewport = self.renderer.get_viewport() if getattr(self, 'renderer', None) is not None else None
+        if viewport is None or not hasattr(self, 'pan_origin'):
+            return
+        dx, dy = self.pan_origin[0] - event.x, self.pan_origin[1] - event.y
+        self.pan_origin = (event.x, event.y)
+        if viewport.pan(dx, dy):
+            self.update_grid([])
+
     def back_to_menu(self):
         """Return to the main menu"""
         # Stop any ongoing game
         if hasattr(self, 'is_playing'):
             self.is_playing = False
+        self.stop_loops()
+        self.stop_conway_worker()
+        self.close_recordings()
         
         # Clear game frame
         if hasattr(self, 'f_main'):
@@ -118,27 +200,31 @@ class MyApp(tk.Tk):
 
     def on_canvas_click(self, event):
         """Handle canvas clicks to toggle cells"""
-        # Convert click coordinates to grid cell
-        clicked_x = event.x - self.margin_size
-        clicked_y = event.y - self.margin_size
-        
-        # Calculate cell position
-        col = clicked_x // (self.cell_size + self.gutter_size)
-        row = clicked_y // (self.cell_size + self.gutter_size)
-        
-        # Ensure click is within grid bounds
-        if 0 <= col < len(self.grid.get_grid()[0]) and 0 <= row < len(self.grid.get_grid()):
-            # Convert to cell number
-            cell_number = row * len(self.grid.get_grid()[0]) + col
-            
-            # Toggle cell state
-            if isinstance(self.grid.get_cell(cell_number), Human):
-                self.grid.die(cell_number)
-            else:
-                self.grid.born(cell_number, Human(['Conway'], 'Being', 'XX', 'Hello'))
-            
-            # Redraw grid
+        # Convert click coordinates to grid cell (None outside of the grid)
+        if getattr(self, 'renderer', None) is None:
             self.draw_grid(True)
+        minimap_cell_number = self.renderer.get_minimap_cell_at(event.x, event.y)
+        if minimap_cell_number is not None:
+            # Center the view on the cell clicked in the minimap
+            if self.renderer.get_viewport().center_on(*self.grid.get_coordinates_from_cell_number(minimap_cell_number)):
+                self.update_grid([])
+            return
+        cell_number = self.renderer.get_cell_number_at(event.x, event.y)
+        
+        if cell_number is not None and self.current_game == 'conway':
+            # Toggle cell state between two steps; the next frame shows it
+            self.conway_worker.call(self.toggle_conway_cell, self.conway_grid.get_grid(), cell_number)
+        elif cell_number is not None and self.current_game == 'turmites':
+            # A click drops a new ant
+            self.turmites.add_ant(cell_number)
+            self.update_grid(self.turmites.get_changed_cells())
+
+    def toggle_conway_cell(self, grid, cell_number):
+        """Kill the Human of a cell of the grid of a Conway game or give birth to one (run in its worker thread)"""
+        if isinstance(grid.get_cell(cell_number), Human):
+            grid.die(cell_number)
+        else:
+            grid.born(cell_number, Human(['Conway'], 'Being', 'XX', 'Hello'))
 
     def start_conway(self):
         self.clear_game()
@@ -185,6 +271,8 @@ class MyApp(tk.Tk):
         tk.Button(center_controls,
                  text="Rules",
                  command=self.show_rules).pack(side=tk.LEFT, padx=2)
+        self.stats_label = tk.Label(center_controls, text="")
+        self.stats_label.pack(side=tk.LEFT, padx=2)
         
         # Right controls
         right_controls = tk.Frame(controls_container)
@@ -192,45 +280,244 @@ class MyApp(tk.Tk):
         
         tk.Button(right_controls, 
                  text="Next Step", 
-                 command=lambda: [self.conway_grid.step(), self.draw_grid(True)]).pack(side=tk.LEFT, padx=2)
+                 command=lambda: self.conway_worker.step()).pack(side=tk.LEFT, padx=2)
         
         tk.Button(right_controls, 
                  text="Reset", 
                  command=self.reset_conway).pack(side=tk.LEFT, padx=2)
+        self.conway_record_button = tk.Button(right_controls,
+                                              text="Record",
+                                              command=self.toggle_conway_recording)
+        self.conway_record_button.pack(side=tk.LEFT, padx=2)
         
-        # Adjust random cell count for larger grid
-        cell_count = (grid_size * grid_size) // 10  # 10% of cells
-        for _ in range(cell_count):
-            cell = random.randint(0, grid_size * grid_size - 1)
-            self.grid.born(cell, Human(['Conway'], 'Being', 'XX', 'Hello'))
+        self.conway_grid.populate(self.CONWAY_DENSITY)
         
+        # From now on the game is only touched by the worker thread; Tk draws its snapshots.
+        # The steps, snapshots and recorder are bound to this game: a worker still finishing
+        # a step after a game switch never reads nor records the next one
+        self.conway_delay = self.get_conway_delay()
+        conway = self.conway_grid
+        recording = self.conway_recording = {'recorder': None}
+        self.conway_worker = SimulationWorker(
+            lambda: self.conway_step(conway, recording),
+            lambda: GridSnapshot(conway.get_grid(), conway.get_step_count()),
+            self.conway_delay / 1000,
+            get_changes=lambda: [cell_number for cell_number, _ in conway.get_last_changes()])
+        self.conway_snapshot = self.conway_worker.get_snapshot()
         self.draw_grid(True)
+        self.conway_worker.start()
+        self.conway_frames = RateMeter()
+        self.start_loop(GameLoop(self.auto_step, None, self.FRAME_DELAY / 1000, max_steps_per_frame=1))
+
+    def start_loop(self, loop):
+        """(Re)start a GameLoop, ticked by the Tk event loop"""
+        after_id = self.loop_after_ids.pop(loop, None)
+        if after_id is not None:
+            self.after_cancel(after_id)
+        loop.start()
+        self.tick_loop(loop)
+
+    def tick_loop(self, loop):
+        """Tick a GameLoop and schedule its next tick, until it stops"""
+        self.loop_after_ids.pop(loop, None)
+        delay = loop.tick()
+        if delay is not None:
+            self.loop_after_ids[loop] = self.after(max(1, round(delay * 1000)), self.tick_loop, loop)
+
+    def stop_loops(self):
+        """Stop every GameLoop ticked by the Tk event loop (game switch)"""
+        for loop, after_id in self.loop_after_ids.items():
+            self.after_cancel(after_id)
+            loop.stop()
+        self.loop_after_ids = {}
+
+    def stop_conway_worker(self):
+        """Stop the thread of Conway's Game, if any (without waiting for a running step)"""
+        if self.conway_worker is not None:
+            # The recorder is only touched by the worker: it closes it before leaving
+            self.conway_worker.call(self.stop_conway_recording, self.conway_recording)
+            self.conway_worker.close(0)
+            self.conway_worker = None
+            self.conway_snapshot = None
+
+    def conway_step(self, conway, recording):
+        """Run one generation of a Conway game and record it if its recording is on (run in its worker thread)"""
+        conway.step()
+        if recording['recorder'] is not None:
+            recording['recorder'].record()
+
+    def ask_recording_path(self):
+        """Ask the user for the file of a new recording; return its path, or None if cancelled"""
+        path = filedialog.asksaveasfilename(parent=self, defaultextension='.rec', filetypes=self.RECORDING_FILE_TYPES)
+        return path or None
+
+    def toggle_conway_recording(self):
+        """Start recording the generations of Conway's Game to a file, or stop the recording"""
+        if self.conway_record_button.cget('text') == "Record":
+            path = self.ask_recording_path()
+            if path is None:
+                return
+            self.conway_record_button.config(text="Stop Recording")
+            self.conway_worker.call(self.start_conway_recording, self.conway_grid, self.conway_recording, path)
+        else:
+            self.conway_record_button.config(text="Record")
+            self.conway_worker.call(self.stop_conway_recording, self.conway_recording)
+
+    def start_conway_recording(self, conway, recording, path):
+        """Open a recording of a Conway game from its current generation (run in its worker thread)"""
+        self.stop_conway_recording(recording)
+        recording['recorder'] = RecordingWriter(path, conway.get_grid(), Conway, generation=conway.get_step_count())
+
+    def stop_conway_recording(self, recording):
+        """Close the recording of a Conway game, if any (run in its worker thread)"""
+        if recording['recorder'] is not None:
+            recording['recorder'].close()
+            recording['recorder'] = None
+
+    def close_recordings(self):
+        """Close the recording of the Snake and the replayed file, if any (game switch)"""
+        if self.snake_recorder is not None:
+            self.snake_recorder.close()
+            self.snake_recorder = None
+        if self.replay is not None:
+            self.replay.close()
+            self.replay = None
+
+    def get_conway_delay(self):
+        """Return the delay between two steps entered by the user, in ms"""
+        try:
+            return max(0, int(self.speed_var.get()))
+        except ValueError:
+            return 100
 
     def toggle_autoplay(self):
         self.is_playing = not self.is_playing
         self.play_button.config(text="Stop" if self.is_playing else "Play")
         if self.is_playing:
-            self.auto_step()
+            self.conway_worker.play()
+        else:
+            self.conway_worker.stop()
 
     def auto_step(self):
-        if self.is_playing:
-            self.conway_grid.step()
-            self.draw_grid(True)
-            try:
-                delay = int(self.speed_var.get())
-            except ValueError:
-                delay = 100
-            self.after(delay, self.auto_step)
+        """
+        Draw the latest snapshot published by the Conway worker (one step of the display
+        loop, every FRAME_DELAY ms). The generations published in between are skipped, so
+        the display never falls behind the simulation.
+
+        Returns:
+            bool: False once Conway's Game is left, to stop the display loop.
+        """
+        worker = self.conway_worker
+        if worker is None or self.current_game != 'conway':
+            return False
+        delay = self.get_conway_delay()
+        if delay != self.conway_delay:
+            self.conway_delay = delay
+            worker.set_delay(delay / 1000)
+        snapshot = worker.get_snapshot()
+        if snapshot is not self.conway_snapshot:
+            self.update_conway_grid(snapshot)
+            self.conway_frames.add()
+        self.stats_label.config(text=f"{worker.get_loop().get_steps_per_second():.0f} steps/s, "
+                                     f"{self.conway_frames.get_rate():.0f} frames/s")
+        error = worker.get_error()
+        if error is not None:
+            # Any failure, of a step or of a command (recording...), stops the play; reported once
+            worker.clear_error()
+            worker.stop()
+            self.is_playing = False
+            self.play_button.config(text="Play")
+            is_recording = self.conway_recording['recorder'] is not None
+            self.conway_record_button.config(text="Stop Recording" if is_recording else "Record")
+            messagebox.showerror("Conway", str(error))
+        return True
 
     def reset_conway(self):
         self.is_playing = False
         self.play_button.config(text="Play")
-        self.conway_grid.reset()
-        self.draw_grid(True)
+        self.conway_worker.stop()
+        self.conway_worker.call(self.conway_grid.reset)
 
     def start_turmites(self):
-        # Add logic to start Turmites
-        pass
+        """Initialize and start Turmites (Langton's ants or another rule of Turmites.RULES)"""
+        self.clear_game()
+        grid_size = len(self.grid.get_grid())
+        self.turmites = Turmites(grid_size, grid_size, self.turmites_rule)
+        self.current_game = 'turmites'
+        self.setup_game(self.turmites)
+
+        controls = tk.Frame(self.f_main)
+        controls.pack(side=tk.TOP, fill=tk.X, padx=5)
+        self.turmites_play_button = tk.Button(controls, text="Play", command=self.toggle_turmites)
+        self.turmites_play_button.pack(side=tk.LEFT, padx=2)
+        tk.Label(controls, text="Rule:").pack(side=tk.LEFT)
+        self.turmites_rule_var = tk.StringVar(value=self.turmites_rule)
+        tk.OptionMenu(controls,
+                      self.turmites_rule_var,
+                      *Turmites.RULES,
+                      command=self.change_turmites_rule).pack(side=tk.LEFT, padx=2)
+        tk.Label(controls, text="Steps/frame:").pack(side=tk.LEFT)
+        self.turmites_speed_var = tk.StringVar(value=str(self.TURMITES_STEPS_PER_FRAME))
+        tk.Entry(controls, textvariable=self.turmites_speed_var, width=7).pack(side=tk.LEFT, padx=2)
+        tk.Button(controls,
+                 text="Next Step",
+                 command=self.step_turmites_once).pack(side=tk.LEFT, padx=2)
+        tk.Button(controls,
+                 text="Reset",
+                 command=self.reset_turmites).pack(side=tk.LEFT, padx=2)
+        self.stats_label = tk.Label(self.f_main, text="Click to add an ant")
+        self.stats_label.pack(side=tk.TOP)
+
+        # One batch of steps per frame: the ants run in a tight loop, only the trail is redrawn
+        self.turmites_loop = GameLoop(self.turmites_step, self.draw_turmites_frame, self.FRAME_DELAY / 1000,
+                                      max_steps_per_frame=1)
+        self.turmites_changed_cells = set()
+        self.draw_grid(True)
+
+    def change_turmites_rule(self, rule):
+        """Restart Turmites with another rule"""
+        self.turmites_rule = rule
+        self.start_turmites()
+
+    def get_turmites_steps_per_frame(self):
+        """Return the number of steps per frame entered by the user"""
+        try:
+            return max(1, int(self.turmites_speed_var.get()))
+        except ValueError:
+            return self.TURMITES_STEPS_PER_FRAME
+
+    def toggle_turmites(self):
+        """Start or stop the ants"""
+        if self.turmites_loop.is_running():
+            self.turmites_loop.stop()
+        else:
+            self.start_loop(self.turmites_loop)
+        self.turmites_play_button.config(text="Stop" if self.turmites_loop.is_running() else "Play")
+
+    def turmites_step(self):
+        """Run the steps of one frame (step of the Turmites loop)"""
+        self.turmites.step(self.get_turmites_steps_per_frame())
+        self.turmites_changed_cells.update(self.turmites.get_changed_cells())
+        return True
+
+    def draw_turmites_frame(self):
+        """Draw the trail left since the last frame (frame of the Turmites loop)"""
+        steps_per_second = self.turmites_loop.get_steps_per_second() * self.get_turmites_steps_per_frame()
+        self.stats_label.config(text=f"Step {self.turmites.get_step_count()}, {steps_per_second:.0f} steps/s, "
+                                     f"{self.turmites_loop.get_frames_per_second():.0f} frames/s")
+        self.update_grid(self.turmites_changed_cells)
+        self.turmites_changed_cells = set()
+
+    def step_turmites_once(self):
+        """Move every ant by one step"""
+        self.turmites_changed_cells.update(self.turmites.step())
+        self.draw_turmites_frame()
+
+    def reset_turmites(self):
+        """Clear the trails and put the ants back"""
+        self.turmites.reset()
+        self.turmites_changed_cells.update(self.turmites.get_changed_cells())
+        self.draw_turmites_frame()
 
     def start_snake(self):
         """Initialize and start Snake game"""
@@ -255,22 +542,58 @@ class MyApp(tk.Tk):
                                   text="Score: 0",
                                   font=('Arial', 16, 'bold'))
         self.score_label.pack(side=tk.TOP, pady=5)
+        self.stats_label = tk.Label(self.f_main, text="")
+        self.stats_label.pack(side=tk.TOP)
+        self.snake_record_button = tk.Button(self.f_main, text="Record", command=self.toggle_snake_recording)
+        self.snake_record_button.pack(side=tk.TOP)
         
+        # Moves at a fixed rate, several per frame if the drawing falls behind
+        self.snake_loop = GameLoop(self.snake_step, self.draw_snake_frame, self.SNAKE_STEP_PERIOD)
+        self.snake_changed_cells = []
         self.draw_grid(True)
 
     def toggle_snake(self):
         """Toggle snake movement with spacebar"""
         if self.snake_game.toggle_running():
-            self.snake_step()
+            self.start_loop(self.snake_loop)
+        else:
+            self.snake_loop.stop()
 
     def snake_step(self):
-        """Execute snake game step"""
-        if self.snake_game.step():
-            self.score_label.config(text=f"Score: {self.snake_game.get_score()}")
-            self.draw_grid(True)
-            self.after(150, self.snake_step)
-        elif self.snake_game.handle_game_over():
-            if messagebox.askyesno("Game Over", 
+        """
+        Execute snake game step (step of the snake loop)
+
+        Returns:
+            bool: False when the snake stopped (pause or game over), to stop the loop.
+        """
+        is_moving = self.snake_game.step()
+        self.snake_changed_cells.extend(self.snake_game.get_changed_cells())
+        if self.snake_recorder is not None:
+            self.snake_recorder.record(self.snake_game.get_changed_cells())
+        return is_moving
+
+    def toggle_snake_recording(self):
+        """Start recording the moves of the snake to a file, or stop the recording"""
+        if self.snake_recorder is None:
+            path = self.ask_recording_path()
+            if path is None:
+                return
+            self.snake_recorder = RecordingWriter(path, self.snake_game.get_grid(), SnakeGame)
+            self.snake_record_button.config(text="Stop Recording")
+        else:
+            self.snake_recorder.close()
+            self.snake_recorder = None
+            self.snake_record_button.config(text="Record")
+
+    def draw_snake_frame(self):
+        """Draw the cells changed by the steps of the frame (frame of the snake loop)"""
+        self.score_label.config(text=f"Score: {self.snake_game.get_score()}")
+        self.stats_label.config(text=f"{self.snake_loop.get_steps_per_second():.1f} steps/s, "
+                                     f"{self.snake_loop.get_frames_per_second():.1f} frames/s")
+        self.update_grid(self.snake_changed_cells)
+        self.snake_changed_cells = []
+        if not self.snake_loop.is_running() and self.snake_game.handle_game_over():
+            if messagebox.askyesno("Gagné !" if self.snake_game.is_won() else "Game Over",
                                  f"Score: {self.snake_game.get_score()}\nVoulez-vous recommencer?"):
                 self.start_snake()
 
@@ -279,8 +602,84 @@ class MyApp(tk.Tk):
         if hasattr(self, 'snake_game'):
             self.snake_game.reset()
             self.score_label.config(text="Score: 0")
-            self.draw_grid(True)
-            self.snake_step()
+            self.snake_changed_cells = []
+            self.update_grid()
+            self.start_loop(self.snake_loop)
+
+    def start_replay(self):
+        """Open a recording chosen by the user and replay it, with a slider to seek any generation"""
+        path = filedialog.askopenfilename(parent=self, filetypes=self.RECORDING_FILE_TYPES)
+        if not path:
+            return
+        try:
+            replay = Recording(path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Replay", str(error))
+            return
+        self.clear_game()
+        self.replay = replay
+        self.current_game = 'replay'
+        self.setup_game(replay)
+
+        controls = tk.Frame(self.f_main)
+        controls.pack(side=tk.TOP, fill=tk.X, padx=5)
+        if replay.get_game_class() is Conway:
+            self.show_age = tk.BooleanVar(value=True)
+            tk.Checkbutton(controls,
+                          text="Show Age",
+                          variable=self.show_age,
+                          command=self.refresh_grid).pack(side=tk.LEFT, padx=2)
+        self.replay_play_button = tk.Button(controls, text="Play", command=self.toggle_replay)
+        self.replay_play_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(controls,
+                 text="<",
+                 command=lambda: self.seek_replay(self.replay.get_generation() - 1)).pack(side=tk.LEFT, padx=2)
+        tk.Button(controls,
+                 text=">",
+                 command=lambda: self.seek_replay(self.replay.get_generation() + 1)).pack(side=tk.LEFT, padx=2)
+        self.replay_scale = tk.Scale(controls,
+                                     from_=replay.get_first_generation(),
+                                     to=replay.get_last_generation(),
+                                     orient=tk.HORIZONTAL,
+                                     label="Generation",
+                                     length=300,
+                                     command=self.on_replay_scale)
+        self.replay_scale.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
+
+        self.replay_loop = GameLoop(self.replay.step, self.draw_replay_frame, self.REPLAY_STEP_PERIOD)
+        self.draw_grid(True)
+
+    def toggle_replay(self):
+        """Play the replay from the current generation (from the first one once finished), or pause it"""
+        if self.replay_loop.is_running():
+            self.replay_loop.stop()
+            self.replay_play_button.config(text="Play")
+            return
+        if self.replay.get_generation() >= self.replay.get_last_generation():
+            self.seek_replay(self.replay.get_first_generation())
+        self.replay_play_button.config(text="Stop")
+        self.start_loop(self.replay_loop)
+
+    def on_replay_scale(self, value):
+        """Seek the generation chosen with the slider"""
+        if int(value) != self.replay.get_generation():
+            self.seek_replay(int(value))
+
+    def seek_replay(self, generation):
+        """Move the replay to a generation and draw it"""
+        self.replay.seek(generation)
+        self.draw_replay_frame()
+
+    def draw_replay_frame(self):
+        """Draw the cells changed since the last frame of the replay (frame of the replay loop)"""
+        cell_numbers = self.replay.collect_changed_cells()
+        if self.replay.get_game_class() is Conway and self.is_age_shown() and self.renderer is not None \
+                and self.renderer.is_text_shown():
+            cell_numbers.update(self.grid.get_population().get_live_cells())
+        self.update_grid(cell_numbers)
+        self.replay_scale.set(self.replay.get_generation())
+        if not self.replay_loop.is_running():
+            self.replay_play_button.config(text="Play")
 
     def show_snake_rules(self):
         """Display snake game rules"""
@@ -311,58 +710,68 @@ Controls:
                  command=rules_window.destroy).pack(pady=5)
 
     def refresh_grid(self):
-        """Refresh the grid display"""
-        self.draw_grid(True)
+        """Refresh the grid display (e.g. when the age display is toggled)"""
+        self.update_grid()
+
+    def is_age_shown(self):
+        """Return True if the ages of the Humans are displayed"""
+        return hasattr(self, 'show_age') and self.show_age.get()
 
     def draw_grid(self, grid_lines):
-        self.c_draw.delete(tk.ALL)
+        """
+        Full redraw: delete the canvas items and create one item per cell (game switch),
+        or a single bitmap of the visible cells above BITMAP_CELLS_THRESHOLD cells (see
+        'get_view_size'). The following frames only update the changed cells (see
+        'update_grid').
+        """
+        if not grid_lines:
+            self.c_draw.delete(tk.ALL)
+            self.renderer = None
+            return
+        # Conway's Game is drawn from its latest snapshot, never from the grid changed by the worker
+        grid = self.conway_snapshot if getattr(self, 'conway_snapshot', None) is not None else self.grid
+        if self.is_bitmap_grid():
+            pitch = self.cell_size + self.gutter_size
+            width, height = self.get_view_size()
+            viewport = Viewport(self.grid.get_lines_count(), self.grid.get_columns_count(), width, height, pitch)
+            is_cropped = (width, height) != (self.grid.get_columns_count() * pitch, self.grid.get_lines_count() * pitch)
+            self.renderer = BitmapRenderer(self.c_draw, grid, pitch, self.margin_size, self.COLORS,
+                                           self.PHOTO_IMAGE_CLASS, viewport, self.MINIMAP_SIZE if is_cropped else 0)
+        else:
+            self.renderer = CanvasRenderer(self.c_draw, grid, self.cell_size, self.gutter_size,
+                                           self.margin_size, self.COLORS)
+        self.renderer.draw_all(self.is_age_shown())
 
-        line, column = len(self.grid.get_grid()), len(self.grid.get_grid()[0])
-        for cell_number in range(line * column):
-            i, j = self.grid.get_coordinates_from_cell_number(cell_number)
-            x = j*(self.cell_size + self.gutter_size) + self.margin_size
-            y = i*(self.cell_size + self.gutter_size) + self.margin_size
-            
-            cell_content = self.grid.get_cell(cell_number)
-            
-            if grid_lines:
-                if isinstance(cell_content, Snake):
-                    if cell_content.is_food:
-                        fill_color = SnakeGame.COLORS['food']
-                        self.c_draw.create_rectangle(x, y, x + self.cell_size, y + self.cell_size,
-                                                  outline=self.COLORS['grid_lines'],
-                                                  fill=fill_color)
-                        self.c_draw.create_text(x + self.cell_size/2,
-                                              y + self.cell_size/2,
-                                              text='🍎',
-                                              fill='white',
-                                              font=('Arial', int(self.cell_size/2)))
-                    else:
-                        # Vérifier d'abord si le serpent est mort
-                        if hasattr(cell_content, 'is_dead') and cell_content.is_dead:
-                            fill_color = SnakeGame.COLORS['dead_head'] if cell_content.is_head else SnakeGame.COLORS['dead_body']
-                        else:
-                            fill_color = SnakeGame.COLORS['head'] if cell_content.is_head else SnakeGame.COLORS['body']
-                        self.c_draw.create_rectangle(x, y, x + self.cell_size, y + self.cell_size,
-                                                  outline=self.COLORS['grid_lines'],
-                                                  fill=fill_color)
-                elif isinstance(cell_content, Human):
-                    fill_color = self.COLORS['cell_foreground']
-                    self.c_draw.create_rectangle(x, y, x + self.cell_size, y + self.cell_size,
-                                              outline=self.COLORS['grid_lines'],
-                                              fill=fill_color)
-                else:
-                    fill_color = self.COLORS['cell_background']
-                    self.c_draw.create_rectangle(x, y, x + self.cell_size, y + self.cell_size,
-                                              outline=self.COLORS['grid_lines'],
-                                              fill=fill_color)
-                
-                # Draw age if enabled and cell contains Human (except food)
-                if hasattr(self, 'show_age') and self.show_age.get() and isinstance(cell_content, Human) and cell_content.get_full_name() != 'Food':
-                    self.c_draw.create_text(x + self.cell_size/2,
-                                          y + self.cell_size/2,
-                                          text=str(cell_content.get_age()),
-                                          fill=self.COLORS['grid_text'])
+    def update_grid(self, cell_numbers=None):
+        """
+        Redraw the cells whose display changed.
+
+        Args:
+            cell_numbers (iterable, optional): Cells that may have changed since the last
+                frame. Defaults to None (check every cell).
+        """
+        if getattr(self, 'renderer', None) is None:
+            self.draw_grid(True)
+        else:
+            self.renderer.update(cell_numbers, self.is_age_shown())
+
+    def update_conway_grid(self, snapshot):
+        """
+        Draw a newer snapshot of Conway's Game: redraw the cells changed since the snapshot
+        drawn last, as recorded by the worker (and every age if displayed).
+
+        Args:
+            snapshot (GridSnapshot): Snapshot published by the Conway worker
+        """
+        cell_numbers = snapshot.get_changed_cells(self.conway_snapshot)
+        self.conway_snapshot = snapshot
+        if getattr(self, 'renderer', None) is None:
+            self.draw_grid(True)
+            return
+        self.renderer.set_grid(snapshot)
+        if cell_numbers is not None and self.is_age_shown() and self.renderer.is_text_shown():
+            cell_numbers.extend(snapshot.get_population().get_live_cells())
+        self.update_grid(cell_numbers)
 
     def show_rules(self):
         """Display a popup window with the current game's rules."""
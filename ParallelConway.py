@@ -0,0 +1,307 @@
+from multiprocessing import shared_memory
+import multiprocessing
+import random
+import re
+import time
+
+from ConwayArrayEngine import ConwayArrayEngine
+from Human import Human
+
+
+class ConwayBandWorker:
+    """
+    Worker process of 'ParallelConway' advancing one band of lines.
+
+    The alive/dead state lives twice in shared memory (current and next generation, with
+    a border of dead cells). Each generation, the worker reads its lines plus the line
+    just above and just below (the halo, written by the neighbouring bands), writes its
+    own lines of the next generation, then waits on a barrier shared by all the workers
+    before the two buffers swap roles. Nothing but short commands goes through the pipe.
+    """
+    __LIVE = re.compile(b'\x01')
+    __CHANGED = re.compile(b'[\x01\x02]')
+
+    def __init__(self, memory_name, lines_count, columns_count, first_line, last_line, seed, barrier, connection):
+        """
+        Args:
+            memory_name (str): Name of the shared memory block of the simulation
+            lines_count (int): Number of lines of the whole grid
+            columns_count (int): Number of columns of the whole grid
+            first_line (int): First line of the band
+            last_line (int): Line after the last line of the band
+            seed (int): Seed of the natural death draws
+            barrier: Barrier shared by all the workers
+            connection: Worker end of the command pipe
+        """
+        self.memory_name = memory_name
+        self.lines_count = lines_count
+        self.columns_count = columns_count
+        self.first_line = first_line
+        self.last_line = last_line
+        self.seed = seed
+        self.barrier = barrier
+        self.connection = connection
+
+    def run(self):
+        """Process loop: execute ('step', generation, count) commands until 'stop'."""
+        memory = shared_memory.SharedMemory(name=self.memory_name)
+        states, ages = ParallelConway.get_views(memory, self.lines_count, self.columns_count)
+        try:
+            stride = self.columns_count + 2
+            band_lines_count = self.last_line - self.first_line
+            interior = bytearray(stride * (band_lines_count + 2))
+            for line_number in range(1, band_lines_count + 1):
+                interior[line_number * stride + 1:(line_number + 1) * stride - 1] = b'\xff' * self.columns_count
+            interior_mask = int.from_bytes(interior, 'little')
+            while True:
+                command = self.connection.recv()
+                if command[0] == 'stop':
+                    break
+                _, generation, count = command
+                for generation in range(generation, generation + count):
+                    current, following = states[generation % 2], states[(generation + 1) % 2]
+                    self.__step_band(current, following, ages, generation, stride, interior_mask)
+                    self.barrier.wait()
+                self.connection.send('done')
+        finally:
+            ParallelConway.release_views(states, ages)
+            memory.close()
+
+    def __step_band(self, current, following, ages, generation, stride, interior_mask):
+        """Compute the lines of the band for the next generation."""
+        start, end = self.first_line * stride, (self.last_line + 2) * stride
+        band = bytes(current[start:end])
+        own_start, own_end = start + stride, end - stride
+        following[own_start:own_end] = band[stride:-stride]
+        cells_count = self.lines_count * self.columns_count
+
+        # Ageing and natural death with draws that only depend on the seed, the
+        # generation and the cell, whatever the split of the grid between workers
+        natural_deaths = set()
+        for match in self.__LIVE.finditer(band, stride, len(band) - stride):
+            line_number, column_number = divmod(start + match.start(), stride)
+            cell = (line_number - 1) * self.columns_count + column_number - 1
+            age = ages[cell] + 1
+            ages[cell] = age
+            if age > Human.LIFE_EXPECTANCY:
+                draw = ParallelConway.get_death_draw(self.seed, generation * cells_count + cell)
+                if draw < (age - Human.LIFE_EXPECTANCY) / 100:
+                    natural_deaths.add(match.start())
+
+        changes_codes = ConwayArrayEngine.get_changes_codes(band, stride, interior_mask)
+        for match in self.__CHANGED.finditer(changes_codes):
+            index = match.start()
+            if match.group() == b'\x01':
+                following[start + index] = 1
+            else:
+                following[start + index] = 0
+                natural_deaths.discard(index)
+            line_number, column_number = divmod(start + index, stride)
+            ages[(line_number - 1) * self.columns_count + column_number - 1] = 0
+        for index in natural_deaths:
+            following[start + index] = 0
+            line_number, column_number = divmod(start + index, stride)
+            ages[(line_number - 1) * self.columns_count + column_number - 1] = 0
+
+
+class ParallelConway:
+    """
+    Multi-core Conway's Game of Life with ageing, on a grid split into bands of lines.
+
+    Each band is advanced by its own worker process (see ConwayBandWorker); the grid and
+    the ages are exchanged through shared memory, never pickled. Natural death draws
+    come from a hash of (seed, generation, cell) instead of a shared random generator, so
+    a run is reproducible for a given seed whatever the number of workers.
+
+    Rules are those of 'Conway' (bounded edges, ageing, natural death), but the draws
+    differ from its per-cell path, so runs are not comparable draw for draw.
+    """
+
+    def __init__(self, latitude_cells_count, longitude_cells_count, workers_count=1, seed=0):
+        """
+        Initialize the shared grid and start the workers.
+
+        Args:
+            latitude_cells_count (int): Number of rows
+            longitude_cells_count (int): Number of columns
+            workers_count (int, optional): Number of worker processes (at most one per
+                line). Defaults to 1.
+            seed (int, optional): Seed of the natural death draws. Defaults to 0.
+        """
+        self.__lines_count = latitude_cells_count
+        self.__columns_count = longitude_cells_count
+        self.__seed = seed
+        self.__generation = 0
+        self.__stride = longitude_cells_count + 2
+        state_size = self.__stride * (latitude_cells_count + 2)
+        self.__memory = shared_memory.SharedMemory(
+            create=True, size=2 * state_size + 8 * latitude_cells_count * longitude_cells_count)
+        self.__memory.buf[:self.__memory.size] = bytes(self.__memory.size)
+        self.__states, self.__ages = self.get_views(self.__memory, latitude_cells_count, longitude_cells_count)
+
+        workers_count = max(1, min(workers_count, latitude_cells_count))
+        barrier = multiprocessing.Barrier(workers_count)
+        self.__connections = []
+        self.__processes = []
+        for index in range(workers_count):
+            first_line = index * latitude_cells_count // workers_count
+            last_line = (index + 1) * latitude_cells_count // workers_count
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = ConwayBandWorker(self.__memory.name, latitude_cells_count, longitude_cells_count,
+                                      first_line, last_line, seed, barrier, worker_connection)
+            process = multiprocessing.Process(target=worker.run, daemon=True)
+            process.start()
+            self.__connections.append(connection)
+            self.__processes.append(process)
+
+    @staticmethod
+    def get_views(memory, lines_count, columns_count):
+        """
+        Split a shared memory block of the simulation into its arrays.
+
+        Returns:
+            tuple: ([state 0, state 1], ages) memoryviews; states hold one byte per padded
+                cell, ages one 64-bit integer per cell number.
+        """
+        state_size = (columns_count + 2) * (lines_count + 2)
+        states = [memory.buf[0:state_size], memory.buf[state_size:2 * state_size]]
+        ages = memory.buf[2 * state_size:2 * state_size + 8 * lines_count * columns_count].cast('q')
+        return states, ages
+
+    @staticmethod
+    def release_views(states, ages):
+        """Release the memoryviews returned by 'get_views' so that the block can be closed."""
+        ages.release()
+        for state in states:
+            state.release()
+
+    @staticmethod
+    def get_death_draw(seed, counter):
+        """Return a uniform float in [0, 1) depending only on 'seed' and 'counter' (splitmix64)."""
+        mask = 0xFFFFFFFFFFFFFFFF
+        value = (seed * 0x9E3779B97F4A7C15 + counter + 0x9E3779B97F4A7C15) & mask
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & mask
+        return ((value ^ (value >> 31)) >> 11) / 2 ** 53
+
+    def get_workers_count(self):
+        """Return the number of worker processes."""
+        return len(self.__processes)
+
+    def get_generation(self):
+        """Return the number of generations computed."""
+        return self.__generation
+
+    def get_population(self):
+        """Return the number of live cells."""
+        return bytes(self.__states[self.__generation % 2]).count(1)
+
+    def __padded_index(self, cell_number):
+        """Convert a cell number to its index in the padded alive/dead states."""
+        line_number, column_number = divmod(cell_number, self.__columns_count)
+        return (line_number + 1) * self.__stride + column_number + 1
+
+    def import_planet(self, planet):
+        """
+        Load the Humans of a PlanetAlpha grid and their ages.
+
+        Args:
+            planet (PlanetAlpha): Grid of the same size as the simulation
+        """
+        state = self.__states[self.__generation % 2]
+        state[:] = bytes(len(state))
+        for cell_number in range(self.__lines_count * self.__columns_count):
+            cell_content = planet.get_cell(cell_number)
+            if isinstance(cell_content, Human):
+                state[self.__padded_index(cell_number)] = 1
+                self.__ages[cell_number] = cell_content.get_age()
+            else:
+                self.__ages[cell_number] = 0
+
+    def export_planet(self, planet):
+        """
+        Write the simulation into a PlanetAlpha grid through its 'born' and 'die' methods.
+
+        Args:
+            planet (PlanetAlpha): Grid of the same size as the simulation
+        """
+        state = self.__states[self.__generation % 2]
+        for cell_number in range(self.__lines_count * self.__columns_count):
+            cell_content = planet.get_cell(cell_number)
+            if state[self.__padded_index(cell_number)]:
+                if isinstance(cell_content, Human):
+                    # Human of the grid, or view writing back to the Population of a PopulationPlanet
+                    cell_content.set_age(self.__ages[cell_number])
+                else:
+                    # The age is set before 'born', which copies it into a PopulationPlanet
+                    human = Human(['Conway'], 'Being', 'XX', 'Hello')
+                    human.set_age(self.__ages[cell_number])
+                    planet.die(cell_number)
+                    planet.born(cell_number, human)
+            elif isinstance(cell_content, Human):
+                planet.die(cell_number)
+
+    def step(self, generations=1):
+        """
+        Advance the simulation.
+
+        Args:
+            generations (int, optional): Number of generations to compute. Defaults to 1.
+        """
+        for connection in self.__connections:
+            connection.send(('step', self.__generation, generations))
+        for connection in self.__connections:
+            connection.recv()
+        self.__generation += generations
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if not self.__processes:
+            return
+        for connection in self.__connections:
+            connection.send(('stop',))
+        for process in self.__processes:
+            process.join()
+        self.__processes = []
+        self.release_views(self.__states, self.__ages)
+        self.__memory.close()
+        self.__memory.unlink()
+
+    @staticmethod
+    def benchmark(latitude_cells_count=512, longitude_cells_count=512, workers_counts=(1, 2, 4, 8, 16),
+                  generations=20, density=0.3, seed=0):
+        """
+        Measure the scaling of the simulation with the number of workers.
+
+        Returns:
+            list: One dict per workers count with the generations per second, the speedup
+                relative to the first count and the final population (identical for all
+                counts, as the runs are deterministic).
+        """
+        generator = random.Random(seed)
+        initial_cells = [cell for cell in range(latitude_cells_count * longitude_cells_count)
+                         if generator.random() < density]
+        results = []
+        for workers_count in workers_counts:
+            simulation = ParallelConway(latitude_cells_count, longitude_cells_count, workers_count, seed)
+            try:
+                state = simulation.__states[0]
+                for cell_number in initial_cells:
+                    state[simulation.__padded_index(cell_number)] = 1
+                start = time.perf_counter()
+                simulation.step(generations)
+                elapsed = time.perf_counter() - start
+                results.append({'workers': simulation.get_workers_count(),
+                                'generations_per_second': generations / elapsed,
+                                'population': simulation.get_population()})
+            finally:
+                simulation.close()
+        for result in results:
+            result['speedup'] = result['generations_per_second'] / results[0]['generations_per_second']
+        return results
+
+
+if __name__ == "__main__":
+    for result in ParallelConway.benchmark():
+        print(f"{result['workers']:>2} workers: {result['generations_per_second']:8.2f} gen/s "
+              f"x{result['speedup']:.2f} (population {result['population']})")
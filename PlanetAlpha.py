@@ -1,4 +1,7 @@
+from ChangeLog import ChangeLog
+from Element import Element
 from Grid import Grid
+from IndexedSet import IndexedSet
 import random
 
 class PlanetAlpha(Grid):
@@ -7,6 +10,7 @@ class PlanetAlpha(Grid):
     NORTH_EAST, SOUTH_EAST, SOUTH_WEST, NORTH_WEST = (-1, 1), (1, 1), (1, -1), (-1, -1)
     CARDINAL_POINTS = (NORTH, EAST, SOUTH, WEST)
     WIND_ROSE = (NORTH, NORTH_EAST, EAST, SOUTH_EAST, SOUTH, SOUTH_WEST, WEST, NORTH_WEST)
+    __ELEMENT_KEY = object()
 
 
     def __init__(self, name: str, latitude_cell_count, longitude_cell_count,  ground):
@@ -21,6 +25,13 @@ class PlanetAlpha(Grid):
 
         self.__name = name
         self.__ground = ground
+        self.__version = 0  # Incrémenté à chaque modification par 'born', 'die', 'set_cell' ou 'fill_random'
+        # Index valeur -> cellules (IndexedSet), construit à la première recherche par valeur,
+        # et cellules dont la valeur ne peut pas être indexée (non hachable)
+        self.__index = None
+        self.__unindexed = None
+        # Journaux des changements des abonnés (voir 'open_change_log'), vide s'il n'y en a pas
+        self.__change_logs = []
 
     def get_name(self):
         return self.__name
@@ -28,17 +39,146 @@ class PlanetAlpha(Grid):
     def get_ground(self):
         return self.__ground
 
+    def get_version(self):
+        return self.__version
+
+    def open_change_log(self):
+        """ Abonne un nouveau journal (ChangeLog) aux changements de la grille : chaque 'born', 'die',
+        'set_cell' et 'fill_random' y ajoute (numéro de case, ancien type, nouveau type), le type du sol
+        étant 'None'. Sans abonné, l'enregistrement ne coûte qu'un test."""
+        change_log = ChangeLog()
+        self.__change_logs.append(change_log)
+        return change_log
+
+    def close_change_log(self, change_log):
+        """ Désabonne le journal 'change_log'."""
+        self.__change_logs.remove(change_log)
+
+    def get_kind(self, value):
+        """ Retourne le type de 'value' tel qu'enregistré dans les journaux, 'None' pour le sol."""
+        return None if value == self.__ground else type(value)
+
+    def __log_change(self, cell_number, old_kind, new_kind):
+        change = (cell_number, old_kind, new_kind)
+        for change_log in self.__change_logs:
+            change_log.append(change)
+
+    @staticmethod
+    def __get_key(value):
+        """ Retourne la clé d'index de 'value', ou 'None' si 'value' ne peut pas être indexée.
+        Les Element sont égaux lorsqu'ils ont le même 'char_repr' : c'est leur clé."""
+        if isinstance(value, Element):
+            if type(value).__eq__ is Element.__eq__:
+                return PlanetAlpha.__ELEMENT_KEY, value.char_repr
+            return None
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        return value
+
+    def __build_index(self):
+        self.__index = {}
+        self.__unindexed = IndexedSet()
+        cell_number = 0
+        for line in self.get_grid():
+            for value in line:
+                self.__index_add(cell_number, value)
+                cell_number += 1
+
+    def __index_add(self, cell_number, value):
+        key = self.__get_key(value)
+        if key is None:
+            self.__unindexed.add(cell_number)
+        else:
+            cells = self.__index.get(key)
+            if cells is None:
+                cells = self.__index[key] = IndexedSet()
+            cells.add(cell_number)
+
+    def __index_remove(self, cell_number, value):
+        key = self.__get_key(value)
+        if key is None:
+            self.__unindexed.discard(cell_number)
+        else:
+            cells = self.__index.get(key)
+            if cells is not None:
+                cells.discard(cell_number)
+                if not cells:
+                    del self.__index[key]
+
+    def __get_value_cells(self, value):
+        """ Retourne les cellules indexées de valeur 'value' (IndexedSet) et la liste des cellules non
+        indexées égales à 'value', ou 'None' si 'value' ne peut pas être indexée."""
+        key = self.__get_key(value)
+        if key is None:
+            return None
+        if self.__index is None:
+            self.__build_index()
+        cells = self.__index.get(key, ())
+        unindexed_cells = [cell_number for cell_number in self.__unindexed
+                           if Grid.get_cell(self, cell_number) == value] if self.__unindexed else []
+        return cells, unindexed_cells
+
+    def get_count(self, value):
+        value_cells = self.__get_value_cells(value)
+        if value_cells is None:
+            return Grid.get_count(self, value)
+        return len(value_cells[0]) + len(value_cells[1])
+
+    def get_same_value_cell_numbers(self, value):
+        value_cells = self.__get_value_cells(value)
+        if value_cells is None:
+            return Grid.get_same_value_cell_numbers(self, value)
+        return sorted([*value_cells[0], *value_cells[1]])
+
     def get_random_free_place(self):
-        list_empty = self.get_same_value_cell_numbers(self.__ground)
-        if len(list_empty) == 0:
+        value_cells = self.__get_value_cells(self.__ground)
+        if value_cells is None:
+            list_empty = Grid.get_same_value_cell_numbers(self, self.__ground)
+            return random.choice(list_empty) if list_empty else -1
+        cells, unindexed_cells = value_cells
+        free_count = len(cells) + len(unindexed_cells)
+        if free_count == 0:
             return -1
-        return random.choice(list_empty)
+        position = random.randrange(free_count)
+        return cells[position] if position < len(cells) else unindexed_cells[position - len(cells)]
+
+    def set_cell(self, cell_number, value):
+        if self.__index is not None or self.__change_logs:
+            old_value = Grid.get_cell(self, cell_number)
+            if self.__index is not None:
+                self.__index_remove(cell_number, old_value)
+                self.__index_add(cell_number, value)
+            if self.__change_logs:
+                self.__log_change(cell_number, self.get_kind(old_value), self.get_kind(value))
+        Grid.set_cell(self, cell_number, value)
+        self.__version += 1
+
+    def fill_random(self, values):
+        old_kinds = [self.get_kind(value) for line in self.get_grid() for value in line] if self.__change_logs else None
+        Grid.fill_random(self, values)
+        if old_kinds is not None:
+            cell_number = 0
+            for line in self.get_grid():
+                for value in line:
+                    self.__log_change(cell_number, old_kinds[cell_number], self.get_kind(value))
+                    cell_number += 1
+        self.__index = None
+        self.__unindexed = None
+        self.__version += 1
 
     def born(self, cell_number, element):
         grille = self.get_grid()
         i,j = self.get_coordinates_from_cell_number(cell_number)
         if grille[i][j] == self.__ground:
+            if self.__index is not None:
+                self.__index_remove(cell_number, grille[i][j])
+                self.__index_add(cell_number, element)
+            if self.__change_logs:
+                self.__log_change(cell_number, None, self.get_kind(element))
             grille[i][j] = element
+            self.__version += 1
             return 1
         return 0
 
@@ -47,7 +187,13 @@ class PlanetAlpha(Grid):
         (i,j) = self.get_coordinates_from_cell_number(cell_number)
         if grille[i][j] == self.__ground:
             return 0
+        if self.__index is not None:
+            self.__index_remove(cell_number, grille[i][j])
+            self.__index_add(cell_number, self.__ground)
+        if self.__change_logs:
+            self.__log_change(cell_number, type(grille[i][j]), None)
         grille[i][j] = self.__ground
+        self.__version += 1
         return 1
 
     def __repr__(self):
@@ -1,3 +1,4 @@
+from IndexedSet import IndexedSet
 from PlanetAlpha import PlanetAlpha
 import random
 
@@ -10,9 +11,10 @@ class PlanetTk:
     - Cell state changes
     - Visual properties
     - Element placement and movement
+    - Per-class occupancy (cells and counts of each authorized class)
     """
 
-    def __init__(self, root, latitude_cells_count, longitude_cells_count, authorized_classes, background_color: str='white', foreground_color: str='dark blue', gridlines_color: str='maron', cell_size: int=40, gutter_size: int=0, margin_size: int=0, show_content: bool=True, show_grid_lines: bool=True, **kw):
+    def __init__(self, root, latitude_cells_count, longitude_cells_count, authorized_classes, background_color: str='white', foreground_color: str='dark blue', gridlines_color: str='maron', cell_size: int=40, gutter_size: int=0, margin_size: int=0, show_content: bool=True, show_grid_lines: bool=True, planet_class=PlanetAlpha, **kw):
         """
         Initialize the grid system.
         
@@ -29,6 +31,7 @@ class PlanetTk:
             margin_size (int): Size of the margin around the grid
             show_content (bool): Whether to show the content of the cells
             show_grid_lines (bool): Whether to show the grid lines
+            planet_class (type): PlanetAlpha class (or subclass) of the underlying grid
             **kw: Additional display parameters
         """
         self.__root = root
@@ -44,13 +47,19 @@ class PlanetTk:
         self.__show_content = show_content
         self.__show_grid_lines = show_grid_lines
     
-        self.__planetAlpha = PlanetAlpha(
+        self.__planetAlpha = planet_class(
             name="Conway's Game of Life",
             latitude_cell_count=latitude_cells_count,
             longitude_cell_count=longitude_cells_count,
             ground=0  # Using 0 as default ground state
         )
 
+        # Cells of each authorized class, built on the first query then kept up to date by
+        # 'born' and 'die'; rebuilt if the grid version shows an edit made outside of PlanetTk
+        self.__classes_cells = None
+        self.__classes_version = None
+        self.__element_classes = {}
+
     def get_root(self):
         """
         Get the root widget.
@@ -85,8 +94,18 @@ class PlanetTk:
         Args:
             cell_number (int): The cell number.
             element: The element to place.
+
+        Returns:
+            int: 1 if the element was placed, 0 if the cell was not free.
         """
-        self.__planetAlpha.born(cell_number, element)
+        is_tracked = self.__is_classes_tracked()
+        result = self.__planetAlpha.born(cell_number, element)
+        if result and is_tracked:
+            element_class = self.__get_element_class(self.__planetAlpha.get_kind(element))
+            if element_class is not None:
+                self.__classes_cells[element_class].add(cell_number)
+            self.__classes_version = self.__planetAlpha.get_version()
+        return result
     
     def die(self, cell_number, element = 0):
         """
@@ -95,8 +114,21 @@ class PlanetTk:
         Args:
             cell_number (int): The cell number.
             element: The element to remove (default is 0).
+
+        Returns:
+            int: 1 if an element was removed, 0 if the cell was already free.
         """
-        self.__planetAlpha.die(cell_number)
+        if not self.__is_classes_tracked():
+            return self.__planetAlpha.die(cell_number)
+        i, j = self.__planetAlpha.get_coordinates_from_cell_number(cell_number)
+        value = self.__planetAlpha.get_grid()[i][j]
+        element_class = self.__get_element_class(self.__planetAlpha.get_kind(value))
+        result = self.__planetAlpha.die(cell_number)
+        if result:
+            if element_class is not None:
+                self.__classes_cells[element_class].discard(cell_number)
+            self.__classes_version = self.__planetAlpha.get_version()
+        return result
 
     def born_randomly(self, element):
         """
@@ -120,7 +152,8 @@ class PlanetTk:
 
     def move_element(self, cell_number, new_cell_number):
         """
-        Move an element from one cell to another.
+        Move an element from one cell to another (the class cells follow through 'die'
+        and 'born', the change logs get a 'die' then a 'born').
         
         Args:
             cell_number (int): The current cell number.
@@ -130,17 +163,87 @@ class PlanetTk:
         self.die(cell_number)
         self.born(new_cell_number, element)
 
+    def open_change_log(self):
+        """
+        Subscribe a new change log to the planet (see PlanetAlpha.open_change_log).
+
+        Returns:
+            ChangeLog: Log receiving the (cell_number, old_kind, new_kind) changes.
+        """
+        return self.__planetAlpha.open_change_log()
+
+    def close_change_log(self, change_log):
+        """
+        Unsubscribe a change log from the planet.
+
+        Args:
+            change_log (ChangeLog): Log returned by 'open_change_log'.
+        """
+        self.__planetAlpha.close_change_log(change_log)
+
+    def __get_element_class(self, element_type):
+        """
+        Get the authorized class of a type of element: the first authorized class it is
+        a subclass of, or None (ground, unauthorized values).
+        """
+        if element_type not in self.__element_classes:
+            self.__element_classes[element_type] = next(
+                (authorized_class for authorized_class in self.__authorized_classes
+                 if element_type is not None and issubclass(element_type, authorized_class)), None)
+        return self.__element_classes[element_type]
+
+    def __is_classes_tracked(self):
+        """Test if the class cells are built and up to date with the grid."""
+        return self.__classes_cells is not None and self.__classes_version == self.__planetAlpha.get_version()
+
+    def __update_classes_cells(self):
+        """Build the class cells by scanning the grid, if they are not up to date."""
+        if self.__is_classes_tracked():
+            return
+        self.__classes_cells = {authorized_class: IndexedSet() for authorized_class in self.__authorized_classes}
+        cell_number = 0
+        for line in self.__planetAlpha.get_grid():
+            for value in line:
+                element_class = self.__get_element_class(self.__planetAlpha.get_kind(value))
+                if element_class is not None:
+                    self.__classes_cells[element_class].add(cell_number)
+                cell_number += 1
+        self.__classes_version = self.__planetAlpha.get_version()
+
+    def get_class_cells(self, element_class):
+        """
+        Get the cells occupied by the elements of an authorized class.
+
+        Args:
+            element_class (type): One of the authorized classes.
+
+        Returns:
+            IndexedSet: Live set of cell numbers (in any order), not to be modified.
+        """
+        self.__update_classes_cells()
+        return self.__classes_cells[element_class]
+
+    def get_class_count(self, element_class):
+        """
+        Get the number of cells occupied by the elements of an authorized class.
+
+        Args:
+            element_class (type): One of the authorized classes.
+
+        Returns:
+            int: The number of cells.
+        """
+        return len(self.get_class_cells(element_class))
+
     def get_classes_cell_numbers(self):
         """
         Get the number of cells occupied by each class.
         
         Returns:
-            dict: Dictionary with class names as keys and counts as values.
+            dict: Dictionary with classes as keys and counts as values.
         """
-        dic = {}
-        for i in self.__authorized_classes:
-            dic[i] = self.__planetAlpha.get_count(i)
-        return dic
+        self.__update_classes_cells()
+        return {authorized_class: len(cells) for authorized_class, cells in self.__classes_cells.items()}
 
     def get_grid(self):
         """
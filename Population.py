@@ -0,0 +1,174 @@
+from array import array
+import re
+
+from Element import Element
+from Human import Human
+
+
+class PopulationHuman(Human):
+    """
+    Human view of one cell of a Population.
+
+    Created on demand only; its age is read from and written to the arrays of the
+    population, so 'get_age', 'set_age' and 'ageing' behave as on a regular Human.
+    """
+
+    def __init__(self, population, cell_number):
+        """
+        Initialize the view without counting a new Human instance.
+
+        Args:
+            population (Population): Population holding the age
+            cell_number (int): Cell number of the Human
+        """
+        Element.__init__(self, 'H')
+        self.kinds = ['Human']
+        self.name = 'Human'
+        self.sound = 'Hi'
+        self.set__full_name('Conway Being')
+        self.set_majority(18)
+        self.set_greetings('Hello')
+        self.set_nationality('XX')
+        self.__population = population
+        self.__cell_number = cell_number
+
+    def get_cell_number(self):
+        """Return the cell number of the Human."""
+        return self.__cell_number
+
+    def get_age(self):
+        """Return the age of the Human."""
+        return self.__population.get_age(self.__cell_number)
+
+    def set_age(self, new_age):
+        """Set a new age for the Human."""
+        self.__population.set_age(self.__cell_number, new_age)
+
+    def ageing(self, years=1):
+        """Add the specified number of years to the age."""
+        self.__population.ageing(self.__cell_number, years)
+
+
+class Population:
+    """
+    Compact struct-of-arrays store of the Humans living on a grid.
+
+    Per-cell attributes are kept in typed arrays indexed by cell number, instead of one
+    Human object per live cell:
+    - alive: 1 byte per cell (1 alive, 0 dead)
+    - ages: 1 signed integer per cell (0 for dead cells)
+
+    Human objects are only created on demand by 'get_human'.
+    """
+    __LIVE = re.compile(b'\x01')
+
+    def __init__(self, cells_count):
+        """
+        Initialize an empty population.
+
+        Args:
+            cells_count (int): Number of cells of the grid
+        """
+        self.__alive = bytearray(cells_count)
+        self.__ages = array('l', bytes(array('l').itemsize * cells_count))
+        self.__count = 0
+
+    def copy(self):
+        """Return an independent copy of the population (arrays copied at C speed)."""
+        population = Population(0)
+        population.__alive = bytearray(self.__alive)
+        population.__ages = array('l', self.__ages)
+        population.__count = self.__count
+        return population
+
+    def get_alive(self):
+        """Return the alive array (bytearray indexed by cell number)."""
+        return self.__alive
+
+    def get_ages(self):
+        """Return the ages array (array indexed by cell number)."""
+        return self.__ages
+
+    def get_count(self):
+        """Return the number of live cells."""
+        return self.__count
+
+    def get_live_cells(self):
+        """Return the list of live cell numbers, in increasing order."""
+        return [match.start() for match in self.__LIVE.finditer(self.__alive)]
+
+    def is_alive(self, cell_number):
+        """Test if a Human lives in the cell 'cell_number'."""
+        return self.__alive[cell_number] == 1
+
+    def add(self, cell_number, age=0):
+        """
+        Place a Human in a cell.
+
+        Returns:
+            int: 1 if the Human was placed, 0 if the cell was already alive.
+        """
+        if self.__alive[cell_number]:
+            return 0
+        self.__alive[cell_number] = 1
+        self.__ages[cell_number] = age
+        self.__count += 1
+        return 1
+
+    def remove(self, cell_number):
+        """
+        Remove the Human of a cell.
+
+        Returns:
+            int: 1 if a Human was removed, 0 if the cell was already dead.
+        """
+        if not self.__alive[cell_number]:
+            return 0
+        self.__alive[cell_number] = 0
+        self.__ages[cell_number] = 0
+        self.__count -= 1
+        return 1
+
+    def get_age(self, cell_number):
+        """Return the age of the Human of a cell."""
+        return self.__ages[cell_number]
+
+    def set_age(self, cell_number, new_age):
+        """Set a new age for the Human of a cell."""
+        self.__ages[cell_number] = new_age
+
+    def ageing(self, cell_number, years=1):
+        """Add the specified number of years to the age of the Human of a cell."""
+        self.__ages[cell_number] += years
+
+    def ageing_all(self, death_chances, generator):
+        """
+        Add one year to every living Human, then roll their natural death, in one batch.
+        One random draw is made per Human with a non-zero death chance, in cell order.
+
+        Args:
+            death_chances (list): Death probability indexed by age (see
+                Human.get_death_chances); the last one applies to older ages
+            generator (random.Random): Generator of the draws
+
+        Returns:
+            list: Cell numbers of the Humans dying naturally, in increasing order. They
+                are not removed from the population.
+        """
+        ages = self.__ages
+        last_age = len(death_chances) - 1
+        uniform = generator.random
+        deaths = []
+        for cell_number in self.get_live_cells():
+            age = ages[cell_number] + 1
+            ages[cell_number] = age
+            death_chance = death_chances[age if age < last_age else last_age]
+            if death_chance and uniform() < death_chance:
+                deaths.append(cell_number)
+        return deaths
+
+    def get_human(self, cell_number):
+        """Return a Human view of a live cell, or None if the cell is dead."""
+        if not self.__alive[cell_number]:
+            return None
+        return PopulationHuman(self, cell_number)
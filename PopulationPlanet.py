@@ -0,0 +1,53 @@
+from Human import Human
+from PlanetAlpha import PlanetAlpha
+from Population import Population
+
+
+class PopulationPlanet(PlanetAlpha):
+    """
+    PlanetAlpha whose Humans are stored in a compact Population.
+
+    The grid only holds one shared Human (the newborn) in every live cell; ages live in
+    the arrays of the population. 'get_cell' returns a Human view of the cell built on
+    demand, so callers see the same 'get_age'/'ageing' behaviour as with regular Humans.
+    Other values than Humans are stored in the grid as on a PlanetAlpha.
+    """
+
+    def __init__(self, name: str, latitude_cell_count, longitude_cell_count, ground):
+        PlanetAlpha.__init__(self, name, latitude_cell_count, longitude_cell_count, ground)
+        self.__population = Population(latitude_cell_count * longitude_cell_count)
+        self.__newborn = Human(['Conway'], 'Being', 'XX', 'Hello')
+
+    def get_population(self):
+        return self.__population
+
+    def get_newborn(self):
+        """Return the shared Human to give to 'born' to place a Human aged 0 without allocating one."""
+        return self.__newborn
+
+    def get_cell(self, cell_number):
+        value = PlanetAlpha.get_cell(self, cell_number)
+        if value is self.__newborn:
+            return self.__population.get_human(cell_number)
+        return value
+
+    def set_cell(self, cell_number, value):
+        self.__population.remove(cell_number)
+        if isinstance(value, Human):
+            self.__population.add(cell_number, value.get_age())
+            value = self.__newborn
+        PlanetAlpha.set_cell(self, cell_number, value)
+
+    def born(self, cell_number, element):
+        if not isinstance(element, Human):
+            return PlanetAlpha.born(self, cell_number, element)
+        if PlanetAlpha.born(self, cell_number, self.__newborn):
+            self.__population.add(cell_number, 0 if element is self.__newborn else element.get_age())
+            return 1
+        return 0
+
+    def die(self, cell_number):
+        if PlanetAlpha.die(self, cell_number):
+            self.__population.remove(cell_number)
+            return 1
+        return 0
@@ -0,0 +1,44 @@
+import time
+
+
+class RateMeter:
+    """
+    Number of events per second (steps, frames), measured over consecutive windows.
+
+    The rate of the last complete window is kept in one attribute, so it can be read from
+    another thread than the one counting the events.
+    """
+
+    def __init__(self, window=1.0, clock=time.monotonic):
+        """
+        Args:
+            window (float, optional): Duration of a measure, in seconds. Defaults to 1.0.
+            clock (callable, optional): Clock in seconds. Defaults to time.monotonic.
+        """
+        self.__window = window
+        self.__clock = clock
+        self.reset()
+
+    def reset(self):
+        """Forget the events counted so far."""
+        self.__window_start = self.__clock()
+        self.__count = 0
+        self.__rate = 0.0
+
+    def add(self, count=1):
+        """Count 'count' new events."""
+        self.__count += count
+        now = self.__clock()
+        if now - self.__window_start >= self.__window:
+            self.__rate = self.__count / (now - self.__window_start)
+            self.__window_start = now
+            self.__count = 0
+
+    def get_rate(self):
+        """
+        Return the number of events per second of the last complete window (0.0 if the
+        events stopped for more than two windows).
+        """
+        if self.__clock() - self.__window_start >= 2 * self.__window:
+            return 0.0
+        return self.__rate
@@ -0,0 +1,356 @@
+from array import array
+import bisect
+import json
+import mmap
+import re
+import struct
+import sys
+import zlib
+
+from Conway import Conway
+from PlanetAlpha import PlanetAlpha
+from PopulationPlanet import PopulationPlanet
+from SnakeGame import SnakeGame
+
+
+class RecordingWriter:
+    """
+    Record of a game run as a stream of frames, one per step (see Recording to replay it).
+
+    Every cell value is turned into a small code by the game class ('encode_cell'). The
+    writer keeps the codes of the last frame; a step is written as a delta frame holding
+    only the cells whose code changed (and the age of the Humans born), so the size of
+    the file follows the activity, not the area of the grid. Every 'keyframe_interval'
+    steps a keyframe holds the codes of every cell and the ages of the Humans instead, so
+    a replay never applies more than 'keyframe_interval' deltas to reach a generation.
+    Frames are compressed with zlib.
+
+    The candidate cells of a step come from a change log of the planet, plus the cells
+    given to 'record' (changes made without 'born'/'die', e.g. a snake head turning into
+    body). Ages are not written for the survivors: a replay ages them by one per step.
+    """
+
+    def __init__(self, path, planet, game_class, keyframe_interval=100, generation=0):
+        """
+        Open the file and write the first keyframe.
+
+        Args:
+            path (str): Path of the file
+            planet (PlanetAlpha): Planet of the game (a PopulationPlanet records ages)
+            game_class (type): Conway or SnakeGame, which encodes the cell values
+            keyframe_interval (int, optional): Number of steps between two keyframes.
+                Defaults to 100.
+            generation (int, optional): Number of the first generation. Defaults to 0.
+        """
+        self.__planet = planet
+        self.__game_class = game_class
+        self.__keyframe_interval = max(1, keyframe_interval)
+        self.__has_ages = isinstance(planet, PopulationPlanet)
+        self.__generation = generation
+        cells_count = planet.get_lines_count() * planet.get_columns_count()
+        self.__codes = bytearray(game_class.encode_cell(planet.get_cell(cell_number))
+                                 for cell_number in range(cells_count))
+        self.__keyframes = array('q')
+        self.__file = open(path, 'wb')
+        metadata = json.dumps({'game': game_class.__name__, 'ground': planet.get_ground()}).encode()
+        self.__file.write(Recording.HEADER.pack(Recording.MAGIC, Recording.VERSION, self.__has_ages,
+                                                planet.get_lines_count(), planet.get_columns_count(),
+                                                self.__keyframe_interval, len(metadata)))
+        self.__file.write(metadata)
+        self.__change_log = planet.open_change_log()
+        self.__write_keyframe()
+
+    def get_generation(self):
+        """Return the number of the last recorded generation."""
+        return self.__generation
+
+    def __write_frame(self, frame_type, payload):
+        self.__file.write(Recording.FRAME.pack(frame_type, self.__generation, len(payload)))
+        self.__file.write(payload)
+
+    def __write_keyframe(self):
+        self.__keyframes.extend((self.__generation, self.__file.tell()))
+        ages = array('q')
+        if self.__has_ages:
+            population = self.__planet.get_population()
+            ages.extend(population.get_age(cell_number) for cell_number in population.get_live_cells())
+        if sys.byteorder == 'big':
+            ages.byteswap()
+        codes = zlib.compress(bytes(self.__codes), 1)
+        self.__write_frame(b'K', struct.pack('<I', len(codes)) + codes + zlib.compress(ages.tobytes(), 1))
+
+    def record(self, cell_numbers=()):
+        """
+        Record the next generation.
+
+        Args:
+            cell_numbers (iterable, optional): Cells changed without going through the
+                change log of the planet. Defaults to ().
+        """
+        self.__generation += 1
+        candidates = {cell_number for cell_number, _, _ in self.__change_log.collect()}
+        candidates.update(cell_numbers)
+        changed_cells = array('I')
+        changed_codes = bytearray()
+        ages = array('q')
+        encode_cell, get_cell = self.__game_class.encode_cell, self.__planet.get_cell
+        for cell_number in sorted(candidates):
+            value = get_cell(cell_number)
+            code = encode_cell(value)
+            if code == self.__codes[cell_number]:
+                continue
+            self.__codes[cell_number] = code
+            changed_cells.append(cell_number)
+            changed_codes.append(code)
+            if self.__has_ages and code:
+                ages.append(value.get_age())
+        if self.__generation - self.__keyframes[-2] >= self.__keyframe_interval:
+            self.__write_keyframe()
+            return
+        # Gaps between the sorted cells compress better than the cell numbers
+        gaps = array('I', (cell_number - previous for previous, cell_number
+                           in zip([0] + changed_cells.tolist(), changed_cells)))
+        if sys.byteorder == 'big':
+            gaps.byteswap()
+            ages.byteswap()
+        self.__write_frame(b'D', zlib.compress(struct.pack('<I', len(gaps)) + gaps.tobytes() + changed_codes
+                                               + ages.tobytes(), 1))
+
+    def close(self):
+        """Write the index of the keyframes and close the file."""
+        if self.__file.closed:
+            return
+        self.__planet.close_change_log(self.__change_log)
+        index_offset = self.__file.tell()
+        keyframes = array('q', self.__keyframes)
+        if sys.byteorder == 'big':
+            keyframes.byteswap()
+        self.__write_frame(b'I', keyframes.tobytes())
+        self.__file.write(Recording.TRAILER.pack(index_offset, self.__generation, Recording.INDEX_MAGIC))
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class Recording:
+    """
+    Replay of a file written by a RecordingWriter, with random access to the generations.
+
+    The replayed cells live on a planet (a PopulationPlanet when ages were recorded), so
+    the usual renderers draw it. 'seek' jumps to the last keyframe before the target
+    generation, unless the current generation is already on the way, then applies the
+    deltas: its cost is bounded by one keyframe plus 'keyframe_interval' deltas. The
+    file is memory-mapped; the keyframe index is read from its end, or rebuilt by
+    scanning the frame headers if the recording was not closed.
+
+    Class Attributes:
+        GAMES (dict): Game classes by name, to decode the cells
+    """
+    MAGIC = b'RCRD'
+    VERSION = 1
+    INDEX_MAGIC = b'RIDX'
+    HEADER = struct.Struct('<4sHHIIII')
+    FRAME = struct.Struct('<cqI')
+    TRAILER = struct.Struct('<Qq4s')
+    GAMES = {'Conway': Conway, 'SnakeGame': SnakeGame}
+    __LIVE = re.compile(b'[^\x00]')
+
+    def __init__(self, path):
+        """
+        Open a recording, at its first generation.
+
+        Args:
+            path (str): Path of the file
+
+        Raises:
+            ValueError: If the file is not a recording of a supported version or game.
+        """
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__map) < self.HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a recording")
+        (magic, version, has_ages, self.__lines_count, self.__columns_count, self.__keyframe_interval,
+         metadata_size) = self.HEADER.unpack_from(self.__map)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a recording of version {self.VERSION}")
+        metadata = json.loads(self.__map[self.HEADER.size:self.HEADER.size + metadata_size])
+        if metadata['game'] not in self.GAMES:
+            self.close()
+            raise ValueError(f"Unknown game {metadata['game']!r} in {path}")
+        self.__game_class = self.GAMES[metadata['game']]
+        self.__frames_offset = self.HEADER.size + metadata_size
+        self.__read_index()
+        planet_class = PopulationPlanet if has_ages else PlanetAlpha
+        self.__planet = planet_class('Replay', self.__lines_count, self.__columns_count, metadata['ground'])
+        cells_count = self.__lines_count * self.__columns_count
+        self.__codes = bytearray(cells_count)
+        self.__births = array('q', bytes(8 * cells_count)) if has_ages else None
+        self.__generation = None
+        self.__offset = self.__frames_offset
+        self.__changed_cells = set()
+        self.seek(self.get_first_generation())
+
+    def __read_index(self):
+        """Read the keyframes (generation, offset) from the trailer, or by scanning the frames."""
+        trailer_offset = len(self.__map) - self.TRAILER.size
+        if trailer_offset >= self.__frames_offset:
+            index_offset, last_generation, magic = self.TRAILER.unpack_from(self.__map, trailer_offset)
+            if magic == self.INDEX_MAGIC:
+                _, _, size = self.FRAME.unpack_from(self.__map, index_offset)
+                keyframes = array('q')
+                keyframes.frombytes(self.__map[index_offset + self.FRAME.size:index_offset + self.FRAME.size + size])
+                if sys.byteorder == 'big':
+                    keyframes.byteswap()
+                self.__set_index(keyframes, last_generation, index_offset)
+                return
+        keyframes = array('q')
+        offset, last_generation = self.__frames_offset, None
+        while offset + self.FRAME.size <= len(self.__map):
+            frame_type, generation, size = self.FRAME.unpack_from(self.__map, offset)
+            if offset + self.FRAME.size + size > len(self.__map) or frame_type not in (b'K', b'D'):
+                break
+            if frame_type == b'K':
+                keyframes.extend((generation, offset))
+            last_generation = generation
+            offset += self.FRAME.size + size
+        if not keyframes:
+            raise ValueError("The recording holds no keyframe")
+        self.__set_index(keyframes, last_generation, offset)
+
+    def __set_index(self, keyframes, last_generation, end_offset):
+        self.__keyframe_generations = keyframes[0::2].tolist()
+        self.__keyframe_offsets = keyframes[1::2].tolist()
+        self.__last_generation = last_generation
+        self.__end_offset = end_offset
+
+    def close(self):
+        """Unmap the file."""
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def get_grid(self):
+        """Return the planet holding the cells of the current generation."""
+        return self.__planet
+
+    def get_game_class(self):
+        """Return the class of the recorded game (Conway or SnakeGame)."""
+        return self.__game_class
+
+    def get_first_generation(self):
+        """Return the number of the first recorded generation."""
+        return self.__keyframe_generations[0]
+
+    def get_last_generation(self):
+        """Return the number of the last recorded generation."""
+        return self.__last_generation
+
+    def get_generation(self):
+        """Return the number of the current generation."""
+        return self.__generation
+
+    def get_keyframe_interval(self):
+        """Return the number of steps between two keyframes."""
+        return self.__keyframe_interval
+
+    def collect_changed_cells(self):
+        """Return the cells changed since the last call (by 'seek' or 'step'), and forget them."""
+        changed_cells = self.__changed_cells
+        self.__changed_cells = set()
+        return changed_cells
+
+    def __set_code(self, cell_number, code, age=0):
+        """Set a cell of the planet from its code (and the age of a Human)."""
+        self.__codes[cell_number] = code
+        self.__planet.die(cell_number)
+        if code:
+            self.__planet.born(cell_number, self.__game_class.decode_cell(code, self.__planet))
+            if self.__births is not None:
+                self.__births[cell_number] = self.__generation - age
+        self.__changed_cells.add(cell_number)
+
+    def __apply_keyframe(self, payload):
+        codes_size, = struct.unpack_from('<I', payload)
+        codes = zlib.decompress(payload[4:4 + codes_size])
+        ages = array('q')
+        ages.frombytes(zlib.decompress(payload[4 + codes_size:]))
+        if sys.byteorder == 'big':
+            ages.byteswap()
+        difference = int.from_bytes(codes, 'little') ^ int.from_bytes(self.__codes, 'little')
+        for match in self.__LIVE.finditer(difference.to_bytes(len(codes), 'little')):
+            self.__set_code(match.start(), codes[match.start()])
+        if self.__births is not None:
+            for rank, match in enumerate(self.__LIVE.finditer(codes)):
+                self.__births[match.start()] = self.__generation - ages[rank]
+
+    def __apply_delta(self, payload):
+        payload = zlib.decompress(payload)
+        count, = struct.unpack_from('<I', payload)
+        gaps = array('I')
+        gaps.frombytes(payload[4:4 + 4 * count])
+        codes = payload[4 + 4 * count:4 + 5 * count]
+        ages = array('q')
+        ages.frombytes(payload[4 + 5 * count:])
+        if sys.byteorder == 'big':
+            gaps.byteswap()
+            ages.byteswap()
+        cell_number = 0
+        rank = 0
+        for gap, code in zip(gaps, codes):
+            cell_number += gap
+            age = 0
+            if self.__births is not None and code:
+                age = ages[rank]
+                rank += 1
+            self.__set_code(cell_number, code, age)
+
+    def seek(self, generation):
+        """
+        Move the planet to a generation (clamped to the recorded ones).
+
+        Returns:
+            int: The generation reached.
+        """
+        generation = min(max(generation, self.get_first_generation()), self.__last_generation)
+        keyframe = bisect.bisect_right(self.__keyframe_generations, generation) - 1
+        if self.__generation is None or not (self.__keyframe_generations[keyframe] <= self.__generation
+                                             <= generation):
+            self.__offset = self.__keyframe_offsets[keyframe]
+        while self.__offset < self.__end_offset:
+            frame_type, frame_generation, size = self.FRAME.unpack_from(self.__map, self.__offset)
+            if frame_generation > generation:
+                break
+            payload = self.__map[self.__offset + self.FRAME.size:self.__offset + self.FRAME.size + size]
+            self.__offset += self.FRAME.size + size
+            self.__generation = frame_generation
+            if frame_type == b'K':
+                self.__apply_keyframe(payload)
+            else:
+                self.__apply_delta(payload)
+        if self.__births is not None:
+            population = self.__planet.get_population()
+            for cell_number in population.get_live_cells():
+                population.set_age(cell_number, self.__generation - self.__births[cell_number])
+        return self.__generation
+
+    def step(self):
+        """
+        Move to the next generation.
+
+        Returns:
+            bool: False if the last generation was already reached.
+        """
+        if self.__generation >= self.__last_generation:
+            return False
+        self.seek(self.__generation + 1)
+        return True
@@ -0,0 +1,127 @@
+import re
+
+
+class RlePattern:
+    """
+    Import and export of Life patterns in the standard RLE format.
+
+    A pattern is a header 'x = <columns>, y = <lines>, rule = B3/S23' then runs of cells:
+    'b' dead, 'o' alive, '$' end of line, '!' end of pattern, each optionally preceded by
+    a repeat count. Lines starting with '#' are comments. Only the B3/S23 rule of
+    Conway's Game of Life is accepted.
+
+    Class Attributes:
+        RULE (str): Rule written in the headers
+        LINE_LENGTH (int): Maximal length of the lines written
+    """
+    RULE = 'B3/S23'
+    LINE_LENGTH = 70
+    __RULES = ('B3/S23', '23/3')
+    __RUN = re.compile(r'(\d*)([bo$!])')
+    __RUNS = re.compile(b'\x00+|\x01+')
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Read a pattern.
+
+        Args:
+            text (str): Content of a .rle file
+
+        Returns:
+            tuple: (lines count, columns count, list of the (line, column) of the live cells)
+
+        Raises:
+            ValueError: If the text is not a valid B3/S23 pattern.
+        """
+        lines_count = columns_count = None
+        body = []
+        for text_line in text.splitlines():
+            text_line = text_line.strip()
+            if not text_line or text_line.startswith('#'):
+                continue
+            if lines_count is None:
+                fields = dict(field.split('=', 1) for field in text_line.replace(' ', '').split(',') if '=' in field)
+                if 'x' not in fields or 'y' not in fields:
+                    raise ValueError(f"Missing RLE header 'x = ..., y = ...': {text_line!r}")
+                columns_count, lines_count = int(fields['x']), int(fields['y'])
+                if fields.get('rule', cls.RULE).upper() not in cls.__RULES:
+                    raise ValueError(f"Unsupported rule {fields['rule']!r}, expected {cls.RULE}")
+                continue
+            body.append(text_line)
+        if lines_count is None:
+            raise ValueError("Missing RLE header")
+        body = re.sub(r'\s', '', ''.join(body))
+        cells = []
+        line_number = column_number = 0
+        position = 0
+        for match in cls.__RUN.finditer(body):
+            if match.start() != position:
+                raise ValueError(f"Invalid RLE data at {body[position:match.start() + 1]!r}")
+            position = match.end()
+            count = int(match.group(1) or 1)
+            tag = match.group(2)
+            if tag == '!':
+                break
+            if tag == '$':
+                line_number += count
+                column_number = 0
+                continue
+            if tag == 'o':
+                if line_number >= lines_count or column_number + count > columns_count:
+                    raise ValueError(f"Live cells outside of the {columns_count} x {lines_count} pattern")
+                cells.extend((line_number, column) for column in range(column_number, column_number + count))
+            column_number += count
+        else:
+            if position != len(body):
+                raise ValueError(f"Invalid RLE data at {body[position:position + 10]!r}")
+        return lines_count, columns_count, cells
+
+    @classmethod
+    def load(cls, path):
+        """Read a pattern from a .rle file (see 'parse')."""
+        with open(path) as file:
+            return cls.parse(file.read())
+
+    @classmethod
+    def format(cls, planet):
+        """
+        Write the whole grid of a planet as a pattern, the cells holding another value
+        than the ground being alive.
+
+        Args:
+            planet (PlanetAlpha): Planet to export
+
+        Returns:
+            str: Content of a .rle file
+        """
+        ground = planet.get_ground()
+        tokens = []
+        empty_lines = 0
+        for line_number in range(planet.get_lines_count()):
+            alive = bytes(value != ground for value in planet.get_line(line_number))
+            runs = [(len(run), 'o' if run[0] else 'b') for run in cls.__RUNS.findall(alive.rstrip(b'\x00'))]
+            if not runs:
+                empty_lines += 1
+                continue
+            if tokens or empty_lines:
+                end_lines = empty_lines + 1 if tokens else empty_lines
+                tokens.append(f"{end_lines if end_lines > 1 else ''}$")
+            empty_lines = 0
+            tokens.extend(f"{count if count > 1 else ''}{tag}" for count, tag in runs)
+        tokens.append('!')
+        lines = [f"x = {planet.get_columns_count()}, y = {planet.get_lines_count()}, rule = {cls.RULE}"]
+        line = ''
+        for token in tokens:
+            if len(line) + len(token) > cls.LINE_LENGTH:
+                lines.append(line)
+                line = ''
+            line += token
+        lines.append(line)
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def save(cls, path, planet):
+        """Write the grid of a planet to a .rle file (see 'format')."""
+        with open(path, 'w') as file:
+            file.write(cls.format(planet))
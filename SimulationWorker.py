@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+
+from GameLoop import GameLoop
+
+
+class SimulationWorker:
+    """
+    Background thread advancing a simulation and publishing immutable snapshots of it.
+
+    Every access to the simulation goes through the worker thread: the display thread
+    only sends short commands (play, stop, one step, any call such as a cell toggle or a
+    reset), which never wait for a step, and reads the latest published snapshot. While
+    playing, the steps are run by a GameLoop at the rate given by 'delay', and a snapshot
+    is published at most every 'publish_interval' seconds, so the cost of the copies does
+    not grow with the speed of the simulation; the generations in between are never seen
+    by the display (frame dropping). A snapshot is always published after a command.
+
+    With 'get_changes', each snapshot also carries the cells changed since the snapshot
+    fetched last by the display (see GridSnapshot.set_changes): the union of the changes
+    of the steps run in between, so that the display redraws only those cells. A 'call'
+    command, whose changes are unknown, leaves the next snapshots to a full comparison.
+    """
+
+    def __init__(self, step, make_snapshot, delay=0.0, publish_interval=1 / 60, get_changes=None):
+        """
+        Args:
+            step (callable): Advance the simulation by one step
+            make_snapshot (callable): Return an immutable snapshot of the simulation
+            delay (float, optional): Minimal time between two steps while playing, in
+                seconds. Defaults to 0.0 (as fast as possible).
+            publish_interval (float, optional): Minimal time between two snapshots while
+                playing, in seconds. Defaults to 1/60.
+            get_changes (callable, optional): Return the cell numbers changed by the last
+                step. Defaults to None (snapshots without changes).
+        """
+        self.__step = step
+        self.__make_snapshot = make_snapshot
+        self.__get_changes = get_changes
+        # Cells changed since the last publish, and since the base snapshot (None: unknown)
+        self.__lock = threading.Lock()
+        self.__new_changes = set()
+        self.__changes = None
+        self.__changes_base = None
+        self.__is_fetched = False
+        self.__publish_interval = publish_interval
+        self.__commands = queue.Queue()
+        # One step per tick: the commands are read between any two steps
+        self.__loop = GameLoop(self.__play_step, None, delay, max_steps_per_frame=1)
+        self.__is_published = True
+        self.__steps_count = 0
+        self.__error = None
+        self.__snapshot = make_snapshot()
+        self.__publish_time = time.monotonic()
+        self.__thread = threading.Thread(target=self.__run, name='SimulationWorker', daemon=True)
+
+    def start(self):
+        """Start the worker thread."""
+        self.__thread.start()
+
+    def get_snapshot(self):
+        """Return the latest published snapshot (the base of the changes of the next ones)."""
+        with self.__lock:
+            self.__is_fetched = True
+            return self.__snapshot
+
+    def get_steps_count(self):
+        """Return the number of steps run by the worker."""
+        return self.__steps_count
+
+    def get_error(self):
+        """Return the exception raised by the last failed step or command, or None."""
+        return self.__error
+
+    def clear_error(self):
+        """Forget the exception returned by 'get_error', once it is reported."""
+        self.__error = None
+
+    def get_loop(self):
+        """Return the GameLoop running the steps while playing (achieved steps per second...)."""
+        return self.__loop
+
+    def is_playing(self):
+        """Test if the worker is running steps continuously."""
+        return self.__loop.is_running()
+
+    def play(self):
+        """Run steps continuously, every 'delay' seconds."""
+        self.__commands.put(('play', ()))
+
+    def stop(self):
+        """Stop running steps continuously."""
+        self.__commands.put(('stop', ()))
+
+    def step(self):
+        """Run one step."""
+        self.__commands.put(('step', ()))
+
+    def call(self, function, *arguments):
+        """Run 'function(*arguments)' in the worker thread, between two steps."""
+        self.__commands.put(('call', (function,) + arguments))
+
+    def set_delay(self, delay):
+        """Set the minimal time between two steps while playing, in seconds."""
+        self.__commands.put(('delay', (delay,)))
+
+    def close(self, timeout=None):
+        """
+        Stop the worker thread once the commands already sent are run.
+
+        Args:
+            timeout (float, optional): Maximal time to wait for the thread, in seconds.
+                Defaults to None (wait for it).
+        """
+        self.__commands.put(('close', ()))
+        if self.__thread.is_alive():
+            self.__thread.join(timeout)
+
+    def __publish(self):
+        snapshot = self.__make_snapshot()
+        with self.__lock:
+            if self.__get_changes is not None:
+                if self.__is_fetched:
+                    # The display holds the current snapshot: the changes restart from it
+                    self.__changes_base = self.__snapshot
+                    self.__changes = self.__new_changes
+                elif self.__changes is not None and self.__new_changes is not None:
+                    self.__changes |= self.__new_changes
+                else:
+                    self.__changes = None
+                self.__new_changes = set()
+                snapshot.set_changes(self.__changes_base, self.__changes)
+            self.__snapshot = snapshot
+            self.__is_fetched = False
+        self.__publish_time = time.monotonic()
+        self.__is_published = True
+
+    def __run_step(self):
+        self.__step()
+        self.__steps_count += 1
+        if self.__get_changes is not None and self.__new_changes is not None:
+            self.__new_changes.update(self.__get_changes())
+
+    def __play_step(self):
+        """Step of the loop: publish only if the last snapshot is older than the interval."""
+        self.__run_step()
+        self.__is_published = False
+        if time.monotonic() - self.__publish_time >= self.__publish_interval:
+            self.__publish()
+
+    def __execute(self, command, arguments):
+        """Run a command, then publish the resulting state."""
+        if command == 'play':
+            if not self.__loop.is_running():
+                self.__loop.start()
+        elif command == 'stop':
+            self.__loop.stop()
+        elif command == 'step':
+            self.__run_step()
+        elif command == 'call':
+            self.__new_changes = None
+            arguments[0](*arguments[1:])
+        elif command == 'delay':
+            self.__loop.set_step_period(arguments[0])
+        self.__publish()
+
+    def __run(self):
+        while True:
+            try:
+                timeout = self.__loop.tick()
+                # Publish the last steps before a pause longer than the interval
+                if not self.__is_published and (timeout is None or timeout >= self.__publish_interval):
+                    self.__publish()
+                command, arguments = self.__commands.get(timeout=timeout)
+                if command == 'close':
+                    return
+                self.__execute(command, arguments)
+            except queue.Empty:
+                pass
+            except Exception as error:
+                self.__error = error
+                self.__loop.stop()
+                self.__publish()
@@ -1,11 +1,18 @@
+from collections import deque
+
 from PlanetTk import PlanetTk
-from Element import Element
+from IndexedSet import IndexedSet
 import random
 
 from Snake import Snake
 
 class SnakeGame:
-    """Snake game class"""    
+    """
+    Snake game class
+
+    The body is a deque of cell numbers (head first) plus the set of the cells it
+    occupies, so moving and checking collisions take constant time whatever the length.
+    """
     DIRECTIONS = {
         'Up': (0, -1),
         'Down': (0, 1),
@@ -21,7 +28,40 @@ class SnakeGame:
         'dead_body': 'lightgray'
     }
 
-    def __init__(self, latitude_cells_count, longitude_cells_count):
+    # Codes of the cell values in a Recording, 0 being the ground
+    CELL_CODES = ('food', 'body', 'head', 'dead_body', 'dead_head')
+
+    @classmethod
+    def encode_cell(cls, value):
+        """Return the code of a cell value for a Recording (see CELL_CODES), 0 for the ground."""
+        if not isinstance(value, Snake):
+            return 0
+        if value.is_food:
+            return 1 + cls.CELL_CODES.index('food')
+        name = ('dead_' if value.is_dead else '') + ('head' if value.is_head else 'body')
+        return 1 + cls.CELL_CODES.index(name)
+
+    @classmethod
+    def decode_cell(cls, code, planet):
+        """Return a value of a cell code of a Recording (a new Snake, or the ground of 'planet')."""
+        if not code:
+            return planet.get_ground()
+        name = cls.CELL_CODES[code - 1]
+        if name == 'food':
+            return Snake(is_food=True)
+        return Snake(is_head=name.endswith('head'), is_dead=name.startswith('dead'))
+
+    def __init__(self, latitude_cells_count, longitude_cells_count, seed=None):
+        """
+        Initialize the game.
+
+        Args:
+            latitude_cells_count (int): Number of rows
+            longitude_cells_count (int): Number of columns
+            seed (optional): Seed of the random generator placing the food, for
+                reproducible games. Defaults to None (unpredictable).
+        """
+        self.__random = random.Random(seed)
         self.__planet = PlanetTk(
             root=None,
             latitude_cells_count=latitude_cells_count,
@@ -31,18 +71,36 @@ class SnakeGame:
         )
         self.__is_running = False
         self.__score = 0
-        self.__snake_segments = []
+        self.__snake_segments = deque()
+        self.__snake_cells = set()
         self.__food_position = None
         self.__game_over = False
+        self.__is_won = False
         self.__direction = 'Right'  # Ajout de la direction comme attribut
+        self.__free_cells = None
+        self.__changed_cells = []
         self.__initialize_game()
 
     def get_grid(self):
         """Return the underlying PlanetAlpha grid object."""
         return self.__planet._PlanetTk__planetAlpha
     
+    def __born(self, cell_number, element):
+        """Place an element on the planet and take its cell from the free cells"""
+        if self.__planet.born(cell_number, element):
+            self.__free_cells.discard(cell_number)
+            self.__changed_cells.append(cell_number)
+
+    def __die(self, cell_number):
+        """Remove the element of a cell of the planet and give the cell back to the free cells"""
+        if self.__planet.die(cell_number):
+            self.__free_cells.add(cell_number)
+            self.__changed_cells.append(cell_number)
+
     def __initialize_game(self):
         """Initialize snake with head and body segments"""
+        self.__free_cells = IndexedSet(range(self.__planet._PlanetTk__latitude_cells_count *
+                                             self.__planet._PlanetTk__longitude_cells_count))
         # Place snake in the middle
         start_x = self.__planet._PlanetTk__longitude_cells_count // 4
         start_y = self.__planet._PlanetTk__latitude_cells_count // 2
@@ -50,28 +108,32 @@ class SnakeGame:
         # Create head
         head_pos = start_y * self.__planet._PlanetTk__longitude_cells_count + start_x
         head = Snake(is_head=True)
-        self.__planet.born(head_pos, head)
+        self.__born(head_pos, head)
         self.__snake_segments.append(head_pos)
+        self.__snake_cells.add(head_pos)
         
         # Create body
         for i in range(1, 3):
             pos = start_y * self.__planet._PlanetTk__longitude_cells_count + (start_x - i)
             self.__snake_segments.append(pos)
-            self.__planet.born(pos, Snake())
+            self.__snake_cells.add(pos)
+            self.__born(pos, Snake())
         
         self.__place_food()
 
     def __place_food(self):
-        """Place food in random empty cell"""
-        grid = self.__planet.get_grid()
-        while True:
-            pos = random.randint(0, 
-                               self.__planet._PlanetTk__latitude_cells_count * 
-                               self.__planet._PlanetTk__longitude_cells_count - 1)
-            if not isinstance(grid.get_cell(pos), Element):
-                self.__food_position = pos
-                self.__planet.born(pos, Snake(is_food=True))  # Utiliser Snake avec is_food=True
-                break
+        """
+        Place food in a random free cell, drawn from the free cells in constant time.
+        When no cell is free the snake fills the board: the game is won (and over).
+        """
+        pos = self.__free_cells.choice(self.__random)
+        if pos is None:
+            self.__food_position = None
+            self.__is_won = True
+            self.__game_over = True
+            return
+        self.__food_position = pos
+        self.__born(pos, Snake(is_food=True))  # Utiliser Snake avec is_food=True
 
     def toggle_running(self):
         """Toggle snake movement state with spacebar"""
@@ -114,6 +176,7 @@ class SnakeGame:
 
     def step(self):
         """Move snake by moving tail to new head position"""
+        self.__changed_cells = []
         if not self.__is_running or self.__game_over:
             return False
 
@@ -134,7 +197,8 @@ class SnakeGame:
             
         new_head = new_y * self.__planet._PlanetTk__longitude_cells_count + new_x
         
-        if new_head in self.__snake_segments[:-1]:  # Exclude tail from collision check
+        tail = self.__snake_segments[-1]
+        if new_head in self.__snake_cells and new_head != tail:  # Exclude tail from collision check
             self.__game_over = True
             self.__kill_snake()
             return False
@@ -142,21 +206,29 @@ class SnakeGame:
         # Convert current head to body before creating new head
         current_head = self.__planet._PlanetTk__planetAlpha.get_cell(self.__snake_segments[0])
         current_head.is_head = False
+        self.__changed_cells.append(self.__snake_segments[0])
         
         if new_head == self.__food_position:
             # Delete food first
-            self.__planet.die(self.__food_position)
+            self.__die(self.__food_position)
             # Grow snake
             self.__score += 1
-            self.__snake_segments.insert(0, new_head)
-            self.__planet.born(new_head, Snake(is_head=True))
+            self.__snake_segments.appendleft(new_head)
+            self.__snake_cells.add(new_head)
+            self.__born(new_head, Snake(is_head=True))
             self.__place_food()
         else:
-            # Move tail to new head position
-            tail = self.__snake_segments.pop()
-            self.__planet.die(tail)
-            self.__snake_segments.insert(0, new_head)
-            self.__planet.born(new_head, Snake(is_head=True))
+            # Move tail to new head position: the tail Snake is turned into the new head
+            tail_snake = self.__planet._PlanetTk__planetAlpha.get_cell(tail)
+            self.__snake_segments.pop()
+            self.__snake_cells.discard(tail)
+            self.__die(tail)
+            tail_snake.is_head = True
+            tail_snake.char_repr = 'H'
+            tail_snake.direction = self.__direction
+            self.__snake_segments.appendleft(new_head)
+            self.__snake_cells.add(new_head)
+            self.__born(new_head, tail_snake)
             
         return True
 
@@ -171,8 +243,24 @@ class SnakeGame:
                 is_dead=True
             )
             # Remplacer le segment vivant par le segment mort
-            self.__planet.die(segment)
-            self.__planet.born(segment, dead_snake)
+            self.__die(segment)
+            self.__born(segment, dead_snake)
+
+    def get_direction(self):
+        """Return current direction"""
+        return self.__direction
+
+    def get_snake_segments(self):
+        """Return the cell numbers of the snake, head first"""
+        return list(self.__snake_segments)
+
+    def get_changed_cells(self):
+        """Return the cell numbers whose content changed during the last step"""
+        return self.__changed_cells
+
+    def get_food_position(self):
+        """Return the cell number of the food"""
+        return self.__food_position
 
     def get_score(self):
         """Return current score"""
@@ -182,6 +270,14 @@ class SnakeGame:
         """Return game over state"""
         return self.__game_over
 
+    def is_won(self):
+        """Return True if the snake filled the board (the game is then over)"""
+        return self.__is_won
+
+    def get_free_cells_count(self):
+        """Return the number of cells occupied neither by the snake nor by the food"""
+        return len(self.__free_cells)
+
     def reset(self):
         """Reset the game to initial state"""
         # Clear grid
@@ -192,9 +288,11 @@ class SnakeGame:
         # Reset variables
         self.__score = 0
         self.__direction = 'Right'
-        self.__snake_segments = []
+        self.__snake_segments = deque()
+        self.__snake_cells = set()
         self.__food_position = None
         self.__game_over = False
+        self.__is_won = False
         
         # Initialize new game
         self.__initialize_game()
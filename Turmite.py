@@ -0,0 +1,10 @@
+from Element import Element
+
+class Turmite(Element):
+    """
+    Ant of a Turmites game, as shown on the planet: the cell of an ant holds its Turmite
+    instead of the colour under it (see Turmites).
+    """
+    def __init__(self, number=0):
+        super().__init__('T')
+        self.number = number
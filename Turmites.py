@@ -0,0 +1,331 @@
+from array import array
+import random
+import re
+
+from PlanetTk import PlanetTk
+from Turmite import Turmite
+
+
+class Turmites:
+    """
+    Turmites: multi-colour Langton's ants walking on a grid.
+
+    A rule gives, for each state of an ant and colour of its cell, the colour written
+    on the cell, the turn of the ant (see TURNS) and its next state; then the ant moves
+    one cell forward. A single-state rule is written as a string of turns, one per
+    colour, each colour being replaced by the next one: Langton's ant is 'RL', and the
+    Turmite '1100' (1 right, 0 left) is 'RRLL'. Rules with several states are lists
+    (one per state) of lists (one per colour) of (colour, turn, state) tuples.
+
+    The colours live in a bytearray (one byte per cell), the moves in a table of the 4
+    neighbours of every cell, and the rule is compiled into flat lookup bytes indexed
+    by the colour and the "mode" of the ant (state and direction): 'step' advances the
+    ants by any number of steps with a few indexings per step, without touching the
+    planet. Only at the end of a call the cells whose colour changed and the cells left
+    or reached by the ants are written to the planet, and returned by
+    'get_changed_cells', so a frame repaints the trail, not the grid. The changed colours
+    are found among the cells visited during the call when the call is short compared
+    to the grid (see TRACKING_RATIO), otherwise by comparing all the colours at once.
+
+    On a grid which is not a torus, an ant facing an edge stays on its cell (and turns
+    again at the next step).
+
+    Class Attributes:
+        DIRECTIONS (tuple): Directions of the ants, clockwise
+        TURNS (dict): Quarter turns clockwise of each turn letter
+        RULES (dict): Named rules
+        COLORS (dict): Colour of the ants and of the trail colours 1, 2... (0 is the ground)
+        TRACKING_RATIO (int): Number of cells per step below which the visited cells are
+            recorded
+    """
+    DIRECTIONS = ('Up', 'Right', 'Down', 'Left')
+    TURNS = {'N': 0, 'R': 1, 'U': 2, 'L': 3}
+    RULES = {
+        'langton': 'RL',
+        'symmetric': 'RRLL',
+        'square': 'LRRRRRLLR',
+        'triangle': 'RRLLLRLLLRRR',
+        'chaotic': 'RLR',
+        'fibonacci': [[(1, 'R', 1), (1, 'L', 1)], [(1, 'R', 1), (0, 'N', 0)]],
+    }
+    COLORS = {
+        'ant': 'red',
+        'trail': ('black', 'royal blue', 'forest green', 'orange', 'purple', 'gold', 'brown', 'deep pink',
+                  'turquoise', 'gray', 'olive drab', 'navy'),
+    }
+    TRACKING_RATIO = 32
+    __MAX_MODES = 256
+    __CHANGED = re.compile(b'[^\x00]')
+
+    def __init__(self, latitude_cells_count, longitude_cells_count, rule='langton', ants_count=1, seed=None,
+                 is_tore=True):
+        """
+        Initialize the game.
+
+        Args:
+            latitude_cells_count (int): Number of rows
+            longitude_cells_count (int): Number of columns
+            rule (str or list, optional): Name of one of RULES, string of turns or table
+                of a rule (see the class). Defaults to 'langton'.
+            ants_count (int, optional): Number of ants: the first one in the center facing
+                up, the others on random cells and directions. Defaults to 1.
+            seed (optional): Seed of the random generator placing the ants, for
+                reproducible runs. Defaults to None (unpredictable).
+            is_tore (bool, optional): If True the grid is a torus. Defaults to True.
+
+        Raises:
+            ValueError: If the rule is invalid.
+        """
+        self.__planet = PlanetTk(
+            root=None,
+            latitude_cells_count=latitude_cells_count,
+            longitude_cells_count=longitude_cells_count,
+            authorized_classes=[Turmite],
+            cell_size=20
+        )
+        self.__lines_count = latitude_cells_count
+        self.__columns_count = longitude_cells_count
+        self.__rule = self.RULES.get(rule, rule) if isinstance(rule, str) else rule
+        self.__colors_count, self.__modes_count, self.__writes, self.__next_modes = self.compile_rule(self.__rule)
+        self.__ants_count = ants_count
+        self.__seed = seed
+        self.__moves = self.__build_moves(latitude_cells_count, longitude_cells_count, is_tore)
+        self.__is_tore = is_tore
+        cells_count = latitude_cells_count * longitude_cells_count
+        self.__colors = bytearray(cells_count)
+        self.__drawn_colors = bytearray(cells_count)
+        self.__drawn_ant_cells = []
+        self.__ant_cells = []
+        self.__ant_modes = []
+        self.reset()
+
+    @classmethod
+    def parse_rule(cls, rule):
+        """
+        Return the table of a rule (see the class, or a name of RULES): a list of states, each a list of
+        (colour, turn, next state) tuples, one per colour, the turns being quarter turns
+        clockwise.
+
+        Raises:
+            ValueError: If the rule is invalid.
+        """
+        if isinstance(rule, str):
+            rule = cls.RULES.get(rule, rule)
+        if isinstance(rule, str):
+            if rule and set(rule) <= {'0', '1'}:
+                # Booklet notation: 1 for +90 degrees (right), 0 for -90 degrees (left)
+                rule = rule.replace('1', 'R').replace('0', 'L')
+            rule = rule.upper()
+            if len(rule) < 2 or not set(rule) <= set(cls.TURNS):
+                raise ValueError(f"Invalid rule {rule!r}: expected at least 2 turns among {''.join(cls.TURNS)}")
+            return [[((color + 1) % len(rule), cls.TURNS[turn], 0) for color, turn in enumerate(rule)]]
+        table = []
+        for transitions in rule:
+            transitions = [(color, cls.TURNS[turn] if isinstance(turn, str) else turn % 4, state)
+                           for color, turn, state in transitions]
+            table.append(transitions)
+        colors_count = len(table[0]) if table else 0
+        if colors_count < 2 or any(len(transitions) != colors_count for transitions in table):
+            raise ValueError("Invalid rule: every state needs a transition for the same 2 colours or more")
+        for transitions in table:
+            for color, turn, state in transitions:
+                if not (0 <= color < colors_count and 0 <= state < len(table)):
+                    raise ValueError(f"Invalid rule transition {(color, turn, state)}")
+        return table
+
+    @classmethod
+    def compile_rule(cls, rule):
+        """
+        Compile a rule into flat lookup tables indexed by 'color * modes count + mode',
+        where the mode of an ant is 'state * 4 + direction'.
+
+        Returns:
+            tuple: (colours count, modes count, colour written (bytes), next mode (bytes))
+
+        Raises:
+            ValueError: If the rule is invalid or has more than 64 states.
+        """
+        table = cls.parse_rule(rule)
+        colors_count, modes_count = len(table[0]), 4 * len(table)
+        if modes_count > cls.__MAX_MODES or colors_count > 256:
+            raise ValueError("Invalid rule: at most 64 states and 256 colours")
+        writes = bytearray(colors_count * modes_count)
+        next_modes = bytearray(colors_count * modes_count)
+        for state, transitions in enumerate(table):
+            for color, (write, turn, next_state) in enumerate(transitions):
+                for direction in range(4):
+                    index = color * modes_count + 4 * state + direction
+                    writes[index] = write
+                    next_modes[index] = 4 * next_state + (direction + turn) % 4
+        return colors_count, modes_count, bytes(writes), bytes(next_modes)
+
+    @classmethod
+    def __build_moves(cls, lines_count, columns_count, is_tore):
+        """Return the table of the neighbours of the cells: the cell reached from 'c' in the direction 'd' is at 4 * c + d."""
+        moves = array('l', bytes(array('l').itemsize * 4 * lines_count * columns_count))
+        deltas = {'Up': (-1, 0), 'Right': (0, 1), 'Down': (1, 0), 'Left': (0, -1)}
+        for direction, name in enumerate(cls.DIRECTIONS):
+            delta_line, delta_column = deltas[name]
+            columns = []
+            for column_number in range(columns_count):
+                column = column_number + delta_column
+                if is_tore:
+                    column %= columns_count
+                elif not 0 <= column < columns_count:
+                    column = column_number
+                columns.append(column)
+            neighbours = array('l')
+            for line_number in range(lines_count):
+                line = line_number + delta_line
+                if is_tore:
+                    line %= lines_count
+                elif not 0 <= line < lines_count:
+                    line = line_number
+                first_cell_number = line * columns_count
+                neighbours.extend([first_cell_number + column for column in columns])
+            moves[direction::4] = neighbours
+        return moves
+
+    def get_grid(self):
+        """Return the underlying PlanetAlpha grid object."""
+        return self.__planet.get_grid()
+
+    def is_tore(self):
+        """Return True if the grid is a torus."""
+        return self.__is_tore
+
+    def get_rule(self):
+        """Return the rule, as given (or found in RULES)."""
+        return self.__rule
+
+    def get_colors_count(self):
+        """Return the number of colours of the rule."""
+        return self.__colors_count
+
+    def get_step_count(self):
+        """Return the number of steps run since the start."""
+        return self.__step_count
+
+    def get_ants(self):
+        """Return the ants as (cell number, direction, state) tuples."""
+        return [(cell_number, self.DIRECTIONS[mode % 4], mode // 4)
+                for cell_number, mode in zip(self.__ant_cells, self.__ant_modes)]
+
+    def get_color(self, cell_number):
+        """Return the colour of a cell (0 for the ground)."""
+        return self.__colors[cell_number]
+
+    def get_colored_count(self):
+        """Return the number of cells of another colour than the ground."""
+        return len(self.__colors) - self.__colors.count(0)
+
+    def get_changed_cells(self):
+        """Return the cell numbers whose content changed during the last call to 'step'"""
+        return self.__changed_cells
+
+    def add_ant(self, cell_number, direction='Up', state=0):
+        """
+        Put a new ant on a cell.
+
+        Args:
+            cell_number (int): Cell of the ant
+            direction (str, optional): One of DIRECTIONS. Defaults to 'Up'.
+            state (int, optional): State of the ant in the rule. Defaults to 0.
+        """
+        self.__add_ant(cell_number, direction, state)
+        self.__sync()
+
+    def __add_ant(self, cell_number, direction, state):
+        if not 0 <= 4 * state < self.__modes_count:
+            raise ValueError(f"Invalid state {state} for a rule of {self.__modes_count // 4} states")
+        self.__ant_cells.append(cell_number)
+        self.__ant_modes.append(4 * state + self.DIRECTIONS.index(direction))
+
+    def reset(self):
+        """Clear the grid and put the ants back (the random ones at the same places for a given seed)."""
+        cells_count = self.__lines_count * self.__columns_count
+        self.__colors[:] = bytes(cells_count)
+        self.__ant_cells = []
+        self.__ant_modes = []
+        self.__step_count = 0
+        generator = random.Random(self.__seed)
+        for ant_number in range(self.__ants_count):
+            if ant_number == 0:
+                self.__add_ant(self.get_grid().get_cell_number_from_coordinates(self.__lines_count // 2,
+                                                                                self.__columns_count // 2), 'Up', 0)
+            else:
+                self.__add_ant(generator.randrange(cells_count), generator.choice(self.DIRECTIONS), 0)
+        self.__sync()
+
+    def step(self, steps_count=1):
+        """
+        Advance every ant by 'steps_count' steps, the ants moving one after the other at
+        each step, then write the changes to the planet.
+
+        Returns:
+            list: Cell numbers whose content changed (see 'get_changed_cells').
+        """
+        colors, writes, next_modes, moves = self.__colors, self.__writes, self.__next_modes, self.__moves
+        modes_count = self.__modes_count
+        ant_cells, ant_modes = self.__ant_cells, self.__ant_modes
+        visited_cells = None
+        if steps_count * len(ant_cells) * self.TRACKING_RATIO < len(colors):
+            # Few steps on a large grid: remember the visited cells rather than comparing every colour
+            visited_cells = []
+            visit = visited_cells.append
+            ant_numbers = range(len(ant_cells))
+            for _ in range(steps_count):
+                for ant_number in ant_numbers:
+                    cell_number = ant_cells[ant_number]
+                    visit(cell_number)
+                    index = colors[cell_number] * modes_count + ant_modes[ant_number]
+                    colors[cell_number] = writes[index]
+                    mode = ant_modes[ant_number] = next_modes[index]
+                    ant_cells[ant_number] = moves[4 * cell_number + (mode & 3)]
+        elif len(ant_cells) == 1:
+            # Single ant: its position and mode stay in local variables
+            cell_number, mode = ant_cells[0], ant_modes[0]
+            for _ in range(steps_count):
+                index = colors[cell_number] * modes_count + mode
+                colors[cell_number] = writes[index]
+                mode = next_modes[index]
+                cell_number = moves[4 * cell_number + (mode & 3)]
+            ant_cells[0], ant_modes[0] = cell_number, mode
+        elif ant_cells:
+            ant_numbers = range(len(ant_cells))
+            for _ in range(steps_count):
+                for ant_number in ant_numbers:
+                    cell_number = ant_cells[ant_number]
+                    index = colors[cell_number] * modes_count + ant_modes[ant_number]
+                    colors[cell_number] = writes[index]
+                    mode = ant_modes[ant_number] = next_modes[index]
+                    ant_cells[ant_number] = moves[4 * cell_number + (mode & 3)]
+        self.__step_count += steps_count
+        self.__sync(visited_cells)
+        return self.__changed_cells
+
+    def __sync(self, visited_cells=None):
+        """
+        Write to the planet the cells whose colour changed and the cells left or reached
+        by the ants. The changed colours are searched among 'visited_cells' if given,
+        otherwise by comparing all the colours with those written last.
+        """
+        colors, drawn_colors = self.__colors, self.__drawn_colors
+        if visited_cells is None:
+            difference = int.from_bytes(colors, 'little') ^ int.from_bytes(drawn_colors, 'little')
+            changed_cells = {match.start()
+                             for match in self.__CHANGED.finditer(difference.to_bytes(len(colors), 'little'))}
+            drawn_colors[:] = colors
+        else:
+            changed_cells = {cell_number for cell_number in set(visited_cells)
+                             if colors[cell_number] != drawn_colors[cell_number]}
+            for cell_number in changed_cells:
+                drawn_colors[cell_number] = colors[cell_number]
+        changed_cells.update(self.__drawn_ant_cells)
+        changed_cells.update(self.__ant_cells)
+        ants = {cell_number: Turmite(ant_number) for ant_number, cell_number in enumerate(self.__ant_cells)}
+        grid = self.get_grid()
+        for cell_number in changed_cells:
+            grid.set_cell(cell_number, ants.get(cell_number, colors[cell_number]))
+        self.__drawn_ant_cells = list(self.__ant_cells)
+        self.__changed_cells = sorted(changed_cells)
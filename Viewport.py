@@ -0,0 +1,129 @@
+class Viewport:
+    """
+    Visible window of a grid drawn in an area of 'width' x 'height' pixels.
+
+    The window starts at a first visible line and column and shows 'zoom' pixels per
+    cell. Zooming keeps the cell under the mouse in place, panning moves the window by
+    pixels (accumulated until they make whole cells), and the window is always kept
+    inside the grid.
+    """
+
+    def __init__(self, lines_count, columns_count, width, height, zoom=1, max_zoom=64):
+        """
+        Args:
+            lines_count (int): Number of lines of the grid
+            columns_count (int): Number of columns of the grid
+            width (int): Width of the drawing area in pixels
+            height (int): Height of the drawing area in pixels
+            zoom (int, optional): Initial number of pixels per cell. Defaults to 1.
+            max_zoom (int, optional): Maximal number of pixels per cell. Defaults to 64.
+        """
+        self.__lines_count = lines_count
+        self.__columns_count = columns_count
+        self.__width = max(1, width)
+        self.__height = max(1, height)
+        self.__max_zoom = max_zoom
+        self.__zoom = min(max(1, int(zoom)), max_zoom)
+        self.__first_line = 0
+        self.__first_column = 0
+        self.__pan_x = 0
+        self.__pan_y = 0
+
+    def get_zoom(self):
+        """Return the number of pixels per cell."""
+        return self.__zoom
+
+    def get_size(self):
+        """Return the (width, height) in pixels of the drawing area."""
+        return self.__width, self.__height
+
+    def get_grid_size(self):
+        """Return the (lines count, columns count) of the grid."""
+        return self.__lines_count, self.__columns_count
+
+    def get_state(self):
+        """Return (first line, first column, zoom), which changes whenever the window does."""
+        return self.__first_line, self.__first_column, self.__zoom
+
+    def get_visible_counts(self):
+        """Return the numbers of (partially) visible lines and columns."""
+        return (min(self.__lines_count, -(-self.__height // self.__zoom)),
+                min(self.__columns_count, -(-self.__width // self.__zoom)))
+
+    def get_bounds(self):
+        """Return (first line, first column, end line, end column) of the visible cells, ends excluded."""
+        visible_lines, visible_columns = self.get_visible_counts()
+        return (self.__first_line, self.__first_column,
+                self.__first_line + visible_lines, self.__first_column + visible_columns)
+
+    def __clamp(self):
+        visible_lines, visible_columns = self.get_visible_counts()
+        self.__first_line = min(max(0, self.__first_line), self.__lines_count - visible_lines)
+        self.__first_column = min(max(0, self.__first_column), self.__columns_count - visible_columns)
+
+    def get_cell_coordinates_at(self, x, y):
+        """
+        Return the (line, column) of the cell at the point (x, y) of the drawing area, or
+        None outside of the grid.
+        """
+        if x < 0 or y < 0:
+            return None
+        line_number = self.__first_line + y // self.__zoom
+        column_number = self.__first_column + x // self.__zoom
+        if line_number < self.__lines_count and column_number < self.__columns_count:
+            return line_number, column_number
+        return None
+
+    def zoom_at(self, x, y, factor):
+        """
+        Multiply the zoom by 'factor', keeping the cell at the point (x, y) in place.
+
+        Returns:
+            bool: True if the window changed.
+        """
+        zoom = min(max(1, int(self.__zoom * factor)), self.__max_zoom)
+        if zoom == self.__zoom:
+            return False
+        state = self.get_state()
+        line_number = self.__first_line + y / self.__zoom
+        column_number = self.__first_column + x / self.__zoom
+        self.__zoom = zoom
+        self.__first_line = round(line_number - y / zoom)
+        self.__first_column = round(column_number - x / zoom)
+        self.__pan_x = self.__pan_y = 0
+        self.__clamp()
+        return self.get_state() != state
+
+    def pan(self, dx, dy):
+        """
+        Move the window by (dx, dy) pixels (positive towards the right and the bottom of
+        the grid). Pixels short of a whole cell are kept for the next move.
+
+        Returns:
+            bool: True if the window changed.
+        """
+        state = self.get_state()
+        self.__pan_x += dx
+        self.__pan_y += dy
+        columns = int(self.__pan_x / self.__zoom)
+        lines = int(self.__pan_y / self.__zoom)
+        self.__pan_x -= columns * self.__zoom
+        self.__pan_y -= lines * self.__zoom
+        self.__first_line += lines
+        self.__first_column += columns
+        self.__clamp()
+        return self.get_state() != state
+
+    def center_on(self, line_number, column_number):
+        """
+        Move the window so that the cell (line_number, column_number) is at its center.
+
+        Returns:
+            bool: True if the window changed.
+        """
+        state = self.get_state()
+        visible_lines, visible_columns = self.get_visible_counts()
+        self.__first_line = line_number - visible_lines // 2
+        self.__first_column = column_number - visible_columns // 2
+        self.__clamp()
+        return self.get_state() != state
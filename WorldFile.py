@@ -0,0 +1,267 @@
+from array import array
+import json
+import mmap
+import re
+import struct
+import sys
+
+from Human import Human
+from PopulationPlanet import PopulationPlanet
+
+
+class WorldFile:
+    """
+    Versioned binary snapshot of a world of Humans (a PopulationPlanet), read through a
+    memory map.
+
+    Layout (little-endian), each section starting on a multiple of 8 bytes:
+    - header: magic, version, width of the ages (1, 2, 4 or 8 bytes), numbers of lines
+      and columns, number of live cells, step count, length of the ground value
+    - ground value, as JSON
+    - alive mask: 1 bit per cell, in cell order, lowest bit first
+    - rank index: number of live cells before each block of RANK_BLOCK cells (8 bytes
+      each), so the age of one cell is found without counting from the start
+    - ages of the live cells only, in cell order, on the width of the header
+
+    Opening a file only maps it: a cell, a line or a range of cells is read on demand
+    from the pages it needs, so huge worlds can be inspected without loading them.
+
+    Class Attributes:
+        MAGIC (bytes): First bytes of the files
+        VERSION (int): Version of the format written
+        RANK_BLOCK (int): Number of cells per entry of the rank index (multiple of 8)
+    """
+    MAGIC = b'PLNT'
+    VERSION = 1
+    RANK_BLOCK = 4096
+    __HEADER = struct.Struct('<4sHBxIIQqI')
+    __CHUNK = 1 << 20
+    __LIVE = re.compile(b'\x01')
+    # 8 bytes of alive flags (0/1) of each byte of the mask
+    __UNPACKED = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+    def __init__(self, path):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): Path of the file
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__map) < self.__HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a world file")
+        (magic, version, self.__age_width, self.__lines_count, self.__columns_count, self.__live_count,
+         self.__step_count, ground_size) = self.__HEADER.unpack_from(self.__map)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a world file of version {self.VERSION}")
+        self.__ground = json.loads(self.__map[self.__HEADER.size:self.__HEADER.size + ground_size])
+        cells_count = self.__lines_count * self.__columns_count
+        self.__alive_offset = self.__align(self.__HEADER.size + ground_size)
+        self.__rank_offset = self.__alive_offset + self.__align(-(-cells_count // 8))
+        self.__ages_offset = self.__rank_offset + 8 * -(-cells_count // self.RANK_BLOCK)
+
+    @staticmethod
+    def __align(size):
+        return -(-size // 8) * 8
+
+    @staticmethod
+    def __get_typecode(width):
+        """Return the array typecode of unsigned integers of 'width' bytes."""
+        return next(typecode for typecode in 'BHILQ' if array(typecode).itemsize == width)
+
+    @staticmethod
+    def __pack(alive):
+        """Pack alive flags (bytes of 0/1, length multiple of 8) into 1 bit per cell, lowest bit first."""
+        size = len(alive)
+        value = int.from_bytes(alive, 'little')
+        # Gather the flags of 2, then 4, then 8 consecutive bytes into the first byte of their group
+        value = (value | value >> 7) & int.from_bytes(b'\x03\x00' * (size // 2), 'little')
+        value = (value | value >> 14) & int.from_bytes(b'\x0f\x00\x00\x00' * (size // 4), 'little')
+        value = (value | value >> 28) & int.from_bytes(b'\xff\x00\x00\x00\x00\x00\x00\x00' * (size // 8), 'little')
+        return value.to_bytes(size, 'little')[::8]
+
+    @classmethod
+    def __get_alive_ages(cls, planet):
+        """Return the alive flags (bytes-like of 0/1) and the ages of the live cells of a planet."""
+        cells_count = planet.get_lines_count() * planet.get_columns_count()
+        if isinstance(planet, PopulationPlanet):
+            ground, newborn = planet.get_ground(), planet.get_newborn()
+            allowed_ids = {id(ground), id(newborn)}
+            for line in planet.get_grid():
+                # Identities first (at C speed), values only for the lines failing it
+                if not set(map(id, line)) <= allowed_ids and \
+                        any(value is not newborn and value != ground for value in line):
+                    raise ValueError("Only Humans and the ground can be saved in a world file")
+            population = planet.get_population()
+            ages = population.get_ages()
+            return population.get_alive(), [ages[cell_number] for cell_number in population.get_live_cells()]
+        alive = bytearray(cells_count)
+        ages = []
+        for cell_number in range(cells_count):
+            value = planet.get_cell(cell_number)
+            if isinstance(value, Human):
+                alive[cell_number] = 1
+                ages.append(value.get_age())
+            elif value != planet.get_ground():
+                raise ValueError("Only Humans and the ground can be saved in a world file")
+        return alive, ages
+
+    @classmethod
+    def save(cls, path, planet, step_count=0):
+        """
+        Write a snapshot of the Humans of a planet.
+
+        Args:
+            path (str): Path of the file
+            planet (PlanetAlpha): Planet holding only Humans and its ground (a
+                PopulationPlanet is saved from its arrays)
+            step_count (int, optional): Step count of the simulation. Defaults to 0.
+
+        Raises:
+            ValueError: If the planet holds other values, negative ages, or a ground
+                which is not JSON serializable.
+        """
+        alive, ages = cls.__get_alive_ages(planet)
+        cells_count = len(alive)
+        max_age = max(ages, default=0)
+        if ages and min(ages) < 0:
+            raise ValueError("Negative ages cannot be saved in a world file")
+        age_width = next(width for width in (1, 2, 4, 8) if max_age < 1 << 8 * width)
+        ground = json.dumps(planet.get_ground()).encode()
+        with open(path, 'wb') as file:
+            file.write(cls.__HEADER.pack(cls.MAGIC, cls.VERSION, age_width, planet.get_lines_count(),
+                                         planet.get_columns_count(), len(ages), step_count, len(ground)))
+            file.write(ground)
+            file.write(bytes(cls.__align(file.tell()) - file.tell()))
+            mask_size = 0
+            for start in range(0, cells_count, cls.__CHUNK):
+                chunk = bytes(alive[start:start + cls.__CHUNK])
+                chunk += bytes(-len(chunk) % 8)
+                packed = cls.__pack(chunk)
+                file.write(packed)
+                mask_size += len(packed)
+            file.write(bytes(cls.__align(mask_size) - mask_size))
+            ranks = array('Q')
+            rank = 0
+            for start in range(0, cells_count, cls.RANK_BLOCK):
+                ranks.append(rank)
+                rank += alive.count(1, start, start + cls.RANK_BLOCK)
+            ages = array(cls.__get_typecode(age_width), ages)
+            if sys.byteorder == 'big':
+                ranks.byteswap()
+                ages.byteswap()
+            file.write(ranks.tobytes())
+            file.write(ages.tobytes())
+
+    def close(self):
+        """Unmap the file."""
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def get_lines_count(self):
+        """Return the number of lines of the world."""
+        return self.__lines_count
+
+    def get_columns_count(self):
+        """Return the number of columns of the world."""
+        return self.__columns_count
+
+    def get_ground(self):
+        """Return the ground value of the world."""
+        return self.__ground
+
+    def get_step_count(self):
+        """Return the step count saved with the world."""
+        return self.__step_count
+
+    def get_live_count(self):
+        """Return the number of live cells."""
+        return self.__live_count
+
+    def is_alive(self, cell_number):
+        """Test if a Human lives in a cell (reads one byte)."""
+        return (self.__map[self.__alive_offset + cell_number // 8] >> cell_number % 8) & 1 == 1
+
+    def get_age(self, cell_number):
+        """Return the age of the Human of a cell, or None if the cell is dead (reads at most a block of the mask)."""
+        if not self.is_alive(cell_number):
+            return None
+        block_start = cell_number // self.RANK_BLOCK * self.RANK_BLOCK
+        rank_offset = self.__rank_offset + 8 * (block_start // self.RANK_BLOCK)
+        rank = int.from_bytes(self.__map[rank_offset:rank_offset + 8], 'little')
+        mask_start, mask_end = self.__alive_offset + block_start // 8, self.__alive_offset + cell_number // 8
+        rank += int.from_bytes(self.__map[mask_start:mask_end], 'little').bit_count()
+        rank += (self.__map[mask_end] & ((1 << cell_number % 8) - 1)).bit_count()
+        offset = self.__ages_offset + rank * self.__age_width
+        return int.from_bytes(self.__map[offset:offset + self.__age_width], 'little')
+
+    def get_alive(self, start, end):
+        """
+        Return the alive flags of the cells start to end (excluded), reading only their
+        part of the mask.
+
+        Returns:
+            bytes: 1 byte per cell, 1 alive, 0 dead.
+        """
+        end = min(end, self.__lines_count * self.__columns_count)
+        if start >= end:
+            return b''
+        first_byte = start // 8
+        packed = self.__map[self.__alive_offset + first_byte:self.__alive_offset + -(-end // 8)]
+        unpacked = b''.join(map(self.__UNPACKED.__getitem__, packed))
+        return unpacked[start - 8 * first_byte:end - 8 * first_byte]
+
+    def get_alive_line(self, line_number):
+        """Return the alive flags of one line (see 'get_alive')."""
+        start = line_number * self.__columns_count
+        return self.get_alive(start, start + self.__columns_count)
+
+    def load_into(self, planet):
+        """
+        Give birth to the saved Humans, with their ages, on a planet of the same shape.
+
+        Args:
+            planet (PlanetAlpha): Planet whose cells of the saved Humans are free
+                (e.g. a new one, see 'to_planet')
+
+        Raises:
+            ValueError: If the shape of the planet differs.
+        """
+        if (planet.get_lines_count(), planet.get_columns_count()) != (self.__lines_count, self.__columns_count):
+            raise ValueError(f"The planet is not {self.__lines_count} x {self.__columns_count}")
+        cells_count = self.__lines_count * self.__columns_count
+        ages = array(self.__get_typecode(self.__age_width))
+        ages.frombytes(self.__map[self.__ages_offset:self.__ages_offset + self.__live_count * self.__age_width])
+        if sys.byteorder == 'big':
+            ages.byteswap()
+        population = planet.get_population() if isinstance(planet, PopulationPlanet) else None
+        rank = 0
+        for start in range(0, cells_count, self.__CHUNK):
+            for match in self.__LIVE.finditer(self.get_alive(start, start + self.__CHUNK)):
+                cell_number = start + match.start()
+                if population is not None:
+                    # Shared newborn, then the age in the arrays: no Human allocated per cell
+                    planet.born(cell_number, planet.get_newborn())
+                    population.set_age(cell_number, ages[rank])
+                else:
+                    human = Human(['Conway'], 'Being', 'XX', 'Hello')
+                    human.set_age(ages[rank])
+                    planet.born(cell_number, human)
+                rank += 1
+
+    def to_planet(self, name="Conway's Game of Life"):
+        """Return a new PopulationPlanet holding the saved world."""
+        planet = PopulationPlanet(name, self.__lines_count, self.__columns_count, self.__ground)
+        self.load_into(planet)
+        return planet
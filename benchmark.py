@@ -0,0 +1,318 @@
+"""
+Benchmark suite of the hot paths of Grid, PlanetAlpha, Conway, SnakeGame, Turmites and MyApp.
+
+Every case uses fixed seeds and is run on several grid sizes. Results are saved as a
+JSON baseline, and the compare mode flags the cases slower than the baseline by more
+than a threshold (exit code 1 when there is at least one regression).
+
+Examples:
+    python benchmark.py run --output baseline.json
+    python benchmark.py run --sizes 64 256 --filter conway
+    python benchmark.py compare baseline.json --threshold 0.10
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from Conway import Conway
+from Grid import Grid
+from GridSnapshot import GridSnapshot
+from Human import Human
+from PlanetAlpha import PlanetAlpha
+from SnakeGame import SnakeGame
+from Turmites import Turmites
+from headless import SnakeController
+
+
+class StandInCanvas:
+    """Offscreen stand-in of tk.Canvas counting the drawing calls, for MyApp.draw_grid."""
+
+    def __init__(self):
+        self.calls_count = 0
+        self.__items_count = 0
+
+    def __create(self, *args, **kw):
+        self.calls_count += 1
+        self.__items_count += 1
+        return self.__items_count
+
+    create_rectangle = create_text = create_image = __create
+
+    def __call(self, *args, **kw):
+        self.calls_count += 1
+
+    delete = itemconfig = itemconfigure = coords = __call
+
+    def winfo_width(self):
+        return 0
+
+    def winfo_height(self):
+        return 0
+
+    def winfo_rgb(self, color):
+        return 0xffff, 0xffff, 0xffff
+
+
+class StandInPhotoImage:
+    """Offscreen stand-in of tk.PhotoImage for the bitmap drawing of MyApp."""
+
+    def __init__(self, master=None, width=0, height=0):
+        self.tk = self
+        self.data_size = 0
+
+    def configure(self, data=b'', **kw):
+        self.data_size = len(data)
+
+    def call(self, *args):
+        pass
+
+
+class StandInVariable:
+    """Stand-in of tk.BooleanVar."""
+
+    def __init__(self, value):
+        self.__value = value
+
+    def get(self):
+        return self.__value
+
+
+class Benchmark:
+    """
+    Registry and runner of the benchmark cases.
+
+    A case is a name and the callable to time, built lazily by one generator per family
+    of cases. The callable is run until 'min_time' seconds are spent or 'max_repeats'
+    runs are done, and its best time is kept. A case changing its world may add a third
+    item, a setup called before each run and not timed, which restores the start state:
+    every run then times the same work.
+    """
+    SIZES = (64, 256, 1024)
+    DENSITIES = (0.05, 0.2, 0.5)
+    SEED = 2025
+    CONWAY_WARMUP_STEPS = 2
+
+    def __init__(self, sizes=SIZES, min_time=0.2, max_repeats=20):
+        self.__sizes = sizes
+        self.__min_time = min_time
+        self.__max_repeats = max_repeats
+
+    @staticmethod
+    def __random_grid(size, generator):
+        return Grid([[generator.randint(0, 1) for _ in range(size)] for _ in range(size)])
+
+    @staticmethod
+    def __populated_conway(size, density, engine='cells'):
+        conway = Conway(size, size, engine=engine, seed=Benchmark.SEED)
+        grid = conway.get_grid()
+        for cell_number in conway.get_random().sample(range(size * size), int(density * size * size)):
+            grid.born(cell_number, grid.get_newborn())
+        return conway
+
+    def __grid_cases(self, size):
+        generator = random.Random(self.SEED)
+        grid = self.__random_grid(size, generator)
+        cells = [generator.randrange(size * size) for _ in range(1000)]
+        yield f'grid.get_same_value_cell_numbers[{size}]', lambda: grid.get_same_value_cell_numbers(1)
+        yield (f'grid.get_cell_neighborhood_numbers[{size}]',
+               lambda: [grid.get_cell_neighborhood_numbers(cell, PlanetAlpha.WIND_ROSE) for cell in cells])
+        yield f'grid.get_grid_str[{size}]', grid.get_grid_str
+
+    def __planet_cases(self, size):
+        generator = random.Random(self.SEED)
+        planet = PlanetAlpha('benchmark', size, size, 0)
+        for cell_number in generator.sample(range(size * size), size * size // 2):
+            planet.born(cell_number, Human(['Bench'], 'Mark', 'XX', 'Hello'))
+        yield f'planet.get_random_free_place[{size}]', planet.get_random_free_place
+
+        cells = [generator.randrange(size * size) for _ in range(1000)]
+        element = Human(['Bench'], 'Mark', 'XX', 'Hello')
+
+        def born_die():
+            for cell_number in cells:
+                if planet.die(cell_number):
+                    planet.born(cell_number, element)
+                else:
+                    planet.born(cell_number, element)
+                    planet.die(cell_number)
+        yield f'planet.born_die[{size}]', born_die
+
+    def __conway_cases(self, size):
+        for engine in Conway.ENGINES:
+            for density in self.DENSITIES:
+                state = {}
+
+                def setup(state=state, density=density, engine=engine):
+                    state['conway'] = self.__populated_conway(size, density, engine)
+                    # Untimed warm-up: the first steps pay for the one-time setup of the engine
+                    for _ in range(self.CONWAY_WARMUP_STEPS):
+                        state['conway'].step()
+
+                def conway_steps(state=state):
+                    for _ in range(10):
+                        state['conway'].step()
+                yield f'conway.step_x10[{size},{density},{engine}]', conway_steps, setup
+
+    def __snake_cases(self, size):
+        state = {}
+
+        def new_game():
+            state['game'] = SnakeGame(size, size, seed=self.SEED)
+            state['controller'] = SnakeController(state['game'], size, size, 'auto')
+            state['game'].toggle_running()
+
+        def snake_steps():
+            for _ in range(100):
+                state['controller'].control()
+                if not state['game'].step():
+                    new_game()
+        yield f'snake.step_x100[{size}]', snake_steps, new_game
+
+    def __turmites_cases(self, size):
+        for rule, ants_count in (('langton', 1), ('fibonacci', 8)):
+            state = {}
+
+            def setup(state=state, rule=rule, ants_count=ants_count):
+                state['turmites'] = Turmites(size, size, rule, ants_count, seed=self.SEED)
+            yield (f'turmites.step_x10000[{size},{rule},{ants_count}]',
+                   lambda state=state: state['turmites'].step(10000), setup)
+
+    def __draw_cases(self, size):
+        try:
+            from MyApp import MyApp
+        except ImportError:
+            return
+        conway = self.__populated_conway(size, 0.2)
+        app = MyApp.__new__(MyApp)
+        app.grid = conway.get_grid()
+        app.cell_size, app.gutter_size, app.margin_size = 4, 0, 10
+        app.show_age = StandInVariable(True)
+        app.c_draw = StandInCanvas()
+        app.PHOTO_IMAGE_CLASS = StandInPhotoImage
+        app.conway_snapshot = first_snapshot = GridSnapshot(conway.get_grid())
+        yield f'myapp.draw_grid[{size}]', lambda: MyApp.draw_grid(app, True)
+
+        # Frame after a step: only the changed cells (recorded as by SimulationWorker) and the
+        # ages are redrawn
+        conway.step()
+        snapshot = GridSnapshot(conway.get_grid(), 1)
+        snapshot.set_changes(first_snapshot, [cell_number for cell_number, _ in conway.get_last_changes()])
+
+        def update_conway_grid():
+            app.conway_snapshot = first_snapshot
+            MyApp.update_conway_grid(app, snapshot)
+        yield f'myapp.update_conway_grid[{size}]', update_conway_grid
+
+    def get_cases(self):
+        """Yield the (name, callable) or (name, callable, setup) cases, building each one lazily."""
+        for size in self.__sizes:
+            yield from self.__grid_cases(size)
+            yield from self.__planet_cases(size)
+            yield from self.__conway_cases(size)
+            yield from self.__snake_cases(size)
+            yield from self.__turmites_cases(size)
+            yield from self.__draw_cases(size)
+
+    def time_case(self, function, setup=None):
+        """
+        Return the min and median seconds per call and the number of calls.
+
+        Args:
+            function (callable): Timed call
+            setup (callable, optional): Untimed call run before each timed call.
+                Defaults to None.
+        """
+        timings = []
+        total = 0.0
+        while total < self.__min_time and len(timings) < self.__max_repeats:
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            timings.append(elapsed)
+            total += elapsed
+        return {'seconds': min(timings), 'median': statistics.median(timings), 'repeats': len(timings)}
+
+    def run(self, name_filter='', log=None):
+        """
+        Run the cases whose name contains 'name_filter'.
+
+        Returns:
+            dict: Baseline with the environment and the timings by case name.
+        """
+        results = {}
+        for name, function, *setup in self.get_cases():
+            if name_filter not in name:
+                continue
+            results[name] = self.time_case(function, *setup)
+            if log is not None:
+                log.write(f"{name:<55} {results[name]['seconds'] * 1e3:12.3f} ms\n")
+                log.flush()
+        return {'version': 1,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'sizes': list(self.__sizes),
+                'results': results}
+
+    @staticmethod
+    def compare(baseline, current, threshold=0.10):
+        """
+        Compare two baselines case by case (best times).
+
+        Returns:
+            list: (name, baseline seconds, current seconds, ratio, is_regression) for the
+                cases present in both, where a regression is a ratio above 1 + threshold.
+        """
+        rows = []
+        for name, result in current['results'].items():
+            if name not in baseline['results']:
+                continue
+            before, after = baseline['results'][name]['seconds'], result['seconds']
+            ratio = after / before if before else float('inf')
+            rows.append((name, before, after, ratio, ratio > 1 + threshold))
+        return rows
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths and compare with a baseline.")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    for mode in ('run', 'compare'):
+        subparser = subparsers.add_parser(mode)
+        if mode == 'compare':
+            subparser.add_argument('baseline', help="JSON baseline to compare with")
+            subparser.add_argument('--threshold', type=float, default=0.10,
+                                   help="relative slowdown flagged as a regression")
+        subparser.add_argument('--sizes', type=int, nargs='+', default=list(Benchmark.SIZES))
+        subparser.add_argument('--filter', default='', help="only run the cases containing this text")
+        subparser.add_argument('--min-time', type=float, default=0.2, help="seconds spent per case")
+        subparser.add_argument('--output', default=None, help="file receiving the JSON results")
+    options = parser.parse_args(arguments)
+
+    benchmark = Benchmark(tuple(options.sizes), options.min_time)
+    current = benchmark.run(options.filter, sys.stderr)
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(current, output, indent=2)
+    if options.mode == 'run':
+        if not options.output:
+            json.dump(current, sys.stdout, indent=2)
+        return 0
+
+    with open(options.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions_count = 0
+    for name, before, after, ratio, is_regression in Benchmark.compare(baseline, current, options.threshold):
+        regressions_count += is_regression
+        print(f"{'REGRESSION' if is_regression else 'ok':<10} {name:<55} "
+              f"{before * 1e3:10.3f} -> {after * 1e3:10.3f} ms  x{ratio:.2f}")
+    print(f"{regressions_count} regression(s) above {options.threshold:.0%}")
+    return 1 if regressions_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
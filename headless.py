@@ -0,0 +1,391 @@
+"""
+Headless batch runner for Conway, Snake and Turmites, and for ensembles of Conway runs
+sweeping their parameters over a process pool, for servers without display.
+
+Runs the simulation as fast as possible and writes population statistics as JSON lines
+(one object per report, then a final one with the generations per second).
+
+Examples:
+    python headless.py conway --lines 1000 --columns 1000 --density 0.1 --generations 500 --seed 1 --engine array
+    python headless.py snake --lines 40 --columns 40 --generations 10000 --controller auto --seed 1
+    python headless.py snake --controller script --moves "RRRDDDLLLUUU"
+    python headless.py conway --load glider.rle --lines 100 --columns 100 --save world.plnt
+    python headless.py conway --load world.plnt --generations 1000 --save world.rle
+    python headless.py conway --lines 500 --columns 500 --generations 5000 --record run.rec --keyframe-every 200
+    python headless.py ensemble --sizes 100 200 --densities 0.1 0.3 --life-expectancies 30 50 --repeats 8 --generations 500 --processes 4 --memory-budget 512 --results sweep.ens
+    python headless.py turmites --lines 1000 --columns 1000 --generations 20000000 --rule langton --report-every 1000000
+
+This module must not import tkinter (directly or through MyApp).
+"""
+import argparse
+import json
+import sys
+import time
+
+from Conway import Conway
+from Ensemble import Ensemble
+from EnsembleResults import EnsembleResults
+from Human import Human
+from Recording import RecordingWriter
+from RlePattern import RlePattern
+from SnakeGame import SnakeGame
+from Turmites import Turmites
+from WorldFile import WorldFile
+
+
+class SnakeController:
+    """
+    Controller driving a SnakeGame without keyboard.
+
+    Modes:
+    - 'auto': greedy move towards the food, avoiding walls and the body when possible
+    - 'script': directions read from a string of U/D/L/R letters, one per step (any
+      other character keeps the current direction), repeated when exhausted
+    """
+    MOVES = {'U': 'Up', 'D': 'Down', 'L': 'Left', 'R': 'Right'}
+
+    def __init__(self, snake_game, lines_count, columns_count, mode='auto', moves=''):
+        self.__snake_game = snake_game
+        self.__lines_count = lines_count
+        self.__columns_count = columns_count
+        self.__mode = mode
+        self.__moves = moves
+        self.__move_index = 0
+
+    def __is_safe(self, cell_number, direction, body):
+        """Test if moving from 'cell_number' in 'direction' neither hits a wall nor the body."""
+        dx, dy = SnakeGame.DIRECTIONS[direction]
+        column_number = cell_number % self.__columns_count + dx
+        line_number = cell_number // self.__columns_count + dy
+        return (0 <= column_number < self.__columns_count and 0 <= line_number < self.__lines_count
+                and line_number * self.__columns_count + column_number not in body)
+
+    def __auto_direction(self):
+        """Choose the safe direction getting closest to the food."""
+        segments = self.__snake_game.get_snake_segments()
+        head, body = segments[0], set(segments[:-1])
+        food = self.__snake_game.get_food_position()
+        food_line, food_column = divmod(food, self.__columns_count) if food is not None else divmod(head, self.__columns_count)
+        best_direction, best_distance = self.__snake_game.get_direction(), None
+        for direction, (dx, dy) in SnakeGame.DIRECTIONS.items():
+            if not self.__is_safe(head, direction, body):
+                continue
+            line_number, column_number = divmod(head, self.__columns_count)
+            distance = abs(line_number + dy - food_line) + abs(column_number + dx - food_column)
+            if best_distance is None or distance < best_distance:
+                best_direction, best_distance = direction, distance
+        return best_direction
+
+    def control(self):
+        """Set the direction of the snake for the next step."""
+        if self.__mode == 'auto':
+            direction = self.__auto_direction()
+        elif self.__moves:
+            direction = self.MOVES.get(self.__moves[self.__move_index % len(self.__moves)].upper())
+            self.__move_index += 1
+        else:
+            direction = None
+        if direction is not None:
+            self.__snake_game.set_direction(direction)
+
+
+class HeadlessRunner:
+    """Run a simulation without display and report statistics as JSON lines."""
+
+    def __init__(self, output, report_every=0, record_path=None, keyframe_interval=100):
+        """
+        Args:
+            output: Text stream receiving the JSON lines
+            report_every (int, optional): Period of the periodic reports in steps,
+                0 for the final report only. Defaults to 0.
+            record_path (str, optional): File recording every step of the runs (see
+                RecordingWriter). Defaults to None (no recording).
+            keyframe_interval (int, optional): Number of steps between two keyframes of
+                the recording. Defaults to 100.
+        """
+        self.__output = output
+        self.__report_every = report_every
+        self.__record_path = record_path
+        self.__keyframe_interval = keyframe_interval
+
+    def open_recorder(self, planet, game_class, generation=0):
+        """Return a RecordingWriter of a run, or None if the runs are not recorded."""
+        if self.__record_path is None:
+            return None
+        return RecordingWriter(self.__record_path, planet, game_class, self.__keyframe_interval, generation)
+
+    def report(self, record):
+        """Write one JSON line."""
+        self.__output.write(json.dumps(record) + '\n')
+        self.__output.flush()
+
+    @staticmethod
+    def get_conway_stats(conway):
+        """Return the population statistics of a Conway simulation."""
+        population = conway.get_grid().get_population()
+        count = population.get_count()
+        return {'generation': conway.get_step_count(),
+                'population': count,
+                'mean_age': sum(population.get_ages()) / count if count else 0.0}
+
+    @staticmethod
+    def load_conway(path, lines_count, columns_count, engine='array', seed=None, is_tore=False):
+        """
+        Create a Conway simulation from a file: a .rle pattern centered on a grid of
+        'lines_count' x 'columns_count', or a WorldFile snapshot (whose shape, ages and
+        step count are restored).
+
+        Raises:
+            ValueError: If the pattern does not fit in the grid, or the file is invalid.
+        """
+        if path.lower().endswith('.rle'):
+            pattern_lines, pattern_columns, cells = RlePattern.load(path)
+            if pattern_lines > lines_count or pattern_columns > columns_count:
+                raise ValueError(f"The {pattern_columns} x {pattern_lines} pattern does not fit in the grid")
+            conway = Conway(lines_count, columns_count, engine=engine, seed=seed, is_tore=is_tore)
+            grid = conway.get_grid()
+            first_line, first_column = (lines_count - pattern_lines) // 2, (columns_count - pattern_columns) // 2
+            for line_number, column_number in cells:
+                grid.born(grid.get_cell_number_from_coordinates(first_line + line_number, first_column + column_number),
+                          grid.get_newborn())
+            return conway
+        with WorldFile(path) as world_file:
+            conway = Conway(world_file.get_lines_count(), world_file.get_columns_count(), engine=engine, seed=seed,
+                            is_tore=is_tore)
+            world_file.load_into(conway.get_grid())
+            conway.set_step_count(world_file.get_step_count())
+        return conway
+
+    @staticmethod
+    def save_conway(path, conway):
+        """Save a Conway simulation as a .rle pattern (alive cells only) or a WorldFile snapshot."""
+        if path.lower().endswith('.rle'):
+            RlePattern.save(path, conway.get_grid())
+        else:
+            WorldFile.save(path, conway.get_grid(), conway.get_step_count())
+
+    def run_conway(self, lines_count, columns_count, generations, density=0.1, seed=None, engine='array',
+                   stop_on_cycle=False, is_tore=False, load_path=None, save_path=None):
+        """
+        Run a Conway simulation from a random seed population, or from the file
+        'load_path' (see 'load_conway'), stopping early when the world becomes periodic
+        if 'stop_on_cycle' is set. The grid is a torus if 'is_tore' is set. The final
+        world is saved to 'save_path' if given (see 'save_conway').
+
+        Returns:
+            dict: Final report
+        """
+        if load_path is not None:
+            conway = self.load_conway(load_path, lines_count, columns_count, engine, seed, is_tore)
+            grid = conway.get_grid()
+            lines_count, columns_count = grid.get_lines_count(), grid.get_columns_count()
+        else:
+            conway = Conway(lines_count, columns_count, engine=engine, seed=seed, is_tore=is_tore)
+            grid = conway.get_grid()
+            conway.populate(density)
+        self.report({'event': 'start', 'game': 'conway', 'lines': lines_count, 'columns': columns_count,
+                     'density': density, 'seed': seed, 'engine': engine, 'tore': is_tore, 'load': load_path,
+                     'life_expectancy': Human.LIFE_EXPECTANCY, **self.get_conway_stats(conway)})
+        first_generation = conway.get_step_count()
+        recorder = self.open_recorder(grid, Conway, first_generation)
+
+        start = period_start = time.perf_counter()
+        cycle = None
+        for generation in range(first_generation + 1, first_generation + generations + 1):
+            conway.step()
+            if recorder is not None:
+                recorder.record()
+            cycle = conway.get_cycle()
+            if stop_on_cycle and cycle is not None:
+                break
+            if self.__report_every and generation % self.__report_every == 0:
+                now = time.perf_counter()
+                self.report({'event': 'report', **self.get_conway_stats(conway),
+                             'generations_per_second': self.__report_every / (now - period_start)})
+                period_start = time.perf_counter()
+        elapsed = time.perf_counter() - start
+        if recorder is not None:
+            recorder.close()
+        final = {'event': 'final', **self.get_conway_stats(conway), 'elapsed': elapsed,
+                 'generations_per_second': (conway.get_step_count() - first_generation) / elapsed if elapsed else None,
+                 'cycle_period': cycle[0] if cycle else None,
+                 'cycle_start': cycle[1] if cycle else None}
+        if save_path is not None:
+            self.save_conway(save_path, conway)
+        self.report(final)
+        return final
+
+    @staticmethod
+    def get_snake_stats(snake_game, step_count):
+        """Return the statistics of a Snake game."""
+        return {'step': step_count,
+                'score': snake_game.get_score(),
+                'length': len(snake_game.get_snake_segments()),
+                'game_over': snake_game.is_game_over(),
+                'won': snake_game.is_won()}
+
+    def run_snake(self, lines_count, columns_count, steps, seed=None, controller='auto', moves=''):
+        """
+        Run a Snake game driven by a SnakeController until 'steps' steps or game over.
+
+        Returns:
+            dict: Final report
+        """
+        snake_game = SnakeGame(lines_count, columns_count, seed=seed)
+        snake_controller = SnakeController(snake_game, lines_count, columns_count, controller, moves)
+        snake_game.toggle_running()
+        self.report({'event': 'start', 'game': 'snake', 'lines': lines_count, 'columns': columns_count,
+                     'seed': seed, 'controller': controller, **self.get_snake_stats(snake_game, 0)})
+
+        recorder = self.open_recorder(snake_game.get_grid(), SnakeGame)
+        step_count = 0
+        start = period_start = time.perf_counter()
+        while step_count < steps:
+            snake_controller.control()
+            moved = snake_game.step()
+            step_count += 1
+            if recorder is not None:
+                recorder.record(snake_game.get_changed_cells())
+            if not moved:
+                break
+            if self.__report_every and step_count % self.__report_every == 0:
+                now = time.perf_counter()
+                self.report({'event': 'report', **self.get_snake_stats(snake_game, step_count),
+                             'steps_per_second': self.__report_every / (now - period_start)})
+                period_start = time.perf_counter()
+        elapsed = time.perf_counter() - start
+        if recorder is not None:
+            recorder.close()
+        final = {'event': 'final', **self.get_snake_stats(snake_game, step_count), 'elapsed': elapsed,
+                 'steps_per_second': step_count / elapsed if elapsed else None}
+        self.report(final)
+        return final
+
+    @staticmethod
+    def get_turmites_stats(turmites):
+        """Return the statistics of a Turmites run."""
+        return {'step': turmites.get_step_count(),
+                'colored': turmites.get_colored_count(),
+                'ants': turmites.get_ants()}
+
+    def run_turmites(self, lines_count, columns_count, steps, rule='langton', ants_count=1, seed=None, is_tore=True):
+        """
+        Run Turmites for 'steps' steps, in batches of 'report_every' steps (a single
+        batch without periodic reports).
+
+        Returns:
+            dict: Final report
+        """
+        turmites = Turmites(lines_count, columns_count, rule, ants_count, seed, is_tore)
+        self.report({'event': 'start', 'game': 'turmites', 'lines': lines_count, 'columns': columns_count,
+                     'rule': turmites.get_rule(), 'seed': seed, 'tore': is_tore, **self.get_turmites_stats(turmites)})
+        batch_size = self.__report_every or steps
+        start = time.perf_counter()
+        while turmites.get_step_count() < steps:
+            period_start = time.perf_counter()
+            batch_steps = min(batch_size, steps - turmites.get_step_count())
+            turmites.step(batch_steps)
+            if self.__report_every and turmites.get_step_count() < steps:
+                self.report({'event': 'report', **self.get_turmites_stats(turmites),
+                             'steps_per_second': batch_steps / (time.perf_counter() - period_start)})
+        elapsed = time.perf_counter() - start
+        final = {'event': 'final', **self.get_turmites_stats(turmites), 'elapsed': elapsed,
+                 'steps_per_second': turmites.get_step_count() / elapsed if elapsed else None}
+        self.report(final)
+        return final
+
+    def run_ensemble(self, ensemble, results_path=None):
+        """
+        Run an Ensemble, reporting the summary of each run (without its curve) as soon as
+        it finishes, then save the summaries and the population curves to the columnar
+        file 'results_path' if given (see EnsembleResults).
+
+        Returns:
+            dict: Final report
+        """
+        runs_count = len(ensemble.get_runs())
+        self.report({'event': 'start', 'game': 'ensemble', 'runs': runs_count, **ensemble.get_parameters()})
+        results = EnsembleResults(ensemble.get_parameters())
+        start = time.perf_counter()
+        for summary in ensemble.run():
+            results.add(summary)
+            self.report({'event': 'run', **{key: value for key, value in summary.items() if key != 'population'}})
+        elapsed = time.perf_counter() - start
+        if results_path is not None:
+            results.save(results_path)
+        errors = [error for error in results.get_column('error') if error is not None]
+        final = {'event': 'final', 'runs': results.get_rows_count(), 'failed': len(errors), 'elapsed': elapsed,
+                 'runs_per_second': results.get_rows_count() / elapsed if elapsed else None, 'results': results_path}
+        self.report(final)
+        return final
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Run Conway, Snake, Turmites or an ensemble of Conway runs without "
+                                                 "display, statistics as JSON lines.")
+    parser.add_argument('game', choices=('conway', 'snake', 'turmites', 'ensemble'))
+    parser.add_argument('--lines', type=int, default=40, help="number of lines of the grid")
+    parser.add_argument('--columns', type=int, default=40, help="number of columns of the grid")
+    parser.add_argument('--generations', type=int, default=100, help="number of steps to run")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the random generator")
+    parser.add_argument('--density', type=float, default=0.1, help="Conway: initial proportion of live cells")
+    parser.add_argument('--engine', choices=Conway.ENGINES, default='array', help="Conway: step engine")
+    parser.add_argument('--stop-on-cycle', action='store_true',
+                        help="Conway: stop as soon as the alive/dead state is periodic")
+    parser.add_argument('--tore', action='store_true', help="Conway: opposite edges of the grid are neighbours")
+    parser.add_argument('--load', default=None,
+                        help="Conway: start from a .rle pattern (centered) or a world snapshot file")
+    parser.add_argument('--save', default=None, help="Conway: save the final world as .rle or a world snapshot file")
+    parser.add_argument('--life-expectancy', type=int, default=None, help="Conway: Human.LIFE_EXPECTANCY")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help="ensemble: sizes of the square grids (default: --lines x --columns)")
+    parser.add_argument('--densities', type=float, nargs='+', default=None, help="ensemble: densities (default: --density)")
+    parser.add_argument('--life-expectancies', type=int, nargs='+', default=None,
+                        help="ensemble: values of Human.LIFE_EXPECTANCY (default: --life-expectancy or the current one)")
+    parser.add_argument('--repeats', type=int, default=1, help="ensemble: number of seeds per combination")
+    parser.add_argument('--processes', type=int, default=None, help="ensemble: worker processes (default: one per CPU)")
+    parser.add_argument('--memory-budget', type=int, default=None, help="ensemble: memory of a worker, in MB")
+    parser.add_argument('--results', default=None, help="ensemble: columnar file of the summaries and curves")
+    parser.add_argument('--controller', choices=('auto', 'script'), default='auto', help="Snake: controller")
+    parser.add_argument('--moves', default='', help="Snake: U/D/L/R moves of the 'script' controller")
+    parser.add_argument('--rule', default='langton',
+                        help=f"Turmites: one of {', '.join(Turmites.RULES)} or turns such as RLR or 1100")
+    parser.add_argument('--ants', type=int, default=1, help="Turmites: number of ants")
+    parser.add_argument('--bounded', action='store_true', help="Turmites: the ants stop at the edges instead of wrapping")
+    parser.add_argument('--record', default=None,
+                        help="Conway, Snake: record every step to this file (replay it in MyApp)")
+    parser.add_argument('--keyframe-every', type=int, default=100, help="steps between two keyframes of the record")
+    parser.add_argument('--report-every', type=int, default=0, help="period of the reports, 0 for final only")
+    parser.add_argument('--output', default='-', help="JSON lines output file, '-' for standard output")
+    options = parser.parse_args(arguments)
+
+    output = sys.stdout if options.output == '-' else open(options.output, 'w')
+    try:
+        runner = HeadlessRunner(output, options.report_every, options.record, options.keyframe_every)
+        if options.game == 'conway':
+            if options.life_expectancy is not None:
+                Human.LIFE_EXPECTANCY = options.life_expectancy
+            runner.run_conway(options.lines, options.columns, options.generations,
+                              options.density, options.seed, options.engine, options.stop_on_cycle,
+                              options.tore, options.load, options.save)
+        elif options.game == 'ensemble':
+            life_expectancies = options.life_expectancies or [options.life_expectancy or Human.LIFE_EXPECTANCY]
+            ensemble = Ensemble(options.sizes or [(options.lines, options.columns)],
+                                options.densities or [options.density], life_expectancies, options.repeats,
+                                options.generations, options.seed or 0, options.engine, options.tore,
+                                options.stop_on_cycle, options.processes,
+                                options.memory_budget * 2 ** 20 if options.memory_budget else None)
+            runner.run_ensemble(ensemble, options.results)
+        elif options.game == 'snake':
+            runner.run_snake(options.lines, options.columns, options.generations,
+                             options.seed, options.controller, options.moves)
+        else:
+            runner.run_turmites(options.lines, options.columns, options.generations, options.rule, options.ants,
+                                options.seed, not options.bounded)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
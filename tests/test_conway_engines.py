@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from Conway import Conway
+from Hashlife import Hashlife
+from Human import Human
+from ParallelConway import ParallelConway
+from PlanetAlpha import PlanetAlpha
+
+
+def run(engine, is_tore, lines_count=32, columns_count=32, generations=40):
+    """Alive states, ages and changes of every generation of a seeded run."""
+    conway = Conway(lines_count, columns_count, engine=engine, seed=7, is_tore=is_tore)
+    conway.populate(0.35)
+    population = conway.get_grid().get_population()
+    history = [(bytes(population.get_alive()), list(population.get_ages()))]
+    for _ in range(generations):
+        conway.step()
+        history.append((bytes(population.get_alive()), list(population.get_ages()),
+                        sorted(cell_number for cell_number, _ in conway.get_last_changes())))
+    return history
+
+
+@pytest.mark.parametrize('is_tore', [True, False], ids=['tore', 'bounded'])
+@pytest.mark.parametrize('life_expectancy', [Human.LIFE_EXPECTANCY, 5])
+def test_engines_are_identical(monkeypatch, is_tore, life_expectancy):
+    monkeypatch.setattr(Human, 'LIFE_EXPECTANCY', life_expectancy)
+    reference = run('cells', is_tore)
+    for engine in Conway.ENGINES[1:]:
+        assert run(engine, is_tore) == reference, engine
+
+
+def test_engines_are_identical_on_a_rectangle():
+    reference = run('cells', True, 17, 45, 25)
+    for engine in Conway.ENGINES[1:]:
+        assert run(engine, True, 17, 45, 25) == reference, engine
+
+
+def live_cells(planet):
+    return {planet.get_coordinates_from_cell_number(cell_number)
+            for cell_number in range(planet.get_lines_count() * planet.get_columns_count())
+            if isinstance(planet.get_cell(cell_number), Human)}
+
+
+def reference_step(cells):
+    """One generation of B3/S23 on an unbounded plane."""
+    counts = {}
+    for line_number, column_number in cells:
+        for delta_line in (-1, 0, 1):
+            for delta_column in (-1, 0, 1):
+                if delta_line or delta_column:
+                    neighbour = (line_number + delta_line, column_number + delta_column)
+                    counts[neighbour] = counts.get(neighbour, 0) + 1
+    return {cell for cell, count in counts.items() if count == 3 or count == 2 and cell in cells}
+
+
+@pytest.mark.parametrize('memory_limit', [10 ** 9, 10 ** 4])
+def test_hashlife_matches_the_rules(memory_limit):
+    generator = random.Random(3)
+    planet = PlanetAlpha('Start', 12, 9, 0)
+    for cell_number in range(12 * 9):
+        if generator.random() < 0.35:
+            planet.born(cell_number, Human(['Conway'], 'Being', 'XX', 'Hello'))
+    cells = live_cells(planet)
+    hashlife = Hashlife(memory_limit=memory_limit)
+    hashlife.import_planet(planet)
+    for generations in (1, 2, 3, 5, 8, 13, 64):
+        hashlife.advance(generations)
+        for _ in range(generations):
+            cells = reference_step(cells)
+        assert set(hashlife.get_live_cells()) == cells
+
+
+def test_parallel_conway_matches_the_array_engine(monkeypatch):
+    # No natural death within the run: ParallelConway draws the deaths its own way
+    monkeypatch.setattr(Human, 'LIFE_EXPECTANCY', 1000)
+    conway = Conway(30, 20, engine='array', seed=2)
+    conway.populate(0.35)
+    results = []
+    for workers_count in (1, 3):
+        simulation = ParallelConway(30, 20, workers_count)
+        try:
+            simulation.import_planet(conway.get_grid())
+            simulation.step(15)
+            planet = PlanetAlpha('Exported', 30, 20, 0)
+            simulation.export_planet(planet)
+            results.append(live_cells(planet))
+        finally:
+            simulation.close()
+    for _ in range(15):
+        conway.step()
+    assert results[0] == results[1] == live_cells(conway.get_grid())
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from Human import Human
+from ParallelConway import ParallelConway
+from PlanetAlpha import PlanetAlpha
+from PopulationPlanet import PopulationPlanet
+
+LINES_COUNT = 32
+COLUMNS_COUNT = 24
+
+
+def get_ages(planet):
+    """Age of the Human of each cell, None for the free cells."""
+    return [cell.get_age() if isinstance(cell, Human) else None
+            for cell in map(planet.get_cell, range(LINES_COUNT * COLUMNS_COUNT))]
+
+
+@pytest.fixture
+def simulation():
+    generator = random.Random(0)
+    planet = PlanetAlpha("Start", LINES_COUNT, COLUMNS_COUNT, 0)
+    for cell_number in range(LINES_COUNT * COLUMNS_COUNT):
+        if generator.random() < 0.3:
+            planet.born(cell_number, Human(['Conway'], 'Being', 'XX', 'Hello'))
+    simulation = ParallelConway(LINES_COUNT, COLUMNS_COUNT, 1, seed=0)
+    simulation.import_planet(planet)
+    simulation.step(30)
+    yield simulation
+    simulation.close()
+
+
+def test_export_keeps_the_ages(simulation):
+    expected = PlanetAlpha("Expected", LINES_COUNT, COLUMNS_COUNT, 0)
+    simulation.export_planet(expected)
+    expected_ages = get_ages(expected)
+    assert max(age or 0 for age in expected_ages) > 0
+
+    full_planet = PopulationPlanet("Full", LINES_COUNT, COLUMNS_COUNT, 0)
+    for cell_number in range(LINES_COUNT * COLUMNS_COUNT):
+        full_planet.born(cell_number, full_planet.get_newborn())
+    for planet in (PopulationPlanet("Empty", LINES_COUNT, COLUMNS_COUNT, 0), full_planet):
+        simulation.export_planet(planet)
+        assert get_ages(planet) == expected_ages
+
+
+def test_export_then_import_is_identity(simulation):
+    planet = PlanetAlpha("Exported", LINES_COUNT, COLUMNS_COUNT, 0)
+    simulation.export_planet(planet)
+    copy = ParallelConway(LINES_COUNT, COLUMNS_COUNT, 1, seed=0)
+    try:
+        copy.import_planet(planet)
+        assert copy.get_population() == simulation.get_population()
+        again = PlanetAlpha("Again", LINES_COUNT, COLUMNS_COUNT, 0)
+        copy.export_planet(again)
+        assert get_ages(again) == get_ages(planet)
+    finally:
+        copy.close()
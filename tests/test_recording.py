@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from Conway import Conway
+from Recording import Recording, RecordingWriter
+
+GENERATIONS = 120
+
+
+@pytest.mark.parametrize('engine', Conway.ENGINES)
+def test_seek_restores_every_generation(tmp_path, engine):
+    conway = Conway(40, 40, engine=engine, seed=4)
+    conway.populate(0.25)
+    grid = conway.get_grid()
+    population = grid.get_population()
+    path = tmp_path / 'conway.rec'
+    writer = RecordingWriter(path, grid, Conway, 17)
+    expected = [(bytes(population.get_alive()), list(population.get_ages()))]
+    for generation in range(1, GENERATIONS + 1):
+        conway.step()
+        if generation == 50:
+            # Edit between two steps, as a click does
+            grid.die(population.get_live_cells()[0])
+        writer.record()
+        expected.append((bytes(population.get_alive()), list(population.get_ages())))
+    writer.close()
+
+    recording = Recording(path)
+    try:
+        assert (recording.get_first_generation(), recording.get_last_generation()) == (0, GENERATIONS)
+        order = list(range(GENERATIONS + 1)) + random.Random(1).sample(range(GENERATIONS + 1), GENERATIONS + 1)
+        for generation in order:
+            assert recording.seek(generation) == generation
+            replayed = recording.get_grid().get_population()
+            assert (bytes(replayed.get_alive()), list(replayed.get_ages())) == expected[generation]
+    finally:
+        recording.close()
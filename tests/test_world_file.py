@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from Human import Human
+from PlanetAlpha import PlanetAlpha
+from PopulationPlanet import PopulationPlanet
+from RlePattern import RlePattern
+from WorldFile import WorldFile
+
+
+def random_planet(lines_count, columns_count, seed=3):
+    generator = random.Random(seed)
+    planet = PopulationPlanet('World', lines_count, columns_count, 0)
+    population = planet.get_population()
+    for cell_number in generator.sample(range(lines_count * columns_count), lines_count * columns_count // 3):
+        planet.born(cell_number, planet.get_newborn())
+        population.set_age(cell_number, generator.choice([0, 5, 300, 70000, 2 ** 40]))
+    return planet
+
+
+@pytest.mark.parametrize('lines_count, columns_count', [(0, 0), (1, 1), (7, 13), (64, 64)])
+def test_world_file_round_trip(tmp_path, lines_count, columns_count):
+    planet = random_planet(lines_count, columns_count)
+    population = planet.get_population()
+    path = tmp_path / 'world.plnt'
+    WorldFile.save(path, planet, 42)
+    with WorldFile(path) as world_file:
+        assert (world_file.get_lines_count(), world_file.get_columns_count()) == (lines_count, columns_count)
+        assert world_file.get_step_count() == 42
+        assert world_file.get_live_count() == population.get_count()
+        for cell_number in range(lines_count * columns_count):
+            expected_age = population.get_age(cell_number) if population.is_alive(cell_number) else None
+            assert world_file.get_age(cell_number) == expected_age
+        for line_number in range(lines_count):
+            start = line_number * columns_count
+            assert world_file.get_alive_line(line_number) == bytes(population.get_alive()[start:start + columns_count])
+        loaded = world_file.to_planet()
+    assert bytes(loaded.get_population().get_alive()) == bytes(population.get_alive())
+    assert list(loaded.get_population().get_ages()) == list(population.get_ages())
+
+
+def test_world_file_saves_the_humans_of_a_planet_alpha(tmp_path):
+    planet = PlanetAlpha('Humans', 5, 5, 0)
+    human = Human(['Conway'], 'Being', 'XX', 'Hello')
+    human.set_age(9)
+    planet.born(7, human)
+    WorldFile.save(tmp_path / 'humans.plnt', planet)
+    with WorldFile(tmp_path / 'humans.plnt') as world_file:
+        assert world_file.get_live_count() == 1
+        assert world_file.get_age(7) == 9
+
+
+def test_world_file_refuses_other_elements(tmp_path):
+    planet = PlanetAlpha('Food', 5, 5, 0)
+    planet.born(8, 'food')
+    with pytest.raises(ValueError):
+        WorldFile.save(tmp_path / 'food.plnt', planet)
+
+
+def test_rle_round_trip():
+    planet = random_planet(10, 80)
+    text = RlePattern.format(planet)
+    assert max(map(len, text.splitlines())) <= 70
+    _, _, cells = RlePattern.parse(text)
+    assert sorted(line_number * 80 + column_number for line_number, column_number in cells) == \
+        planet.get_population().get_live_cells()
+
+
+def test_rle_parses_a_glider():
+    lines_count, columns_count, cells = RlePattern.parse("#N Glider\nx = 3, y = 3, rule = B3/S23\nbob$2bo$3o!\n")
+    assert (lines_count, columns_count) == (3, 3)
+    assert sorted(cells) == [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
+
+
+@pytest.mark.parametrize('text', ["x = 2, y = 2, rule = B36/S23\no!", "x = 2, y = 1\n3o!", "o!"])
+def test_rle_rejects_invalid_patterns(text):
+    with pytest.raises(ValueError):
+        RlePattern.parse(text)